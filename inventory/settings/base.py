@@ -45,10 +45,21 @@ AUTHENTICATION_BACKENDS = [
 REST_FRAMEWORK = {
     # Autenticación JWT como método principal
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'inventory_app.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',  # Mantener para admin
     ],
 
+    # JSON con orjson (misma salida byte a byte que JSONRenderer/JSONParser de DRF)
+    'DEFAULT_RENDERER_CLASSES': [
+        'inventory_app.renderers.OrjsonRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'inventory_app.parsers.OrjsonParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+
     # Paginación global para todos los endpoints de lista
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,  # Número de resultados por página por defecto
@@ -60,7 +71,8 @@ REST_FRAMEWORK = {
     # Custom exception handler para remover prefijos de campo en errores
     'EXCEPTION_HANDLER': 'inventory_app.utils.exception_handler.custom_exception_handler',
 
-    # Rate limiting / Throttling para prevenir abuso de APIs
+    # Rate limiting / Throttling para prevenir abuso de APIs.
+    # Los límites se comparten entre workers vía Redis (GCRA, ver inventory_app/throttles.py)
     'DEFAULT_THROTTLE_CLASSES': [
         'inventory_app.throttles.BurstRateThrottle',
         'inventory_app.throttles.SustainedRateThrottle',
@@ -86,22 +98,34 @@ REST_FRAMEWORK = {
     },
 }
 
+# Listados de productos y movimientos con proyección por values_list() en lugar de
+# ModelSerializer (ver inventory_app/serializers/values_serializer.py)
+FAST_LIST_SERIALIZERS = env.bool('FAST_LIST_SERIALIZERS', default=True)
+
 # --- Middleware ---
 MIDDLEWARE = [
+    'inventory_app.middleware.MetricsMiddleware',  # Latencia y costo de BD por endpoint (/api/metrics)
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'inventory_app.middleware.ReplicaRoutingMiddleware',  # Lecturas GET desde la réplica (si hay DB_REPLICA_HOST)
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'inventory_app.middleware.AuditMiddleware',  # Audit trail middleware
+    'inventory_app.middleware.QueryInspectorMiddleware',  # Consultas lentas y N+1 (desarrollo/CI)
 ]
 
 # --- Root URLs and WSGI ---
 ROOT_URLCONF = 'inventory.urls'
 WSGI_APPLICATION = 'inventory.wsgi.application'
+ASGI_APPLICATION = 'inventory.asgi.application'
+
+# Interfaz del servidor: 'wsgi' (gunicorn con threads) o 'asgi' (gunicorn con workers
+# de uvicorn, ver Procfile web_asgi). inventory/asgi.py la fija en 'asgi'.
+SERVER_INTERFACE = env('SERVER_INTERFACE', default='wsgi')
 
 # --- Templates ---
 TEMPLATES = [
@@ -120,18 +144,65 @@ TEMPLATES = [
     },
 ]
 
-# --- Database configuration (PostgreSQL) ---
+# --- Database configuration (PostgreSQL con psycopg 3) ---
+# Pool de conexiones por proceso (psycopg_pool). El Procfile fija el tamaño según
+# los hilos de cada tipo de proceso; 0 = sin pool (una conexión persistente por hilo).
+DB_POOL_MAX_SIZE = env.int('DB_POOL_MAX_SIZE', default=0)
+# Conexiones que el pool mantiene abiertas aunque no haya tráfico
+DB_POOL_MIN_SIZE = env.int('DB_POOL_MIN_SIZE', default=min(2, DB_POOL_MAX_SIZE))
+# Segundos que una request espera una conexión libre antes de fallar
+DB_POOL_TIMEOUT = env.float('DB_POOL_TIMEOUT', default=10)
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql_psycopg2',
+        'ENGINE': 'django.db.backends.postgresql',
         'NAME': env('DB_NAME'),
         'USER': env('DB_USER'),
         'PASSWORD': env('DB_PASSWORD'),
         'HOST': env('DB_HOST'),
         'PORT': env('DB_PORT'),
-        'CONN_MAX_AGE': 60,  # DB connection pooling
+        # Sin pool: conexiones persistentes por hilo. Con ASGI cada request usa su propio
+        # hilo para el ORM y quedarían abiertas por hilo: se cierran al terminar. El pool
+        # exige CONN_MAX_AGE=0 (la conexión vuelve al pool al terminar la request)
+        'CONN_MAX_AGE': 0 if DB_POOL_MAX_SIZE or SERVER_INTERFACE == 'asgi' else 60,
+        # Verifica la conexión antes de reusarla (con pool, al entregarla)
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {},
     }
 }
+if DB_POOL_MAX_SIZE:
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': DB_POOL_MIN_SIZE,
+        'max_size': DB_POOL_MAX_SIZE,
+        'timeout': DB_POOL_TIMEOUT,
+    }
+
+# --- Réplica de lectura (opcional) ---
+# Con DB_REPLICA_HOST, los GET y las tareas de reportes leen de la réplica
+# (ver inventory_app/db_routers.py). Para probarlo en local basta con apuntar
+# DB_REPLICA_HOST al mismo servidor que DB_HOST.
+DB_REPLICA_HOST = env('DB_REPLICA_HOST', default='')
+if DB_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': env('DB_REPLICA_NAME', default=DATABASES['default']['NAME']),
+        'USER': env('DB_REPLICA_USER', default=DATABASES['default']['USER']),
+        'PASSWORD': env('DB_REPLICA_PASSWORD', default=DATABASES['default']['PASSWORD']),
+        'HOST': DB_REPLICA_HOST,
+        'PORT': env('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        # Pool propio del mismo tamaño que el del primario
+        'OPTIONS': {**DATABASES['default']['OPTIONS']},
+        # En tests la réplica es la misma base que el primario
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['inventory_app.db_routers.ReplicaRouter']
+
+# Segundos que un cliente lee del primario después de escribir (lag de la réplica)
+REPLICA_STICKY_SECONDS = env.int('REPLICA_STICKY_SECONDS', default=5)
+
+# Segundos sin intentar la réplica después de un fallo de conexión
+REPLICA_RETRY_SECONDS = env.int('REPLICA_RETRY_SECONDS', default=30)
 
 # --- Password validation ---
 AUTH_PASSWORD_VALIDATORS = [
@@ -143,6 +214,10 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 # --- Email configuration (for password recovery) ---
+# Backend intercambiable: smtp en producción; console, filebased o locmem en desarrollo y tests
+EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = env('EMAIL_FILE_PATH', default=str(BASE_DIR / 'logs' / 'emails'))
+EMAIL_TIMEOUT = env.int('EMAIL_TIMEOUT', default=10)  # Segundos; evita workers colgados en SMTP
 EMAIL_HOST = env('EMAIL_HOST')
 EMAIL_PORT = env('EMAIL_PORT')
 EMAIL_USE_TLS = env.bool('EMAIL_USE_TLS')
@@ -165,6 +240,21 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# --- Descarga de reportes PDF ---
+# 'django': Django envía el archivo (soporta Range y requests condicionales)
+# 'nginx': X-Accel-Redirect (nginx debe exponer PROTECTED_FILE_ACCEL_PREFIX como location `internal`
+#          apuntando a MEDIA_ROOT)
+# 'sendfile': X-Sendfile (Apache mod_xsendfile, lighttpd)
+PROTECTED_FILE_SERVING = env('PROTECTED_FILE_SERVING', default='django')
+PROTECTED_FILE_ACCEL_PREFIX = env('PROTECTED_FILE_ACCEL_PREFIX', default='/protected-media/')
+REPORT_RETENTION_DAYS = env.int('REPORT_RETENTION_DAYS', default=30)
+
+# Imágenes de productos en espera de la tarea process_product_image (vacío = MEDIA_ROOT/staging/products).
+# Debe ser accesible tanto por el proceso web como por el worker de la cola `media`
+PRODUCT_IMAGE_STAGING_DIR = env('PRODUCT_IMAGE_STAGING_DIR', default='')
+# False: la imagen se procesa en la request (sin cola) cuando web y worker no comparten el staging
+PRODUCT_IMAGE_ASYNC = env.bool('PRODUCT_IMAGE_ASYNC', default=True)
+
 # --- Primary key field type ---
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -220,10 +310,47 @@ if USE_CLOUDINARY:
     )
 
 # --- Logging configuration ---
-from inventory_app.logging_config import LOGGING_CONFIG as LOGGING_DICT
+from inventory_app.logging_config import LOGGING_CONFIG as LOGGING_DICT, SAMPLING_RULES
 
 LOGGING = LOGGING_DICT
 
+# Socket Unix del colector de logs (`manage.py run_log_collector`), único escritor de los
+# archivos de logs/. Vacío: sin archivos, solo consola (la auditoría va a stderr).
+LOG_COLLECTOR_SOCKET = env('LOG_COLLECTOR_SOCKET', default=LOGGING['handlers']['ship']['socket_path'])
+LOGGING['handlers']['ship']['socket_path'] = LOG_COLLECTOR_SOCKET
+# Muestreo por logger, p. ej. {"inventory_app.services": {"sample_rate": 0.2, "max_per_second": 20}}
+LOG_SAMPLING_RULES = env.json('LOG_SAMPLING_RULES', default=SAMPLING_RULES)
+LOGGING['filters']['sampling']['rules'] = LOG_SAMPLING_RULES
+
+# Tamaño máximo del body JSON que el middleware de auditoría captura por request
+AUDIT_BODY_MAX_BYTES = env.int('AUDIT_BODY_MAX_BYTES', default=4096)
+
+# Escritura de AuditLog: sync (un INSERT por registro) | buffered (bulk_create por request) | celery
+AUDIT_LOG_WRITE_MODE = env('AUDIT_LOG_WRITE_MODE', default='buffered')
+# Máximo de registros pendientes por request; al alcanzarlo se escriben de inmediato
+AUDIT_LOG_BUFFER_SIZE = env.int('AUDIT_LOG_BUFFER_SIZE', default=200)
+# Particiones mensuales de AuditLog (PostgreSQL): meses conservados en la base de datos
+# y directorio donde se exportan (.jsonl.gz) las particiones vencidas
+AUDIT_LOG_RETENTION_MONTHS = env.int('AUDIT_LOG_RETENTION_MONTHS', default=12)
+AUDIT_LOG_ARCHIVE_DIR = env('AUDIT_LOG_ARCHIVE_DIR', default=str(BASE_DIR / 'archive' / 'audit_logs'))
+
+# Métricas por endpoint expuestas en /api/metrics (formato Prometheus).
+# Cada worker vuelca sus contadores a Redis cada METRICS_FLUSH_INTERVAL segundos.
+# Con METRICS_TOKEN el scraper se autentica con `Authorization: Metrics <token>`;
+# sin él, solo los administradores pueden leer el endpoint.
+METRICS_ENABLED = env.bool('METRICS_ENABLED', default=True)
+METRICS_FLUSH_INTERVAL = env.int('METRICS_FLUSH_INTERVAL', default=5)
+METRICS_TOKEN = env('METRICS_TOKEN', default='')
+
+# Detector de consultas lentas y N+1 por request (activo por defecto en desarrollo).
+# Con QUERY_INSPECTOR_RAISE=True (modo CI) cada hallazgo lanza QueryPatternError
+# y hace fallar el test que hizo la request.
+QUERY_INSPECTOR_RAISE = env.bool('QUERY_INSPECTOR_RAISE', default=False)
+QUERY_INSPECTOR_ENABLED = env.bool('QUERY_INSPECTOR_ENABLED', default=QUERY_INSPECTOR_RAISE)
+QUERY_INSPECTOR_SLOW_MS = env.int('QUERY_INSPECTOR_SLOW_MS', default=200)
+QUERY_INSPECTOR_REPEAT_THRESHOLD = env.int('QUERY_INSPECTOR_REPEAT_THRESHOLD', default=5)
+QUERY_INSPECTOR_STACK_DEPTH = env.int('QUERY_INSPECTOR_STACK_DEPTH', default=5)
+
 # --- Celery configuration ---
 REDIS_URL = env('REDIS_URL', default=env('CELERY_BROKER_URL', default='redis://localhost:6379/0'))
 CELERY_BROKER_URL = REDIS_URL
@@ -238,6 +365,95 @@ CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutos máximo por tarea
 CELERY_RESULT_EXPIRES = 3600  # Los resultados expiran después de 1 hora
 
+# --- Colas por tipo de carga ---
+# Cada cola se atiende con su propio worker (ver Procfile) para que un reporte
+# masivo no bloquee el PDF de cotización que un cliente está esperando.
+#   pdf_interactive: PDFs individuales que el usuario espera en pantalla
+#   reports_bulk:    reportes grandes y exportaciones por lotes
+#   notifications:   envío de correos y otras escrituras cortas (auditoría)
+#   maintenance:     tareas programadas (fotografías de stock, depuración)
+from kombu import Queue  # noqa: E402
+
+CELERY_TASK_DEFAULT_QUEUE = 'celery'
+CELERY_TASK_QUEUES = (
+    Queue('celery'),
+    Queue('pdf_interactive'),
+    Queue('reports_bulk'),
+    Queue('notifications'),
+    Queue('maintenance'),
+    Queue('media'),
+)
+CELERY_TASK_ROUTES = {
+    'inventory_app.tasks.generate_quotation_pdf': {'queue': 'pdf_interactive'},
+    'inventory_app.tasks.render_quotation_pdf': {'queue': 'reports_bulk'},
+    'inventory_app.tasks.bundle_quotation_pdfs': {'queue': 'reports_bulk'},
+    'inventory_app.tasks.fail_quotation_pdf_batch': {'queue': 'reports_bulk'},
+    'inventory_app.tasks.generate_movements_report_pdf': {'queue': 'reports_bulk'},
+    'inventory_app.tasks.send_password_reset_email': {'queue': 'notifications'},
+    'inventory_app.tasks.send_email_batch': {'queue': 'notifications'},
+    'inventory_app.tasks.write_audit_logs': {'queue': 'notifications'},
+    'inventory_app.tasks.take_daily_stock_snapshot': {'queue': 'maintenance'},
+    'inventory_app.tasks.prune_expired_reports': {'queue': 'maintenance'},
+    'inventory_app.tasks.reconcile_stock_ledger': {'queue': 'maintenance'},
+    'inventory_app.tasks.maintain_audit_partitions': {'queue': 'maintenance'},
+    'inventory_app.tasks.process_product_image': {'queue': 'media'},
+}
+
+# Prioridades dentro de cada cola (Redis: 0 = más alta). Ver constants.TaskPriority
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'priority_steps': list(range(10)),
+    'sep': ':',
+    'queue_order_strategy': 'priority',
+}
+CELERY_TASK_DEFAULT_PRIORITY = 5
+
+# Cada worker reserva una sola tarea a la vez: las tareas largas no retienen
+# tareas cortas en el buffer local de un proceso ocupado
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+# Deduplicación de tareas idénticas (reportes): duración máxima del lock de una
+# ejecución en curso y tiempo durante el cual se reutiliza un resultado terminado
+SINGLE_FLIGHT_LOCK_TTL = env.int('SINGLE_FLIGHT_LOCK_TTL', default=15 * 60)
+SINGLE_FLIGHT_RESULT_TTL = env.int('SINGLE_FLIGHT_RESULT_TTL', default=300)
+
+# Duración máxima de un stream SSE de eventos de tarea (segundos); luego el cliente reconecta
+TASK_EVENTS_STREAM_TIMEOUT = env.int('TASK_EVENTS_STREAM_TIMEOUT', default=60)
+# Streams SSE simultáneos por proceso con WSGI (cada uno ocupa un thread; 0 = sin límite).
+# Con 4 threads por worker, 2 dejan al menos 2 threads para el resto de la API
+TASK_EVENTS_MAX_STREAMS = env.int('TASK_EVENTS_MAX_STREAMS', default=2)
+# Validez del token de `?token=` para abrir el stream con EventSource (segundos)
+TASK_EVENTS_TOKEN_MAX_AGE = env.int('TASK_EVENTS_TOKEN_MAX_AGE', default=300)
+
+# Tareas programadas (requiere el proceso `celery beat`)
+from celery.schedules import crontab  # noqa: E402
+
+CELERY_BEAT_SCHEDULE = {
+    # Fotografía de stock del día anterior, poco después de medianoche (hora local)
+    'daily-stock-snapshot': {
+        'task': 'inventory_app.tasks.take_daily_stock_snapshot',
+        'schedule': crontab(hour=0, minute=10),
+    },
+    # Depuración de reportes PDF antiguos
+    'prune-expired-reports': {
+        'task': 'inventory_app.tasks.prune_expired_reports',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    # Conciliación de current_stock contra el historial de movimientos
+    'nightly-stock-reconciliation': {
+        'task': 'inventory_app.tasks.reconcile_stock_ledger',
+        'schedule': crontab(hour=2, minute=0),
+    },
+    # Particiones futuras de AuditLog y archivado de las vencidas
+    'maintain-audit-partitions': {
+        'task': 'inventory_app.tasks.maintain_audit_partitions',
+        'schedule': crontab(hour=1, minute=30),
+    },
+}
+
+# Corregir automáticamente las diferencias de stock en la conciliación nocturna
+# (por defecto solo se reportan; corregir a mano con `manage.py reconcile_stock --repair`)
+STOCK_RECONCILIATION_AUTO_REPAIR = env.bool('STOCK_RECONCILIATION_AUTO_REPAIR', default=False)
+
 # --- JWT Configuration ---
 from datetime import timedelta
 
@@ -245,7 +461,7 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),  # Token válido por 1 hora
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),     # Refresh válido por 7 días
     'ROTATE_REFRESH_TOKENS': True,                   # Rota el refresh token en cada uso
-    'BLACKLIST_AFTER_ROTATION': False,               # No usar blacklist (simplifica)
+    'BLACKLIST_AFTER_ROTATION': False,               # Sin tabla de blacklist: ver REFRESH_TOKEN_FAMILY_STORE
     'UPDATE_LAST_LOGIN': True,                       # Actualiza last_login del usuario
 
     'ALGORITHM': 'HS256',
@@ -255,4 +471,18 @@ SIMPLE_JWT = {
     'AUTH_HEADER_NAME': 'HTTP_AUTHORIZATION',
     'USER_ID_FIELD': 'id',
     'USER_ID_CLAIM': 'user_id',
+
+    # Rotación por familia con detección de reuso (Redis) y claims actualizados en cada refresh
+    'TOKEN_REFRESH_SERIALIZER': 'inventory_app.authentication.RotatingTokenRefreshSerializer',
 }
+
+# Registro de familias de refresh tokens en Redis: un refresh token ya rotado que se
+# reutiliza revoca la sesión completa (ver inventory_app/utils/refresh_token_store.py)
+REFRESH_TOKEN_FAMILY_STORE = env.bool('REFRESH_TOKEN_FAMILY_STORE', default=True)
+
+# Resolución del usuario autenticado por JWT (ver inventory_app/authentication.py):
+#   db        - una consulta a la tabla de usuarios por request (simplejwt)
+#   cached    - proyección del usuario en Redis, invalidada al guardar el usuario
+#   stateless - confía en los claims firmados; cambios de rol rigen al expirar el access token
+JWT_USER_RESOLUTION = env('JWT_USER_RESOLUTION', default='cached')
+JWT_USER_CACHE_TTL = env.int('JWT_USER_CACHE_TTL', default=300)
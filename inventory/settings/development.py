@@ -12,9 +12,9 @@ ALLOWED_HOSTS = ['localhost', '127.0.0.1', '[::1]']
 
 # --- Database: NO usa SSL en desarrollo local ---
 # La configuración base ya tiene PostgreSQL configurado
-# Solo necesitamos asegurar que NO use SSL
-if 'OPTIONS' in DATABASES['default']:
-    del DATABASES['default']['OPTIONS']
+# Solo necesitamos asegurar que NO use SSL (el pool, si está activo, se mantiene)
+for _database in DATABASES.values():
+    _database.get('OPTIONS', {}).pop('sslmode', None)
 
 # --- Cookies: Configuración para desarrollo local (HTTP) ---
 SESSION_COOKIE_SAMESITE = "Lax"
@@ -44,11 +44,14 @@ LOGGING['handlers']['console']['level'] = 'DEBUG'
 LOGGING['loggers']['django']['level'] = 'INFO'
 LOGGING['loggers']['inventory_app']['level'] = 'DEBUG'
 
+# --- Detector de consultas lentas y N+1 (logs 'inventory_app.queries') ---
+QUERY_INSPECTOR_ENABLED = env.bool('QUERY_INSPECTOR_ENABLED', default=True)
+
 # --- NO inicializar Sentry en desarrollo ---
 # (El código de Sentry en base.py solo se ejecuta si DEBUG=False)
 
 # --- Mostrar emails en consola en vez de enviarlos ---
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 
 # --- Django Debug Toolbar (opcional - descomentar si lo usas) ---
 # INSTALLED_APPS += ['debug_toolbar']
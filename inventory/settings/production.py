@@ -7,10 +7,9 @@ from .base import *  # noqa: F401, F403
 # --- Debug mode (SIEMPRE desactivado en producción) ---
 DEBUG = False
 
-# --- Database: Usa SSL en producción ---
-DATABASES['default']['OPTIONS'] = {
-    'sslmode': 'require',
-}
+# --- Database: Usa SSL en producción (primario y réplica) ---
+for _database in DATABASES.values():
+    _database.setdefault('OPTIONS', {})['sslmode'] = 'require'
 
 # --- Cookies: Configuración para producción (HTTPS) ---
 SESSION_COOKIE_SAMESITE = "None"
@@ -0,0 +1,248 @@
+# authentication.py
+"""
+Autenticación JWT sin consultar la tabla de usuarios en cada request.
+
+JWTAuthentication de simplejwt carga la fila completa de User por request solo
+para identificar al usuario. CachedJWTAuthentication resuelve al usuario según
+settings.JWT_USER_RESOLUTION:
+
+- 'db':        comportamiento original (una consulta por request)
+- 'cached':    proyección mínima (id, email, role, is_active, name) en Redis por
+               user id; se invalida al guardar el usuario (ver signals.py y
+               UserQuerySet.update). Si Redis falla, se consulta la base de datos.
+- 'stateless': confía en los claims firmados del access token (role, email, name);
+               un cambio de rol o una desactivación rige recién cuando el token
+               expira (ACCESS_TOKEN_LIFETIME). Tokens sin claims usan 'cached'.
+
+En todos los modos request.user es una instancia de User: los campos que no
+están en la proyección quedan diferidos y se cargan de la base si se leen
+(p. ej. `password` en ChangePasswordView). Los valores de la proyección pueden
+estar desactualizados (un rol revocado o una desactivación que el token todavía
+no refleja), así que User.save() no los escribe salvo que la request los haya
+modificado (ver build_user).
+
+StreamTokenAuthentication autentica el stream SSE de tareas con el token firmado
+de `?token=` (EventSource no envía cabeceras).
+"""
+import json
+import logging
+import time
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import DEFERRED
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import BaseAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from inventory_app.utils import refresh_token_store, task_events
+
+logger = logging.getLogger(__name__)
+
+MODE_DB = 'db'
+MODE_CACHED = 'cached'
+MODE_STATELESS = 'stateless'
+
+# Campos de User que se guardan en caché y se firman en el access token
+PROJECTION_FIELDS = ('id', 'email', 'role', 'is_active', 'name')
+CLAIM_FIELDS = ('email', 'role', 'name')
+
+CACHE_KEY = 'auth:user:{}'
+
+
+def cache_key(user_id):
+    return CACHE_KEY.format(user_id)
+
+
+def _mode():
+    return getattr(settings, 'JWT_USER_RESOLUTION', MODE_CACHED)
+
+
+def invalidate_user(*user_ids):
+    """
+    Elimina de la caché la proyección de los usuarios indicados cuando la
+    transacción en curso hace commit (así una request concurrente no vuelve a
+    cachear los datos viejos). Nunca lanza excepción.
+    """
+    if user_ids:
+        transaction.on_commit(partial(_delete_cached, user_ids))
+
+
+def _delete_cached(user_ids):
+    from redis import RedisError
+    from inventory_app.utils.redis_client import get_redis
+
+    try:
+        get_redis().delete(*[cache_key(user_id) for user_id in user_ids])
+    except RedisError as exc:
+        logger.warning(f"No se pudo invalidar la caché de usuarios {user_ids}: {exc}")
+
+
+def project(user):
+    """Proyección mínima del usuario para la caché."""
+    data = {field: getattr(user, field) for field in PROJECTION_FIELDS}
+    if api_settings.CHECK_REVOKE_TOKEN:
+        data['password_md5'] = get_md5_hash_password(user.password)
+    return data
+
+
+def build_user(data):
+    """
+    Instancia de User a partir de la proyección, sin consultar la base.
+    El resto de los campos quedan diferidos.
+
+    Los valores proyectados se registran en `_auth_projection`: User.save()
+    omite los que no cambiaron, para que un claim o una caché viejos no
+    restauren en la base un rol o un is_active que ya no corresponden.
+    """
+    User = get_user_model()
+    fields = User._meta.concrete_fields
+    user = User.from_db(
+        DEFAULT_DB_ALIAS,
+        [field.attname for field in fields],
+        [data.get(field.attname, DEFERRED) for field in fields],
+    )
+    user._auth_projection = {
+        field: data[field] for field in PROJECTION_FIELDS if field in data and field != 'id'
+    }
+    return user
+
+
+def set_user_claims(token, user):
+    """Firma en el token los claims que usa el modo 'stateless'."""
+    for field in CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+    return token
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que resuelve al usuario desde Redis o desde los claims
+    del token según JWT_USER_RESOLUTION (ver docstring del módulo).
+    """
+
+    def get_user(self, validated_token):
+        mode = _mode()
+        if mode == MODE_DB:
+            return super().get_user(validated_token)
+
+        try:
+            # El claim puede venir como texto ('1'): sin convertirlo, request.user.id
+            # no coincide con el id de las instancias cargadas de la base
+            user_id = self.user_model._meta.pk.to_python(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, DjangoValidationError) as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        if mode == MODE_STATELESS and all(field in validated_token for field in CLAIM_FIELDS):
+            data = {field: validated_token[field] for field in CLAIM_FIELDS}
+            data.update(id=user_id, is_active=True)
+            return build_user(data)
+
+        data = self._cached_projection(user_id)
+        if api_settings.CHECK_USER_IS_ACTIVE and not data['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and \
+                validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != data.get('password_md5'):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return build_user(data)
+
+    def _cached_projection(self, user_id):
+        from redis import RedisError
+        from inventory_app.utils.redis_client import get_redis
+
+        key = cache_key(user_id)
+        try:
+            cached = get_redis().get(key)
+        except RedisError as exc:
+            logger.debug(f"Caché de usuarios no disponible: {exc}")
+            cached, key = None, None
+        if cached is not None:
+            return json.loads(cached)
+
+        try:
+            user = self.user_model.objects.only(*PROJECTION_FIELDS, 'password').get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        data = project(user)
+        if key is not None:
+            try:
+                get_redis().set(key, json.dumps(data), ex=getattr(settings, 'JWT_USER_CACHE_TTL', 300))
+            except RedisError as exc:
+                logger.debug(f"No se pudo guardar el usuario {user_id} en caché: {exc}")
+        return data
+
+
+class StreamTokenAuthentication(BaseAuthentication):
+    """
+    Token de `?token=` emitido por TaskEventsTokenView, válido solo para la tarea
+    de la URL y durante TASK_EVENTS_TOKEN_MAX_AGE segundos. Sin token no
+    autentica (sigue la cadena de DEFAULT_AUTHENTICATION_CLASSES).
+    """
+
+    def authenticate(self, request):
+        token = request.query_params.get('token')
+        if not token:
+            return None
+
+        task_id = request.parser_context['kwargs'].get('task_id')
+        max_age = getattr(settings, 'TASK_EVENTS_TOKEN_MAX_AGE', 300)
+        user_id = task_events.read_stream_token(token, task_id, max_age)
+        if user_id is None:
+            raise AuthenticationFailed(_("Invalid or expired stream token"), code="stream_token_invalid")
+
+        user = get_user_model().objects.filter(pk=user_id, is_active=True).first()
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        return user, token
+
+
+class RotatingTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh con rotación controlada por familia (utils/refresh_token_store.py):
+    un refresh token ya rotado que se vuelve a presentar revoca su familia.
+
+    Además vuelve a firmar role, email y name en el nuevo access token con los
+    datos actuales del usuario, para que el modo 'stateless' no arrastre un
+    rol viejo más allá de un ACCESS_TOKEN_LIFETIME.
+    """
+
+    def validate(self, attrs):
+        presented = self.token_class(attrs['refresh'])
+        data = super().validate(attrs)
+
+        access = AccessToken(data['access'], verify=False)
+        user_id = access.get(api_settings.USER_ID_CLAIM)
+        user = get_user_model().objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).only(*CLAIM_FIELDS).first()
+        if user is not None:
+            data['access'] = str(set_user_claims(access, user))
+
+        if 'refresh' in data:
+            data['refresh'] = self._rotate_family(presented, data['refresh'], user_id)
+        return data
+
+    def _rotate_family(self, presented, new_refresh, user_id):
+        new_token = self.token_class(new_refresh, verify=False)
+        family = presented.get(refresh_token_store.FAMILY_CLAIM)
+        if family is None:
+            # Token emitido antes del registro de familias o sin poder registrarla
+            # (Redis no disponible en el login): inicia una con el token rotado
+            return str(refresh_token_store.start_family(new_token, user_id))
+
+        ttl = new_token['exp'] - int(time.time())
+        result = refresh_token_store.rotate(family, presented['jti'], new_token['jti'], ttl)
+        if result in (refresh_token_store.REUSED, refresh_token_store.UNKNOWN):
+            raise InvalidToken(_("Token is invalid or expired"), code="token_not_valid")
+        return new_refresh
@@ -107,6 +107,16 @@ class Timeouts:
     CLOCK_INTERVAL = 1000
 
 
+class TaskPriority:
+    """
+    Prioridades de tareas de Celery.
+    Con el broker Redis, 0 es la prioridad más alta y 9 la más baja.
+    """
+    INTERACTIVE = 0  # El usuario espera el resultado en pantalla
+    NORMAL = 5
+    BULK = 9
+
+
 class ImageConfig:
     """Configuración de imágenes"""
     MAX_SIZE_MB = 2
@@ -117,3 +127,7 @@ class ImageConfig:
     MAX_HEIGHT = 2000
     ALLOWED_TYPES = ['image/jpeg', 'image/png']
     ALLOWED_EXTENSIONS = ['.jpg', '.jpeg', '.png']
+    ALLOWED_FORMATS = ['JPEG', 'PNG']  # Formato detectado por PIL en la cabecera
+    # Variantes WebP generadas por el worker: nombre -> lado máximo en píxeles
+    VARIANT_SIZES = {'thumb': 160, 'medium': 480}
+    WEBP_QUALITY = 80
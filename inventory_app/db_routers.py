@@ -0,0 +1,126 @@
+# db_routers.py
+"""
+Enrutamiento de lecturas a la réplica de PostgreSQL (alias 'replica').
+
+Por defecto todo va al primario. Las lecturas van a la réplica solo dentro de
+un contexto que lo habilita:
+
+- requests GET/HEAD/OPTIONS (ReplicaRoutingMiddleware), salvo que el cliente
+  haya escrito hace menos de REPLICA_STICKY_SECONDS: así lee lo que acaba de
+  guardar aunque la réplica tenga retraso
+- tareas de reportes de Celery (decoradas con read_from_replica())
+
+Aun dentro de ese contexto se lee del primario si hay una transacción abierta
+en el primario, si el contexto ya escribió algo, o si la réplica no acepta
+conexiones (se reintenta tras REPLICA_RETRY_SECONDS). Las escrituras siempre
+van al primario. Sin el alias 'replica' en DATABASES el router no hace nada.
+"""
+import contextvars
+import hashlib
+import logging
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+REPLICA = 'replica'
+
+PIN_KEY = 'db:primary-pin:{}'
+
+
+class _RoutingState:
+    """Estado de enrutamiento de una request o tarea (compartido entre hilos de la misma request)."""
+
+    __slots__ = ('use_replica', 'wrote')
+
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+_state = contextvars.ContextVar('db_routing_state', default=None)
+
+# Instante (monotonic) hasta el cual la réplica se considera caída
+_replica_down_until = 0.0
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+@contextmanager
+def routing(use_replica):
+    """
+    Abre un contexto de enrutamiento. Retorna el estado, cuyo atributo
+    `wrote` indica al salir si el contexto escribió en la base.
+    """
+    state = _RoutingState(use_replica)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+@contextmanager
+def read_from_replica():
+    """
+    Lecturas desde la réplica dentro del bloque (reportes y agregados que
+    toleran unos segundos de retraso). Sirve también como decorador.
+    """
+    with routing(use_replica=True) as state:
+        yield state
+
+
+def replica_available():
+    """True si la réplica acepta conexiones; tras un fallo se usa el primario por un tiempo."""
+    global _replica_down_until
+
+    if not replica_configured() or time.monotonic() < _replica_down_until:
+        return False
+    try:
+        connections[REPLICA].ensure_connection()
+    except DatabaseError as exc:
+        _replica_down_until = time.monotonic() + getattr(settings, 'REPLICA_RETRY_SECONDS', 30)
+        logger.warning(f"Réplica de lectura no disponible, se usa el primario: {exc}")
+        return False
+    return True
+
+
+def pin_key(identity):
+    """Clave de Redis que fija al cliente al primario tras una escritura."""
+    return PIN_KEY.format(hashlib.sha1(identity.encode()).hexdigest())
+
+
+class ReplicaRouter:
+    """Router de DATABASE_ROUTERS (ver docstring del módulo)."""
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.use_replica or state.wrote:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        if not replica_available():
+            return None
+        return REPLICA
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            # Las lecturas siguientes del mismo contexto deben ver esta escritura
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primario y réplica tienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplica recibe el esquema por replicación
+        if db == REPLICA:
+            return False
+        return None
@@ -4,12 +4,17 @@ Configuración de logging para el proyecto.
 Define diferentes loggers para diferentes propósitos.
 """
 import os
-from datetime import datetime
 
 # Crear directorio de logs si no existe
 LOGS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
 os.makedirs(LOGS_DIR, exist_ok=True)
 
+# Registros INFO/DEBUG por logger: fracción conservada y máximo por segundo (por proceso).
+# WARNING y superiores nunca se muestrean.
+SAMPLING_RULES = {
+    'inventory_app.services': {'sample_rate': 0.2, 'max_per_second': 20},
+}
+
 # Configuración de logging para settings.py
 LOGGING_CONFIG = {
     'version': 1,
@@ -23,10 +28,6 @@ LOGGING_CONFIG = {
             'format': '[{levelname}] {asctime} {message}',
             'style': '{',
         },
-        'audit': {
-            'format': '[AUDIT] {asctime} | {message}',
-            'style': '{',
-        },
     },
     'filters': {
         'require_debug_false': {
@@ -35,74 +36,65 @@ LOGGING_CONFIG = {
         'require_debug_true': {
             '()': 'django.utils.log.RequireDebugTrue',
         },
+        # Muestreo y límite por segundo de registros INFO/DEBUG de alto volumen
+        'sampling': {
+            '()': 'inventory_app.utils.log_shipping.SamplingFilter',
+            'rules': SAMPLING_RULES,
+        },
     },
     'handlers': {
         'console': {
             'level': 'INFO',
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
+            'filters': ['sampling'],
         },
-        'file_general': {
-            'level': 'INFO',
-            'class': 'logging.handlers.RotatingFileHandler',
-            'filename': os.path.join(LOGS_DIR, 'general.log'),
-            'maxBytes': 10 * 1024 * 1024,  # 10 MB
-            'backupCount': 5,
-            'formatter': 'verbose',
-        },
-        'file_audit': {
-            'level': 'INFO',
-            'class': 'logging.handlers.RotatingFileHandler',
-            'filename': os.path.join(LOGS_DIR, 'audit.log'),
-            'maxBytes': 10 * 1024 * 1024,  # 10 MB
-            'backupCount': 10,  # Mantener más backups para auditoría
-            'formatter': 'audit',
-        },
-        'file_errors': {
-            'level': 'ERROR',
-            'class': 'logging.handlers.RotatingFileHandler',
-            'filename': os.path.join(LOGS_DIR, 'errors.log'),
-            'maxBytes': 10 * 1024 * 1024,  # 10 MB
-            'backupCount': 5,
-            'formatter': 'verbose',
-        },
-        'file_inventory': {
+        # Archivos: ningún proceso los escribe directamente. El registro se encola sin
+        # formatear y un hilo de fondo lo envía como JSON al colector
+        # (`manage.py run_log_collector`), único escritor de general.log, errors.log,
+        # inventory.log y audit.log (ver utils/log_shipping.py)
+        'ship': {
             'level': 'INFO',
-            'class': 'logging.handlers.RotatingFileHandler',
-            'filename': os.path.join(LOGS_DIR, 'inventory.log'),
-            'maxBytes': 10 * 1024 * 1024,  # 10 MB
-            'backupCount': 5,
-            'formatter': 'verbose',
+            '()': 'inventory_app.utils.log_shipping.build_shipping_handler',
+            'socket_path': os.path.join(LOGS_DIR, 'collector.sock'),
+            'queue_size': 10000,
+            'filters': ['sampling'],
         },
     },
     'loggers': {
         # Logger principal de Django
         'django': {
-            'handlers': ['console', 'file_general', 'file_errors'],
+            'handlers': ['console', 'ship'],
             'level': 'INFO',
             'propagate': False,
         },
-        # Logger de auditoría (middleware)
+        # Logger de auditoría (middleware): solo JSON, el body se interpreta en el hilo de envío
         'inventory_app.audit': {
-            'handlers': ['file_audit', 'console'],
+            'handlers': ['ship'],
             'level': 'INFO',
             'propagate': False,
         },
-        # Logger de inventario (servicio)
+        # Logger de inventario (servicio), muestreado por SAMPLING_RULES
         'inventory_app.services': {
-            'handlers': ['file_inventory', 'console'],
+            'handlers': ['console', 'ship'],
             'level': 'INFO',
             'propagate': False,
         },
+        # Logger de consultas lentas y N+1 (QueryInspectorMiddleware)
+        'inventory_app.queries': {
+            'handlers': ['console', 'ship'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
         # Logger general de la app
         'inventory_app': {
-            'handlers': ['console', 'file_general', 'file_errors'],
+            'handlers': ['console', 'ship'],
             'level': 'INFO',
             'propagate': False,
         },
     },
     'root': {
-        'handlers': ['console', 'file_general'],
+        'handlers': ['console', 'ship'],
         'level': 'INFO',
     },
 }
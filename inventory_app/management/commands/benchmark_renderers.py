@@ -0,0 +1,107 @@
+"""
+Comando de Django que compara el tiempo de render de JSONRenderer (DRF) y
+OrjsonRenderer sobre páginas completas de los listados de productos y
+movimientos, y verifica que ambos produzcan exactamente los mismos bytes.
+
+Los datos de cada página se serializan una sola vez; solo se mide el render.
+Con --seed se crean filas sintéticas dentro de una transacción que se revierte
+al terminar (la base de datos queda igual).
+
+Uso:
+    python manage.py benchmark_renderers
+    python manage.py benchmark_renderers --seed 2000 --sizes 20,100,500,1000 --repeat 5
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from inventory_app.management.commands.benchmark_serializers import Command as SerializersBenchmark
+from inventory_app.management.commands.benchmark_serializers import _Rollback, seed_rows
+from inventory_app.models import Movement, Product
+from inventory_app.renderers import OrjsonRenderer
+from inventory_app.serializers.movement_serializer import MovementValuesSerializer
+from inventory_app.serializers.product_serializer import ProductValuesSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compara JSONRenderer vs OrjsonRenderer en los listados de productos y movimientos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='20,100,500,1000',
+            help='Tamaños de página separados por coma (por defecto 20,100,500,1000)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Repeticiones por medición; se reporta la mejor (por defecto 5)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Crear N productos y N movimientos sintéticos (se revierten al terminar)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError('--sizes debe ser una lista de enteros separados por coma')
+
+        try:
+            with transaction.atomic():
+                if options['seed']:
+                    self.stdout.write(f'🌱 Creando {options["seed"]} productos y movimientos sintéticos...')
+                    seed_rows(options['seed'])
+                mismatches = self._run(sizes, options['repeat'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+        if mismatches:
+            raise CommandError(f'❌ Salida distinta entre renderers en: {", ".join(mismatches)}')
+        self.stdout.write(self.style.SUCCESS('✅ Salida idéntica en todas las páginas'))
+
+    def _run(self, sizes, repeat):
+        cases = [
+            ('Productos', Product.objects.filter(deleted_at__isnull=True)
+             .select_related('category', 'supplier').order_by('-id'), ProductValuesSerializer),
+            ('Movimientos', Movement.objects.filter(deleted_at__isnull=True)
+             .select_related('product', 'product__supplier', 'user', 'customer').order_by('-id'),
+             MovementValuesSerializer),
+        ]
+        drf, fast = JSONRenderer(), OrjsonRenderer()
+        best = SerializersBenchmark._best
+
+        mismatches = []
+        for title, queryset, serializer in cases:
+            available = queryset.count()
+            self.stdout.write('=' * 60)
+            self.stdout.write(f'📊 {title} ({available} filas disponibles)')
+            self.stdout.write(f'{"página":>8} {"JSONRenderer ms":>16} {"orjson ms":>10} {"mejora":>8} {"KB":>8}')
+            for size in sizes:
+                if not min(size, available):
+                    self.stdout.write(self.style.WARNING('⚠️  Sin filas; usa --seed para generar datos'))
+                    break
+
+                # Misma forma que la respuesta paginada de la API
+                data = {
+                    'count': available, 'next': None, 'previous': None,
+                    'results': serializer(serializer.project(queryset)[:size]).data,
+                }
+                expected = drf.render(data)
+                if fast.render(data) != expected:
+                    mismatches.append(f'{title} ({size})')
+
+                slow_time = best(repeat, lambda: drf.render(data))
+                fast_time = best(repeat, lambda: fast.render(data))
+                self.stdout.write(
+                    f'{size:>8} {slow_time * 1000:>16.2f} {fast_time * 1000:>10.2f} '
+                    f'{slow_time / fast_time:>7.1f}x {len(expected) / 1024:>8.1f}'
+                )
+        self.stdout.write('=' * 60)
+        return mismatches
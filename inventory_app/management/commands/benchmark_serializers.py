@@ -0,0 +1,133 @@
+"""
+Comando de Django que compara filas por segundo entre los serializers de
+modelo y los ValuesSerializer de los listados de productos y movimientos.
+
+Cada medición incluye la consulta y la serialización de una página completa.
+Con --seed se crean filas sintéticas dentro de una transacción que se revierte
+al terminar (la base de datos queda igual).
+
+Uso:
+    python manage.py benchmark_serializers
+    python manage.py benchmark_serializers --seed 2000 --sizes 20,100,500,1000 --repeat 5
+"""
+
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from inventory_app.constants import MovementType
+from inventory_app.models import Category, Movement, Product, Supplier, User
+from inventory_app.serializers.movement_serializer import MovementSerializer, MovementValuesSerializer
+from inventory_app.serializers.product_serializer import ProductSerializer, ProductValuesSerializer
+
+
+def seed_rows(count):
+    """Crea `count` productos y `count` movimientos sintéticos (usar dentro de una transacción)."""
+    user = User.objects.create_user(
+        email='benchmark@serializers.local', password=None, name='Benchmark',
+        role='User', phone='0900000000',
+    )
+    category = Category.objects.create(name='Benchmark')
+    supplier = Supplier.objects.create(
+        name='Proveedor Benchmark', email='benchmark@supplier.local',
+        document_type='ruc', tax_id='0000000000001', phone='0900000001',
+    )
+    products = Product.objects.bulk_create([
+        Product(
+            name=f'Producto {i}', category=category, supplier=supplier, price=Decimal('9.99'),
+            current_stock=100, minimum_stock=5, status='Disponible' if i % 5 else 'Agotado',
+        )
+        for i in range(count)
+    ], batch_size=500)
+    now = timezone.now()
+    Movement.objects.bulk_create([
+        Movement(
+            movement_type=MovementType.INPUT if i % 2 else MovementType.OUTPUT,
+            date=now, quantity=1, product=products[i % len(products)], user=user,
+            stock_in_movement=50,
+        )
+        for i in range(count)
+    ], batch_size=500)
+
+
+class _Rollback(Exception):
+    """Revierte las filas sintéticas al terminar."""
+
+
+class Command(BaseCommand):
+    help = 'Compara filas/s de ModelSerializer vs ValuesSerializer en los listados de productos y movimientos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='20,100,500,1000',
+            help='Tamaños de página separados por coma (por defecto 20,100,500,1000)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Repeticiones por medición; se reporta la mejor (por defecto 5)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Crear N productos y N movimientos sintéticos (se revierten al terminar)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError('--sizes debe ser una lista de enteros separados por coma')
+
+        try:
+            with transaction.atomic():
+                if options['seed']:
+                    self.stdout.write(f'🌱 Creando {options["seed"]} productos y movimientos sintéticos...')
+                    seed_rows(options['seed'])
+                self._run(sizes, options['repeat'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _run(self, sizes, repeat):
+        cases = [
+            ('Productos', Product.objects.filter(deleted_at__isnull=True)
+             .select_related('category', 'supplier').order_by('-id'),
+             ProductSerializer, ProductValuesSerializer),
+            ('Movimientos', Movement.objects.filter(deleted_at__isnull=True)
+             .select_related('product', 'product__supplier', 'user', 'customer').order_by('-id'),
+             MovementSerializer, MovementValuesSerializer),
+        ]
+
+        for title, queryset, model_serializer, values_serializer in cases:
+            available = queryset.count()
+            self.stdout.write('=' * 60)
+            self.stdout.write(f'📊 {title} ({available} filas disponibles)')
+            self.stdout.write(f'{"página":>8} {"serializer filas/s":>20} {"values filas/s":>16} {"mejora":>8}')
+            for size in sizes:
+                rows = min(size, available)
+                if not rows:
+                    self.stdout.write(self.style.WARNING('⚠️  Sin filas; usa --seed para generar datos'))
+                    break
+
+                slow = self._best(repeat, lambda: model_serializer(queryset[:size], many=True).data)
+                fast = self._best(repeat, lambda: values_serializer(values_serializer.project(queryset)[:size]).data)
+                self.stdout.write(
+                    f'{size:>8} {rows / slow:>20,.0f} {rows / fast:>16,.0f} {slow / fast:>7.1f}x'
+                )
+        self.stdout.write('=' * 60)
+
+    @staticmethod
+    def _best(repeat, function):
+        timings = []
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
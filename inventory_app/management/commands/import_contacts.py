@@ -0,0 +1,60 @@
+"""
+Comando de Django para importar clientes o proveedores en lote desde un CSV.
+
+Uso:
+    python manage.py import_contacts customers clientes.csv
+    python manage.py import_contacts suppliers proveedores.csv --dry-run
+    python manage.py import_contacts customers clientes.csv --batch-size 1000
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory_app.services.contact_import_service import ContactImportService
+
+
+class Command(BaseCommand):
+    help = 'Importa clientes o proveedores desde un CSV validando y creando por lotes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(ContactImportService.KINDS), help='Tipo de registro a importar')
+        parser.add_argument('path', help='Ruta del archivo CSV (UTF-8, con encabezado)')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo validar el archivo, sin crear registros',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=ContactImportService.BATCH_SIZE,
+            help=f'Filas por lote (por defecto {ContactImportService.BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='Cantidad de filas con errores a mostrar (por defecto 20)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], 'rb') as stream:
+                result = ContactImportService.import_csv(
+                    options['kind'], stream, batch_size=options['batch_size'], dry_run=options['dry_run']
+                )
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            raise CommandError(f'No se pudo importar {options["path"]}: {e}')
+
+        self.stdout.write('=' * 60)
+        self.stdout.write(f'📄 Filas leídas: {result["total"]}')
+        verb = 'Válidos (dry run)' if options['dry_run'] else 'Creados'
+        self.stdout.write(self.style.SUCCESS(f'✅ {verb}: {result["created"]}'))
+
+        if result['failed']:
+            self.stdout.write(self.style.WARNING(f'⚠️  Filas con errores: {result["failed"]}'))
+            for error in result['errors'][:options['limit']]:
+                details = '; '.join(
+                    f'{field}: {" ".join(messages)}' for field, messages in error['errors'].items()
+                )
+                self.stdout.write(f'   Línea {error["row"]}: {details}')
+        self.stdout.write('=' * 60)
@@ -0,0 +1,127 @@
+"""
+Comando de Django que mide el costo de arranque de un worker web con
+`python -X importtime`: importa el módulo WSGI/ASGI y el URLconf (lo que
+gunicorn carga antes de atender la primera request) en un proceso nuevo.
+
+Reporta el tiempo total de import, los módulos más costosos y verifica que no
+se carguen dependencias pesadas que solo usan los workers de Celery o vistas
+puntuales (reportlab, PIL, celery.result). Si alguna se carga, muestra la
+cadena de imports que la trajo y termina con error.
+
+Uso:
+    python manage.py import_time
+    python manage.py import_time --module inventory.asgi --top 30
+    python manage.py import_time --forbid reportlab,PIL,celery.result,pandas
+"""
+
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Dependencias que el worker web no debe importar al arrancar: se importan dentro
+# de las funciones que las usan (PDFs, imágenes, estado de tareas)
+WEB_FORBIDDEN_MODULES = ('reportlab', 'PIL', 'celery.result')
+
+# Código del proceso medido: el módulo de entrada configura Django y el URLconf
+# importa todas las vistas. __import__ y no importlib.import_module: -X importtime
+# no registra los módulos importados con importlib
+STARTUP_CODE = (
+    'import sys\n'
+    '__import__(sys.argv[1])\n'
+    'from django.conf import settings\n'
+    '__import__(settings.ROOT_URLCONF)\n'
+)
+
+
+def parse_importtime(output):
+    """
+    Parsea la salida de `-X importtime`.
+
+    Returns:
+        list[tuple]: (módulo, profundidad, self_us, cumulative_us) en el orden
+        de la salida (cada módulo aparece antes que el módulo que lo importó)
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Encabezado de columnas
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        rows.append((stripped, depth, int(parts[0]), int(parts[1])))
+    return rows
+
+
+def import_chain(rows, index):
+    """Cadena módulo ← importador ← ... hasta el import de primer nivel."""
+    name, depth = rows[index][0], rows[index][1]
+    chain = [name]
+    for other, other_depth, _, _ in rows[index + 1:]:
+        if other_depth < depth:
+            chain.append(other)
+            depth = other_depth
+    return chain
+
+
+class Command(BaseCommand):
+    help = 'Mide con -X importtime el arranque de un worker web y detecta imports pesados'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--module',
+            default='inventory.wsgi',
+            help='Módulo de entrada del servidor (por defecto inventory.wsgi)',
+        )
+        parser.add_argument('--top', type=int, default=15, help='Módulos más costosos a listar (por defecto 15)')
+        parser.add_argument(
+            '--forbid',
+            default=','.join(WEB_FORBIDDEN_MODULES),
+            help=f'Paquetes que no deben importarse al arrancar (por defecto {",".join(WEB_FORBIDDEN_MODULES)})',
+        )
+
+    def handle(self, *args, **options):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_CODE, options['module']],
+            cwd=settings.BASE_DIR,
+            env=os.environ.copy(),
+            capture_output=True,
+            text=True,
+        )
+        rows = parse_importtime(result.stderr)
+        if result.returncode != 0 or not rows:
+            errors = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+            raise CommandError(f'❌ No se pudo importar {options["module"]}:\n' + '\n'.join(errors[-10:]))
+
+        total_ms = sum(row[2] for row in rows) / 1000
+        self.stdout.write(
+            f'⏱️  Arranque de {options["module"]} + URLconf: {total_ms:,.0f} ms en imports ({len(rows)} módulos)'
+        )
+        self.stdout.write('=' * 60)
+        self.stdout.write(f'{"acumulado ms":>12} {"propio ms":>10}  módulo')
+        for name, _, self_us, cumulative_us in sorted(rows, key=lambda row: -row[3])[:options['top']]:
+            self.stdout.write(f'{cumulative_us / 1000:>12.1f} {self_us / 1000:>10.1f}  {name}')
+        self.stdout.write('=' * 60)
+
+        forbidden = [name.strip() for name in options['forbid'].split(',') if name.strip()]
+        # paquete -> cadena del primer import que lo trajo
+        loaded = {}
+        for index, (name, _, _, _) in enumerate(rows):
+            package = next((p for p in forbidden if name == p or name.startswith(f'{p}.')), None)
+            if package is None or package in loaded:
+                continue
+            # Desde el módulo más externo del paquete hasta la raíz de la cadena
+            chain = import_chain(rows, index)
+            inside = [i for i, module in enumerate(chain) if module == package or module.startswith(f'{package}.')]
+            loaded[package] = chain[inside[-1]:]
+
+        if loaded:
+            for chain in loaded.values():
+                self.stdout.write(self.style.ERROR(f'❌ {" ← ".join(chain)}'))
+            raise CommandError(f'❌ El arranque importa {len(loaded)} dependencia(s) pesada(s); importarlas de forma diferida')
+        self.stdout.write(self.style.SUCCESS(f'✅ No se importa {", ".join(forbidden)} al arrancar'))
@@ -0,0 +1,183 @@
+"""
+Comando de Django que mide throughput y latencia de endpoints GET con muchas
+conexiones concurrentes, para comparar el perfil WSGI (gunicorn con threads)
+con el perfil ASGI (gunicorn con workers de uvicorn).
+
+Cada conexión HTTP/1.1 keep-alive envía requests en serie durante --duration
+segundos, recorriendo las rutas indicadas. Con --slow-clients, esa cantidad de
+conexiones simula clientes lentos (redes móviles): envían la mitad de cada
+request, esperan --slow-delay segundos y envían el resto. En gunicorn con
+threads cada cliente lento ocupa un thread mientras tanto; con ASGI no. Las
+latencias de ambos grupos se reportan por separado.
+
+Solo usa asyncio de la biblioteca estándar, así que corre en cualquier máquina
+que tenga el proyecto.
+
+Uso:
+    python manage.py load_test --url http://127.0.0.1:8000 --concurrency 500 --duration 30
+    python manage.py load_test --paths /api/dashboard/summary/,/api/alerts/ --token <access JWT>
+    python manage.py load_test --concurrency 500 --slow-clients 50 --slow-delay 2
+"""
+
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Prueba de carga de endpoints GET con N conexiones concurrentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='URL base del servidor')
+        parser.add_argument(
+            '--paths',
+            default='/api/config/',
+            help='Rutas separadas por coma; cada conexión las recorre en orden (por defecto /api/config/)',
+        )
+        parser.add_argument('--concurrency', type=int, default=500, help='Conexiones simultáneas (por defecto 500)')
+        parser.add_argument('--duration', type=float, default=30, help='Segundos de medición (por defecto 30)')
+        parser.add_argument('--timeout', type=float, default=30, help='Timeout por request en segundos (por defecto 30)')
+        parser.add_argument('--token', default='', help='Access token JWT para endpoints autenticados')
+        parser.add_argument(
+            '--slow-clients',
+            type=int,
+            default=0,
+            help='Conexiones (del total) que envían cada request en dos partes (por defecto 0)',
+        )
+        parser.add_argument(
+            '--slow-delay',
+            type=float,
+            default=2.0,
+            help='Segundos entre las dos partes de la request de un cliente lento (por defecto 2)',
+        )
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http' or not url.hostname:
+            raise CommandError('--url debe ser http://host[:puerto]')
+        paths = [path.strip() for path in options['paths'].split(',') if path.strip()]
+        if not paths:
+            raise CommandError('--paths no puede estar vacío')
+        if not 0 <= options['slow_clients'] <= options['concurrency']:
+            raise CommandError('--slow-clients debe estar entre 0 y --concurrency')
+
+        self.stdout.write(
+            f'🚀 {options["concurrency"]} conexiones durante {options["duration"]:.0f}s contra '
+            f'{options["url"]} ({", ".join(paths)})'
+        )
+        groups = asyncio.run(self._run(url.hostname, url.port or 80, paths, options))
+        self.stdout.write('=' * 60)
+        for title, stats in groups:
+            self._report(title, stats, options['duration'])
+        self.stdout.write('=' * 60)
+
+    async def _run(self, host, port, paths, options):
+        headers = f'Host: {host}:{port}\r\nAccept: application/json\r\n'
+        if options['token']:
+            headers += f'Authorization: Bearer {options["token"]}\r\n'
+        requests = [f'GET {path} HTTP/1.1\r\n{headers}\r\n'.encode() for path in paths]
+
+        slow_count = options['slow_clients']
+        fast = self._new_stats()
+        slow = self._new_stats()
+        deadline = time.monotonic() + options['duration']
+        await asyncio.gather(*[
+            self._connection(host, port, requests, deadline, options['timeout'], fast, 0)
+            for _ in range(options['concurrency'] - slow_count)
+        ], *[
+            self._connection(host, port, requests, deadline, options['timeout'], slow, options['slow_delay'])
+            for _ in range(slow_count)
+        ])
+
+        if not slow_count:
+            return [('Requests', fast)]
+        return [('Clientes normales', fast), (f'Clientes lentos (+{options["slow_delay"]:g}s)', slow)]
+
+    @staticmethod
+    def _new_stats():
+        return {'latencies': [], 'statuses': {}, 'errors': 0, 'connect_errors': 0}
+
+    async def _connection(self, host, port, requests, deadline, timeout, stats, slow_delay):
+        reader = writer = None
+        index = 0
+        while time.monotonic() < deadline:
+            if writer is None:
+                try:
+                    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+                except (OSError, asyncio.TimeoutError):
+                    stats['connect_errors'] += 1
+                    await asyncio.sleep(0.1)
+                    continue
+
+            request = requests[index % len(requests)]
+            start = time.perf_counter()
+            try:
+                if slow_delay:
+                    half = len(request) // 2
+                    writer.write(request[:half])
+                    await writer.drain()
+                    await asyncio.sleep(slow_delay)
+                    request = request[half:]
+                writer.write(request)
+                status, keep_alive = await asyncio.wait_for(self._read_response(reader), timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                stats['errors'] += 1
+                writer.close()
+                reader = writer = None
+                continue
+
+            stats['latencies'].append(time.perf_counter() - start)
+            stats['statuses'][status] = stats['statuses'].get(status, 0) + 1
+            index += 1
+            if not keep_alive:
+                writer.close()
+                reader = writer = None
+
+        if writer is not None:
+            writer.close()
+
+    @staticmethod
+    async def _read_response(reader):
+        """Lee una respuesta completa (Content-Length o chunked). Retorna (status, keep_alive)."""
+        head = await reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split(' ', 2)[1])
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip().lower()
+
+        if headers.get('transfer-encoding') == 'chunked':
+            while True:
+                size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            await reader.readexactly(int(headers.get('content-length', 0)))
+        return status, headers.get('connection') != 'close'
+
+    def _report(self, title, stats, duration):
+        latencies = sorted(stats['latencies'])
+        total = len(latencies)
+        if not total:
+            self.stdout.write(self.style.ERROR(f'❌ {title}: ninguna request completada'))
+            return
+
+        def percentile(p):
+            return latencies[min(total - 1, int(total * p))] * 1000
+
+        statuses = ', '.join(f'{code}: {count}' for code, count in sorted(stats['statuses'].items()))
+        self.stdout.write(f'📊 {title} completadas: {total} ({total / duration:,.0f} req/s)')
+        self.stdout.write(f'   Status: {statuses}')
+        self.stdout.write(
+            f'   Latencia ms  p50: {percentile(0.50):.1f}  p95: {percentile(0.95):.1f}  '
+            f'p99: {percentile(0.99):.1f}  máx: {latencies[-1] * 1000:.1f}'
+        )
+        if stats['errors'] or stats['connect_errors']:
+            self.stdout.write(self.style.WARNING(
+                f'⚠️  Errores: {stats["errors"]} en requests, {stats["connect_errors"]} al conectar'
+            ))
@@ -0,0 +1,64 @@
+"""
+Comando de Django para mantener las particiones mensuales de AuditLog (PostgreSQL).
+
+Uso:
+    python manage.py manage_audit_partitions                    # Crea las particiones de los próximos 3 meses
+    python manage.py manage_audit_partitions --months-ahead 6
+    python manage.py manage_audit_partitions --archive          # Además archiva las particiones vencidas
+    python manage.py manage_audit_partitions --archive --retention-months 6 --archive-dir /backups/audit
+"""
+
+from django.core.management.base import BaseCommand
+
+from inventory_app.services.audit_partition_service import AuditPartitionService
+
+
+class Command(BaseCommand):
+    help = 'Crea particiones futuras de AuditLog y archiva las que superan la retención'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=3,
+            help='Meses futuros para los que se crean particiones (por defecto 3)',
+        )
+        parser.add_argument(
+            '--archive',
+            action='store_true',
+            help='Separar, exportar a .jsonl.gz y eliminar las particiones vencidas',
+        )
+        parser.add_argument(
+            '--retention-months',
+            type=int,
+            default=None,
+            help='Meses a conservar (por defecto AUDIT_LOG_RETENTION_MONTHS)',
+        )
+        parser.add_argument(
+            '--archive-dir',
+            default=None,
+            help='Directorio de los archivos exportados (por defecto AUDIT_LOG_ARCHIVE_DIR)',
+        )
+
+    def handle(self, *args, **options):
+        if not AuditPartitionService.is_supported():
+            self.stdout.write(
+                self.style.WARNING('⏭️  El particionado de AuditLog solo está disponible en PostgreSQL')
+            )
+            return
+
+        created = AuditPartitionService.ensure_partitions(options['months_ahead'])
+        for name in created:
+            self.stdout.write(self.style.SUCCESS(f'✅ Partición creada: {name}'))
+        if not created:
+            self.stdout.write('ℹ️  Las particiones futuras ya existen')
+
+        if options['archive']:
+            archived = AuditPartitionService.archive_expired(
+                retention_months=options['retention_months'],
+                archive_dir=options['archive_dir'],
+            )
+            for path in archived:
+                self.stdout.write(self.style.SUCCESS(f'📦 Partición archivada: {path}'))
+            if not archived:
+                self.stdout.write('ℹ️  No hay particiones vencidas')
@@ -0,0 +1,57 @@
+"""
+Comando de Django para conciliar el stock de los productos con su historial de movimientos.
+
+Uso:
+    python manage.py reconcile_stock            # Solo reporta diferencias
+    python manage.py reconcile_stock --repair   # Corrige current_stock según los movimientos
+"""
+
+from django.core.management.base import BaseCommand
+
+from inventory_app.services.stock_reconciliation_service import StockReconciliationService
+
+
+class Command(BaseCommand):
+    help = 'Compara current_stock de cada producto con el stock esperado según sus movimientos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repair',
+            action='store_true',
+            help='Corregir current_stock de los productos con diferencias',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='Cantidad de productos con diferencias a mostrar (por defecto 20)',
+        )
+
+    def handle(self, *args, **options):
+        run = StockReconciliationService.reconcile(repair=options['repair'])
+
+        self.stdout.write('=' * 60)
+        self.stdout.write(f'📦 Productos revisados: {run.products_checked}')
+
+        if not run.drift_count:
+            self.stdout.write(self.style.SUCCESS('✅ Sin diferencias de stock'))
+            self.stdout.write('=' * 60)
+            return
+
+        self.stdout.write(
+            self.style.WARNING(
+                f'⚠️  Productos con diferencias: {run.drift_count} '
+                f'(total {run.total_abs_drift} unidades)'
+            )
+        )
+        for row in run.details[:options['limit']]:
+            self.stdout.write(
+                f"   Producto {row['product_id']}: actual={row['current_stock']} "
+                f"esperado={row['expected_stock']} diferencia={row['drift']:+d}"
+            )
+
+        if run.repair:
+            self.stdout.write(self.style.SUCCESS(f'✅ Corregidos: {run.repaired_count}'))
+        else:
+            self.stdout.write('ℹ️  Usa --repair para corregir current_stock')
+        self.stdout.write('=' * 60)
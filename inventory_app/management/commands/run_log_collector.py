@@ -0,0 +1,56 @@
+"""
+Comando de Django que ejecuta el colector de logs: el único proceso que escribe
+y rota los archivos de logs/ (general, errors, inventory y audit).
+
+Los workers de gunicorn y de Celery del mismo host envían sus registros por el
+socket Unix LOG_COLLECTOR_SOCKET (ver utils/log_shipping.py).
+
+Uso:
+    python manage.py run_log_collector
+    python manage.py run_log_collector --socket /tmp/inventory-logs.sock --logs-dir /var/log/inventory
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from inventory_app.logging_config import LOGS_DIR
+from inventory_app.utils.log_shipping import LogCollector
+
+
+class Command(BaseCommand):
+    help = 'Recibe los logs de todos los procesos y los escribe en los archivos de logs/'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--socket',
+            default=None,
+            help='Socket Unix donde escuchar (por defecto LOG_COLLECTOR_SOCKET)',
+        )
+        parser.add_argument(
+            '--logs-dir',
+            default=LOGS_DIR,
+            help='Directorio de los archivos de log (por defecto logs/)',
+        )
+        parser.add_argument(
+            '--max-bytes',
+            type=int,
+            default=10 * 1024 * 1024,
+            help='Tamaño máximo de cada archivo antes de rotar (por defecto 10 MB)',
+        )
+
+    def handle(self, *args, **options):
+        socket_path = options['socket'] or settings.LOG_COLLECTOR_SOCKET
+        if not socket_path:
+            self.stdout.write(self.style.WARNING('⏭️  LOG_COLLECTOR_SOCKET está vacío; no hay nada que recolectar'))
+            return
+
+        collector = LogCollector(socket_path, options['logs_dir'], max_bytes=options['max_bytes'])
+        self.stdout.write(self.style.SUCCESS(f'📝 Colector de logs escuchando en {socket_path}'))
+        self.stdout.write(f'📁 Archivos en {options["logs_dir"]}')
+        try:
+            collector.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            collector.server_close()
+            self.stdout.write(f'🛑 Colector detenido ({collector.written} registros escritos)')
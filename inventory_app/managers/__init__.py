@@ -1,4 +1,5 @@
 # managers/__init__.py
 from .soft_delete_manager import SoftDeleteManager
+from .audit_log_manager import AuditLogManager
 
-__all__ = ['SoftDeleteManager']
+__all__ = ['SoftDeleteManager', 'AuditLogManager']
@@ -0,0 +1,42 @@
+# managers/audit_log_manager.py
+"""
+Manager para AuditLog con filtros por rango de fechas.
+
+La tabla está particionada por mes sobre `timestamp` (PostgreSQL): filtrar por
+fecha permite que el planificador consulte solo las particiones involucradas.
+"""
+from datetime import timedelta
+
+from django.db import models
+from django.utils import timezone
+
+
+class AuditLogQuerySet(models.QuerySet):
+    """QuerySet de AuditLog acotado por fechas."""
+
+    def between(self, start, end=None):
+        """
+        Registros en el rango [start, end).
+
+        Args:
+            start: Inicio (inclusive)
+            end: Fin (exclusivo). Por defecto, sin límite superior
+        """
+        queryset = self.filter(timestamp__gte=start)
+        if end is not None:
+            queryset = queryset.filter(timestamp__lt=end)
+        return queryset
+
+    def recent(self, days=30):
+        """Registros de los últimos `days` días."""
+        return self.between(timezone.now() - timedelta(days=days))
+
+
+class AuditLogManager(models.Manager.from_queryset(AuditLogQuerySet)):
+    """
+    Manager de AuditLog.
+
+    Ejemplos:
+        AuditLog.objects.recent(7)
+        AuditLog.objects.between(inicio_mes, fin_mes).filter(user=user)
+    """
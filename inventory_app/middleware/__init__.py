@@ -1,4 +1,7 @@
 # middleware/__init__.py
 from .audit_middleware import AuditMiddleware
+from .metrics_middleware import MetricsMiddleware
+from .query_inspector_middleware import QueryInspectorMiddleware
+from .replica_middleware import ReplicaRoutingMiddleware
 
-__all__ = ['AuditMiddleware']
+__all__ = ['AuditMiddleware', 'MetricsMiddleware', 'QueryInspectorMiddleware', 'ReplicaRoutingMiddleware']
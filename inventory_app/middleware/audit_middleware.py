@@ -2,74 +2,115 @@
 """
 Middleware para auditoría automática de todas las requests.
 Registra información sobre quién accedió a qué y cuándo.
+
+Cada request produce un único registro (dict) que se encola para el hilo de
+escritura (ver utils/audit_logging.py); el parseo del body, el enmascarado
+de campos sensibles y la serialización JSON ocurren fuera de la request.
 """
 import logging
-import json
-from django.utils import timezone
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject, empty
+
+from inventory_app.utils import audit_buffer
 
 logger = logging.getLogger('inventory_app.audit')
 
+WRITE_METHODS = ('POST', 'PUT', 'PATCH')
+
 
 class AuditMiddleware:
     """
     Middleware que registra todas las peticiones HTTP para crear un audit trail.
     """
+    sync_capable = True
+    async_capable = True
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self.max_body_bytes = getattr(settings, 'AUDIT_BODY_MAX_BYTES', 4096)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        # Registrar la request antes de procesarla
-        self._log_request(request)
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        started = time.perf_counter()
+        # El body debe capturarse antes de que la vista consuma el stream
+        body = self._capture_body(request)
 
-        # Procesar la request
-        response = self.get_response(request)
+        # Los AuditLog registrados durante la request se escriben en un solo bulk_create
+        with audit_buffer.collect():
+            response = self.get_response(request)
 
-        # Registrar la response
-        self._log_response(request, response)
+        if logger.isEnabledFor(logging.INFO):
+            self._log(request, response, body, time.perf_counter() - started, getattr(request, 'user', None))
 
         return response
 
-    def _log_request(self, request):
-        """Registra información de la request entrante"""
-        user = getattr(request, 'user', None)
-        user_info = 'Anonymous'
-
-        if user and user.is_authenticated:
-            user_info = f"{user.email} (ID: {user.id}, Role: {user.role})"
-
-        # Obtener el cuerpo de la request para requests POST/PUT/PATCH
-        body = None
-        if request.method in ['POST', 'PUT', 'PATCH']:
-            try:
-                if request.content_type == 'application/json':
-                    body = json.loads(request.body) if request.body else None
-                    # Ocultar campos sensibles
-                    if body and isinstance(body, dict):
-                        body = self._sanitize_data(body)
-            except:
-                body = "<binary or non-JSON data>"
-
-        logger.info(
-            f"[REQUEST] {request.method} {request.path} | "
-            f"User: {user_info} | "
-            f"IP: {self._get_client_ip(request)} | "
-            f"Body: {body}"
-        )
-
-    def _log_response(self, request, response):
-        """Registra información de la response"""
-        user = getattr(request, 'user', None)
-        user_info = 'Anonymous'
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        body = self._capture_body(request)
+
+        async with audit_buffer.acollect():
+            response = await self.get_response(request)
 
-        if user and user.is_authenticated:
-            user_info = f"{user.email}"
+        if logger.isEnabledFor(logging.INFO):
+            duration = time.perf_counter() - started
+            self._log(request, response, body, duration, await self._auser(request))
 
-        logger.info(
-            f"[RESPONSE] {request.method} {request.path} | "
-            f"Status: {response.status_code} | "
-            f"User: {user_info}"
-        )
+        return response
+
+    @staticmethod
+    async def _auser(request):
+        """
+        Usuario de la request sin consultar la base desde el event loop: las
+        vistas DRF ya lo resolvieron; si quedó el usuario de sesión sin
+        evaluar (admin, 404...) se resuelve con request.auser().
+        """
+        user = getattr(request, 'user', None)
+        if isinstance(user, SimpleLazyObject) and user._wrapped is empty and hasattr(request, 'auser'):
+            return await request.auser()
+        return user
+
+    def _capture_body(self, request):
+        """
+        Retorna los bytes del body JSON de requests de escritura, acotado a
+        AUDIT_BODY_MAX_BYTES. El parseo se hace después, en el hilo de escritura.
+        """
+        if request.method not in WRITE_METHODS or request.content_type != 'application/json':
+            return None
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return None
+        if length > self.max_body_bytes:
+            return f'<truncated {length} bytes>'
+        try:
+            return request.body
+        except Exception:
+            return '<binary or non-JSON data>'
+
+    def _log(self, request, response, body, duration, user):
+        """Encola un único registro de auditoría por request."""
+        authenticated = bool(user and user.is_authenticated)
+
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'user_id': user.id if authenticated else None,
+            'user': user.email if authenticated else 'Anonymous',
+            'role': getattr(user, 'role', None) if authenticated else None,
+            'ip': self._get_client_ip(request),
+            'duration_ms': round(duration * 1000, 2),
+        }
+        if body is not None:
+            record['body'] = body
+        logger.info(record)
 
     def _get_client_ip(self, request):
         """Obtiene la IP real del cliente"""
@@ -79,16 +120,3 @@ class AuditMiddleware:
         else:
             ip = request.META.get('REMOTE_ADDR')
         return ip
-
-    def _sanitize_data(self, data):
-        """
-        Remueve o enmascara campos sensibles del log.
-        """
-        sensitive_fields = ['password', 'token', 'secret', 'api_key', 'authorization']
-        sanitized = data.copy()
-
-        for key in list(sanitized.keys()):
-            if any(sensitive in key.lower() for sensitive in sensitive_fields):
-                sanitized[key] = '***REDACTED***'
-
-        return sanitized
@@ -0,0 +1,77 @@
+# middleware/metrics_middleware.py
+"""
+Middleware que mide cada request: latencia, consultas SQL y tiempo en BD por endpoint.
+Las métricas se exponen en /api/metrics (ver utils/metrics.py).
+"""
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+from inventory_app.utils.db_instrumentation import execute_wrapper_all
+from inventory_app.utils.metrics import QueryCounter, recorder
+
+
+class MetricsMiddleware:
+    """
+    Registra latencia y costo de base de datos de cada request, etiquetados por
+    la ruta de URL resuelta (p. ej. 'api/products/<int:pk>/'), método y status.
+    Se desactiva con METRICS_ENABLED=False.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'METRICS_ENABLED', True)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with execute_wrapper_all(counter):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        recorder.observe(
+            (self._view_label(request), request.method, str(response.status_code)),
+            duration,
+            counter.count,
+            counter.duration,
+        )
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with execute_wrapper_all(counter):
+            response = await self.get_response(request)
+        duration = time.perf_counter() - start
+
+        recorder.observe(
+            (self._view_label(request), request.method, str(response.status_code)),
+            duration,
+            counter.count,
+            counter.duration,
+            autoflush=False,
+        )
+        if recorder.flush_due():
+            # El volcado a Redis es bloqueante: fuera del event loop
+            await sync_to_async(recorder.flush, thread_sensitive=False)()
+        return response
+
+    def _view_label(self, request):
+        """Ruta de URL de la vista (cardinalidad acotada) o 'unmatched' si no hubo match."""
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return 'unmatched'
+        return match.route or match.view_name or 'unmatched'
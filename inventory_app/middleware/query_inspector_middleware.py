@@ -0,0 +1,53 @@
+# middleware/query_inspector_middleware.py
+"""
+Middleware que detecta consultas lentas y patrones N+1 en cada request
+(ver utils/query_inspector.py). Pensado para desarrollo y CI; en producción
+se activa explícitamente con QUERY_INSPECTOR_ENABLED=True.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from inventory_app.utils.db_instrumentation import execute_wrapper_all
+from inventory_app.utils.query_inspector import QueryInspector
+
+
+class QueryInspectorMiddleware:
+    """
+    Envuelve la request en un QueryInspector y reporta los hallazgos al final,
+    etiquetados con el método y la ruta de la vista que los originó.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'QUERY_INSPECTOR_ENABLED', False)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        inspector = QueryInspector()
+        with execute_wrapper_all(inspector):
+            response = self.get_response(request)
+        return self._report(request, inspector, response)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        inspector = QueryInspector()
+        with execute_wrapper_all(inspector):
+            response = await self.get_response(request)
+        return self._report(request, inspector, response)
+
+    def _report(self, request, inspector, response):
+        match = getattr(request, 'resolver_match', None)
+        route = (match.route or match.view_name) if match else request.path
+        inspector.label = f"{request.method} {route}"
+        inspector.report()
+        return response
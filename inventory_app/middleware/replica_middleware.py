@@ -0,0 +1,112 @@
+# middleware/replica_middleware.py
+"""
+Middleware que habilita las lecturas desde la réplica en requests de solo
+lectura (ver inventory_app/db_routers.py).
+
+Cuando una request escribe en la base, el cliente queda fijado al primario
+por REPLICA_STICKY_SECONDS con una clave en Redis, identificado por el user id
+de su access token o por su cookie de sesión (admin). Si Redis no responde,
+la request lee del primario.
+"""
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from inventory_app import db_routers
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Abre un contexto de enrutamiento por request: réplica para GET/HEAD/OPTIONS
+    de clientes no fijados, primario para el resto. Sin el alias 'replica' en
+    DATABASES no hace nada.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = db_routers.replica_configured()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        from redis import RedisError
+        from inventory_app.utils.redis_client import get_redis
+
+        identity = self._identity(request)
+        use_replica = request.method in SAFE_METHODS
+        if use_replica and identity:
+            try:
+                use_replica = not get_redis().exists(db_routers.pin_key(identity))
+            except RedisError as exc:
+                logger.debug(f"No se pudo verificar el pin al primario: {exc}")
+                use_replica = False
+
+        with db_routers.routing(use_replica) as state:
+            response = self.get_response(request)
+
+        if state.wrote and identity:
+            try:
+                get_redis().set(db_routers.pin_key(identity), 1, ex=self._sticky_seconds())
+            except RedisError as exc:
+                logger.warning(f"No se pudo fijar el cliente al primario tras escribir: {exc}")
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        from redis import RedisError
+        from inventory_app.utils.redis_client import get_async_redis
+
+        identity = self._identity(request)
+        use_replica = request.method in SAFE_METHODS
+        if use_replica and identity:
+            try:
+                use_replica = not await get_async_redis().exists(db_routers.pin_key(identity))
+            except RedisError as exc:
+                logger.debug(f"No se pudo verificar el pin al primario: {exc}")
+                use_replica = False
+
+        with db_routers.routing(use_replica) as state:
+            response = await self.get_response(request)
+
+        if state.wrote and identity:
+            try:
+                await get_async_redis().set(db_routers.pin_key(identity), 1, ex=self._sticky_seconds())
+            except RedisError as exc:
+                logger.warning(f"No se pudo fijar el cliente al primario tras escribir: {exc}")
+        return response
+
+    @staticmethod
+    def _sticky_seconds():
+        return getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+
+    @staticmethod
+    def _identity(request):
+        """
+        Identifica al cliente sin consultar la base: user id del access token
+        (firma verificada) o cookie de sesión. None para clientes anónimos.
+        """
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        parts = header.split()
+        if len(parts) == 2 and parts[0] in api_settings.AUTH_HEADER_TYPES:
+            try:
+                return f"user:{AccessToken(parts[1])[api_settings.USER_ID_CLAIM]}"
+            except (TokenError, KeyError):
+                return None
+        session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        return f"session:{session_key}" if session_key else None
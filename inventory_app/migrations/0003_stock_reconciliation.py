@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory_app', '0002_stock_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockReconciliation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(db_index=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('products_checked', models.PositiveIntegerField(default=0)),
+                ('drift_count', models.PositiveIntegerField(default=0)),
+                ('total_abs_drift', models.PositiveIntegerField(default=0)),
+                ('repair', models.BooleanField(default=False)),
+                ('repaired_count', models.PositiveIntegerField(default=0)),
+                ('details', models.JSONField(blank=True, default=list)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Convierte inventory_app_auditlog en una tabla particionada por mes (solo PostgreSQL).
+#
+# El estado de los modelos de Django no cambia: la tabla conserva las mismas
+# columnas e índices, pero la clave primaria pasa a ser (id, timestamp), como
+# exige PostgreSQL para tablas particionadas, y `id` usa una secuencia propia.
+# En otros motores (SQLite en tests) la migración no hace nada.
+
+from datetime import date, datetime, timezone
+
+from django.db import migrations
+
+TABLE = 'inventory_app_auditlog'
+LEGACY = 'inventory_app_auditlog_legacy'
+SEQUENCE = 'inventory_app_auditlog_id_seq'
+MONTHS_AHEAD = 3
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _bound(month):
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+
+def partition_audit_log(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'SELECT min("timestamp"), max("timestamp") FROM {TABLE}')
+        oldest, newest = cursor.fetchone()
+
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {LEGACY}')
+        cursor.execute(f'''
+            CREATE TABLE {TABLE} (
+                "id" bigint NOT NULL,
+                "user_email" varchar(255) NOT NULL,
+                "action" varchar(50) NOT NULL,
+                "model_name" varchar(100) NOT NULL,
+                "object_id" integer NULL,
+                "object_repr" varchar(200) NOT NULL,
+                "changes" jsonb NULL,
+                "ip_address" inet NULL,
+                "user_agent" text NOT NULL,
+                "timestamp" timestamp with time zone NOT NULL,
+                "user_id" bigint NULL,
+                PRIMARY KEY ("id", "timestamp")
+            ) PARTITION BY RANGE ("timestamp")
+        ''')
+
+        # Una partición por mes desde el registro más antiguo hasta MONTHS_AHEAD meses adelante
+        today = datetime.now(timezone.utc).date().replace(day=1)
+        month = (oldest.date().replace(day=1) if oldest else today)
+        last = _add_months(max(today, newest.date().replace(day=1)) if newest else today, MONTHS_AHEAD)
+        while month <= last:
+            cursor.execute(
+                f'CREATE TABLE {TABLE}_p{month:%Y%m} PARTITION OF {TABLE} FOR VALUES FROM (%s) TO (%s)',
+                [_bound(month), _bound(_add_months(month, 1))],
+            )
+            month = _add_months(month, 1)
+        # Red de seguridad para filas fuera de las particiones creadas
+        cursor.execute(f'CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT')
+
+        cursor.execute(f'''
+            INSERT INTO {TABLE} ("id", "user_email", "action", "model_name", "object_id", "object_repr",
+                                 "changes", "ip_address", "user_agent", "timestamp", "user_id")
+            SELECT "id", "user_email", "action", "model_name", "object_id", "object_repr",
+                   "changes", "ip_address", "user_agent", "timestamp", "user_id"
+            FROM {LEGACY}
+        ''')
+        cursor.execute(f'DROP TABLE {LEGACY}')
+
+        # Identity no está soportado en tablas particionadas (PostgreSQL < 17): secuencia propia
+        cursor.execute(f'CREATE SEQUENCE {SEQUENCE} OWNED BY {TABLE}."id"')
+        cursor.execute(f'ALTER TABLE {TABLE} ALTER COLUMN "id" SET DEFAULT nextval(\'{SEQUENCE}\')')
+        cursor.execute(f'SELECT setval(\'{SEQUENCE}\', COALESCE((SELECT max("id") FROM {TABLE}), 0) + 1, false)')
+
+        # Índices y FK sobre la tabla padre (se propagan a cada partición)
+        cursor.execute(
+            f'ALTER TABLE {TABLE} ADD CONSTRAINT inventory_app_auditlog_user_id_fk '
+            f'FOREIGN KEY ("user_id") REFERENCES inventory_app_user ("id") DEFERRABLE INITIALLY DEFERRED'
+        )
+        cursor.execute(f'CREATE INDEX inventory_app_auditlog_timestamp_3cd8f2dd ON {TABLE} ("timestamp")')
+        cursor.execute(f'CREATE INDEX inventory_app_auditlog_user_id_ab13677d ON {TABLE} ("user_id")')
+        cursor.execute(f'CREATE INDEX inventory_a_timesta_408d11_idx ON {TABLE} ("timestamp" DESC, "user_id")')
+        cursor.execute(f'CREATE INDEX inventory_a_model_n_689bdb_idx ON {TABLE} ("model_name", "timestamp" DESC)')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory_app', '0004_audit_log_timestamp_default'),
+    ]
+
+    operations = [
+        # Irreversible en la práctica: revertir solo deja de registrar la migración
+        migrations.RunPython(partition_audit_log, migrations.RunPython.noop),
+    ]
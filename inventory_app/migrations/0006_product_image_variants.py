@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory_app', '0005_partition_audit_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='image_status',
+            field=models.CharField(blank=True, choices=[('processing', 'Procesando'), ('ready', 'Lista'), ('failed', 'Fallida')], default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
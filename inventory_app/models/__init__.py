@@ -11,3 +11,5 @@ from .quotation import *
 from .quoted_product import *
 from .report import *
 from .audit_log import *
+from .stock_snapshot import *
+from .stock_reconciliation import *
@@ -2,9 +2,14 @@
 """
 Modelo para almacenar un audit trail de cambios críticos en la base de datos.
 Registra quién modificó qué y cuándo.
+
+En PostgreSQL la tabla está particionada por mes sobre `timestamp`
+(ver migración 0005 y services/audit_partition_service.py).
 """
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+from inventory_app.managers import AuditLogManager
 
 
 class AuditLog(models.Model):
@@ -41,8 +46,11 @@ class AuditLog(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
 
-    # Cuándo
-    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Cuándo (se asigna al registrar la acción, no al escribir el bloque)
+    timestamp = models.DateTimeField(default=timezone.now, db_index=True)
+
+    # Managers
+    objects = AuditLogManager()  # Incluye between()/recent() para consultar solo las particiones necesarias
 
     class Meta:
         ordering = ['-timestamp']
@@ -66,7 +74,13 @@ class AuditLog(models.Model):
             obj: Instancia del objeto afectado (opcional)
             changes: Diccionario con los cambios realizados (opcional)
             request: Objeto request de Django (para obtener IP y user agent)
+
+        Returns:
+            AuditLog: El registro. Salvo en modo 'sync' se escribe en bloque al final
+            de la request (ver utils/audit_buffer.py), por lo que aún puede no tener pk.
         """
+        from inventory_app.utils import audit_buffer
+
         log = AuditLog(
             user=user if user and user.is_authenticated else None,
             user_email=user.email if user and user.is_authenticated else 'anonymous',
@@ -90,5 +104,5 @@ class AuditLog(models.Model):
             # Obtener User Agent
             log.user_agent = request.META.get('HTTP_USER_AGENT', '')[:500]
 
-        log.save()
+        audit_buffer.record(log)
         return log
@@ -8,6 +8,16 @@ from inventory_app.validators import validate_image_size, validate_image_dimensi
 from inventory_app.constants import ValidationMessages
 
 class Product(models.Model):
+    # Estado del procesamiento asíncrono de la imagen (ver ProductImageService)
+    IMAGE_PROCESSING = 'processing'
+    IMAGE_READY = 'ready'
+    IMAGE_FAILED = 'failed'
+    IMAGE_STATUS_CHOICES = [
+        (IMAGE_PROCESSING, 'Procesando'),
+        (IMAGE_READY, 'Lista'),
+        (IMAGE_FAILED, 'Fallida'),
+    ]
+
     name = models.CharField(max_length=100, db_index=True)  # Índice para búsquedas rápidas por nombre
     description = models.TextField(blank=True, null=True)
     category = models.ForeignKey(Category, on_delete=models.PROTECT, related_name='products')
@@ -26,6 +36,8 @@ class Product(models.Model):
         blank=True,
         validators=[validate_image_size, validate_image_dimensions]  # Validación de tamaño y dimensiones
     )
+    image_variants = models.JSONField(default=dict, blank=True)  # {'thumb': nombre, 'medium': nombre} en WebP
+    image_status = models.CharField(max_length=20, choices=IMAGE_STATUS_CHOICES, blank=True, default='')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
@@ -0,0 +1,28 @@
+# models/stock_reconciliation.py
+"""
+Registro de cada ejecución de la conciliación de stock contra el historial de movimientos.
+"""
+from django.db import models
+
+
+class StockReconciliation(models.Model):
+    """
+    Resultado de una conciliación: cuántos productos se revisaron, cuántos
+    tenían diferencias entre current_stock y el stock esperado según los
+    movimientos, y si se corrigieron.
+    """
+    started_at = models.DateTimeField(db_index=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    products_checked = models.PositiveIntegerField(default=0)
+    drift_count = models.PositiveIntegerField(default=0)
+    total_abs_drift = models.PositiveIntegerField(default=0)  # Suma de |diferencia| de todos los productos
+    repair = models.BooleanField(default=False)  # Si la ejecución debía corregir las diferencias
+    repaired_count = models.PositiveIntegerField(default=0)
+    # Detalle por producto: [{product_id, current_stock, expected_stock, drift}] (acotado)
+    details = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"Conciliación {self.started_at:%Y-%m-%d %H:%M}: {self.drift_count} diferencias"
@@ -0,0 +1,28 @@
+# models/stock_snapshot.py
+"""
+Fotografía diaria del stock de cada producto.
+Permite responder consultas históricas ("¿cuánto stock había el 31 de diciembre?")
+sin recorrer todo el historial de movimientos.
+"""
+from django.db import models
+from .product import Product
+
+
+class StockSnapshot(models.Model):
+    """
+    Stock de un producto al cierre de un día (zona horaria local).
+    Se genera en bloque mediante una tarea programada de Celery.
+    """
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='stock_snapshots')
+    date = models.DateField(db_index=True)  # Día cuyo cierre representa la fotografía
+    quantity = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'date'], name='unique_stock_snapshot_per_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} @ {self.date}: {self.quantity}"
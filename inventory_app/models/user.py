@@ -5,6 +5,21 @@ from django.core.validators import RegexValidator
 from inventory_app.managers.soft_delete_manager import SoftDeleteQuerySet
 from inventory_app.constants import UserRole, ValidationMessages
 
+class UserQuerySet(SoftDeleteQuerySet):
+    """
+    QuerySet de usuarios que invalida la caché de autenticación en los update()
+    masivos (incluido el soft delete), que no disparan post_save.
+    """
+
+    def update(self, **kwargs):
+        from inventory_app.authentication import invalidate_user
+
+        user_ids = list(self.values_list('pk', flat=True))
+        rows = super().update(**kwargs)
+        invalidate_user(*user_ids)
+        return rows
+
+
 class UserManager(BaseUserManager):
     """
     Manager personalizado para el modelo User con soporte para soft delete.
@@ -13,7 +28,7 @@ class UserManager(BaseUserManager):
 
     def get_queryset(self):
         """Filtra automáticamente usuarios eliminados (soft delete)"""
-        return SoftDeleteQuerySet(self.model, using=self._db).filter(deleted_at__isnull=True)
+        return UserQuerySet(self.model, using=self._db).filter(deleted_at__isnull=True)
 
     def create_user(self, email, password=None, **extra_fields):
         if not email:
@@ -38,7 +53,7 @@ class UserManager(BaseUserManager):
 
     def all_with_deleted(self):
         """Retorna todos los usuarios, incluidos los eliminados"""
-        return SoftDeleteQuerySet(self.model, using=self._db)
+        return UserQuerySet(self.model, using=self._db)
 
 class User(AbstractUser):
     username = None
@@ -84,3 +99,19 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.email
+
+    def save(self, *args, **kwargs):
+        """
+        Un usuario construido desde la caché o los claims del token
+        (authentication.build_user) solo escribe los campos que la request
+        modificó: los valores proyectados pueden estar desactualizados.
+        """
+        projection = getattr(self, '_auth_projection', None)
+        if projection is not None and kwargs.get('update_fields') is None and not self._state.adding:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in deferred
+                and (field.attname not in projection or getattr(self, field.attname) != projection[field.attname])
+            ]
+        super().save(*args, **kwargs)
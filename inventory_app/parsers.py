@@ -0,0 +1,39 @@
+# parsers.py
+"""
+Parser JSON basado en orjson, compatible con rest_framework.parsers.JSONParser.
+
+Si orjson rechaza el cuerpo (JSON inválido, surrogates sueltos) o la
+codificación no es UTF-8, se delega en el parser de DRF, así que lo que se
+acepta y los mensajes de error no cambian. También se delega cuando el cuerpo
+tiene 19 dígitos seguidos o más: orjson convierte los enteros que no entran en
+64 bits a float y json.loads los conserva exactos.
+"""
+import codecs
+import io
+
+import orjson
+from rest_framework.parsers import JSONParser, get_encoding
+
+from inventory_app.renderers import OrjsonRenderer
+
+_DIGITS_TO_ZERO = bytes.maketrans(b'123456789', b'000000000')
+_LONG_NUMBER = b'0' * 19
+
+
+class OrjsonParser(JSONParser):
+    """JSONParser de DRF con orjson (ver docstring del módulo)."""
+
+    renderer_class = OrjsonRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        if codecs.lookup(get_encoding(parser_context)).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if _LONG_NUMBER in body.translate(_DIGITS_TO_ZERO):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
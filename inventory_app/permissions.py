@@ -3,6 +3,9 @@
 Clases de permisos reutilizables para todas las vistas del sistema.
 Centraliza la lógica de autorización basada en roles.
 """
+import hmac
+
+from django.conf import settings
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 from inventory_app.constants import UserRole
 
@@ -41,3 +44,17 @@ class IsAdminForWrite(BasePermission):
         if request.method in SAFE_METHODS:
             return True
         return request.user.role in [UserRole.ADMINISTRATOR, UserRole.SUPER_ADMIN]
+
+
+class HasMetricsAccess(BasePermission):
+    """
+    Acceso a /api/metrics: el scraper de Prometheus con `Authorization: Metrics <METRICS_TOKEN>`
+    (si el token está configurado), o un Administrator/SuperAdmin autenticado.
+    """
+
+    def has_permission(self, request, view):
+        token = getattr(settings, 'METRICS_TOKEN', '')
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        if token and header.startswith('Metrics '):
+            return hmac.compare_digest(header[len('Metrics '):].strip(), token)
+        return IsAdmin().has_permission(request, view)
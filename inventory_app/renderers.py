@@ -0,0 +1,93 @@
+# renderers.py
+"""
+Renderers adicionales de DRF.
+
+OrjsonRenderer produce la misma salida (byte a byte) que
+rest_framework.renderers.JSONRenderer usando orjson. orjson serializa de forma
+nativa dict, list, str, int, float, bool, None, UUID y datetime/date/time; el
+resto de los tipos (Decimal, lazy strings, QuerySet, timedelta, sets...) pasa
+por el mismo `default` del encoder de DRF. Cuando la salida de orjson podría
+diferir de la de json.dumps se usa el renderer de DRF:
+
+- indentación (?indent=, API navegable), UNICODE_JSON=False o COMPACT_JSON=False
+- floats fuera de [1e-4, 1e16): json.dumps usa notación exponencial ('1e+16',
+  '1e-05') y orjson no ('1e16', '0.00001'); se detectan en la salida
+- enteros de más de 64 bits o strings con surrogates sueltos (orjson falla)
+- Decimal NaN/Infinity: `default` no los convierte a float y el renderer de DRF
+  lanza ValueError, como antes
+
+Diferencia conocida: un float nativo NaN/Infinity, p. ej. de un FloatField o de
+un agregado, se escribe como `null` (orjson) en lugar de lanzar ValueError
+(DRF). Detectarlo exigiría recorrer los datos en cada respuesta.
+"""
+import json
+import re
+from decimal import Decimal
+
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Floats que orjson escribe distinto a json.dumps ('1e16', '1.5e-7', '0.00001').
+# Recorrer la salida con una regex cuesta más que el propio orjson, así que
+# primero se busca con operaciones de bytes (un dígito seguido de 'e', o
+# '0.0000') y solo si aparece se confirma que sea un valor numérico. Un falso
+# positivo dentro de un string solo hace usar el renderer de DRF.
+_DIGITS_TO_ZERO = bytes.maketrans(b'123456789', b'000000000')
+_FLOAT_MISMATCH = re.compile(rb'(?:^|[:,\[])-?(?:\d+(?:\.\d+)?e-?\d+|0\.0000\d*)(?:[,\]}]|$)')
+
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class OrjsonRenderer(JSONRenderer):
+    """JSONRenderer de DRF con orjson (ver docstring del módulo)."""
+
+    _encoder_default = staticmethod(JSONEncoder().default)
+
+    @classmethod
+    def _default(cls, obj):
+        if isinstance(obj, Decimal) and not obj.is_finite():
+            # orjson lo escribiría como null: se renderiza con DRF, que lanza ValueError
+            raise TypeError('Decimal no finito')
+        return cls._encoder_default(obj)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.ensure_ascii or not self.compact or \
+                self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self._default, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self._float_mismatch(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Igual que DRF: \u2028 y \u2029 escapados para que sea un subconjunto estricto de JavaScript
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+    @staticmethod
+    def _float_mismatch(ret):
+        if b'0.0000' not in ret and b'0e' not in ret.translate(_DIGITS_TO_ZERO):
+            return False
+        return _FLOAT_MISMATCH.search(ret) is not None
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Permite que las vistas SSE acepten `Accept: text/event-stream` (EventSource).
+    El stream real lo produce la vista con StreamingHttpResponse; este renderer
+    solo se usa para respuestas de error (401, 403, etc.).
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return f"event: error\ndata: {json.dumps(data, default=str)}\n\n".encode(self.charset)
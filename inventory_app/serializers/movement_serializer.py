@@ -1,9 +1,13 @@
 # serializers/movement_serializer.py
 from rest_framework import serializers
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from inventory_app.constants import MovementType
 from inventory_app.models.movement import Movement
+from inventory_app.serializers.values_serializer import ValuesSerializer
 from inventory_app.services import MovementService
 
 class MovementSerializer(serializers.ModelSerializer):
@@ -90,3 +94,35 @@ class MovementSerializer(serializers.ModelSerializer):
         except DjangoValidationError as e:
             # Convertir ValidationError de Django a DRF
             raise serializers.ValidationError(str(e))
+
+
+class MovementValuesSerializer(ValuesSerializer):
+    """
+    Versión de solo lectura de MovementSerializer para GET /api/movements/
+    (ver serializers/values_serializer.py). El stock después del movimiento
+    se calcula en SQL.
+    """
+
+    fields = (
+        ('id', 'id'),
+        ('movement_type', 'movement_type'),
+        ('date', 'date'),
+        ('quantity', 'quantity'),
+        ('product', 'product_id'),
+        ('user', 'user_id'),
+        ('product_name', 'product__name'),
+        ('product_stock', 'stock_in_movement'),
+        ('stock_after_movement', Case(
+            When(movement_type=MovementType.INPUT, then=F('stock_in_movement') + F('quantity')),
+            When(movement_type=MovementType.OUTPUT, then=F('stock_in_movement') - F('quantity')),
+            default=F('stock_in_movement'),
+            output_field=IntegerField(),
+        )),
+        ('supplier_name', 'product__supplier__name'),
+        ('customer', 'customer_id'),
+        ('customer_name', Coalesce('customer__name', Value(''))),
+        ('user_name', 'user__name'),
+    )
+    formatters = {
+        'date': serializers.DateTimeField().to_representation,
+    }
@@ -1,12 +1,30 @@
 # serializers/product_serializer.py
 import logging
+import operator
+from functools import reduce
+
+from django.db.models import BooleanField, Case, Q, Value, When
 from rest_framework import serializers
+from inventory_app.constants import ImageConfig
 from inventory_app.models.product import Product
+from inventory_app.services.product_image_service import ProductImageService
+from inventory_app.serializers.values_serializer import ValuesSerializer
+from inventory_app.validators import validate_image_size, validate_image_dimensions
 
 logger = logging.getLogger(__name__)
 
+# Estados (en minúsculas) que se consideran producto inactivo
+INACTIVE_STATUSES = ['agotado', 'inactivo', 'out_of_stock', 'inactive']
+
 class ProductSerializer(serializers.ModelSerializer):
+   # FileField en lugar de ImageField: ImageField decodifica la imagen completa en la
+   # request; aquí solo se lee la cabecera y el worker la procesa (ProductImageService)
+   image = serializers.FileField(
+       write_only=True, required=False, allow_null=True,
+       validators=[validate_image_size, validate_image_dimensions],
+   )
    image_url = serializers.SerializerMethodField()
+   image_variants = serializers.SerializerMethodField()
    is_active = serializers.SerializerMethodField()
    category_name = serializers.CharField(source='category.name', read_only=True)
    supplier_name = serializers.CharField(source='supplier.name', read_only=True)
@@ -16,10 +34,11 @@ class ProductSerializer(serializers.ModelSerializer):
        fields = [
            'id', 'name', 'description', 'category', 'supplier',
            'price', 'minimum_stock', 'current_stock', 'status',
-           'image', 'image_url', 'is_active', 'category_name', 'supplier_name',
+           'image', 'image_url', 'image_variants', 'image_status',
+           'is_active', 'category_name', 'supplier_name',
        ]
+       read_only_fields = ['image_status']
        extra_kwargs = {
-           "image": {"write_only": True, "required": False},
            'name': {
                'error_messages': {
                    'required': 'El nombre es requerido.',
@@ -79,32 +98,111 @@ class ProductSerializer(serializers.ModelSerializer):
        if not obj.status:
            return False
        status_lower = obj.status.lower()
-       return status_lower not in ['agotado', 'inactivo', 'out_of_stock', 'inactive']
+       return status_lower not in INACTIVE_STATUSES
+
+   def create(self, validated_data):
+       image = validated_data.pop('image', None)
+       product = super().create(validated_data)
+       if image:
+           ProductImageService.stage_upload(product, image)
+       return product
+
+   def update(self, instance, validated_data):
+       clear_image = 'image' in validated_data and validated_data['image'] is None
+       image = validated_data.pop('image', None)
+       if clear_image:
+           # Se quitó la imagen explícitamente
+           validated_data.update(image=None, image_variants={}, image_status='')
+       product = super().update(instance, validated_data)
+       if image:
+           ProductImageService.stage_upload(product, image)
+       return product
 
    def get_image_url(self, obj):
-       if not obj.image:
-           return None
+       return public_image_url(obj.image.name) if obj.image else None
+
+   def get_image_variants(self, obj):
+       return image_variant_urls(obj.image.name, obj.image_variants)
+
+
+def public_image_url(name):
+    """URL pública de un archivo del storage de imágenes de productos (None si no aplica)."""
+    if not name:
+        return None
+
+    try:
+        url = Product._meta.get_field('image').storage.url(name)
+        logger.debug(f"Image {name}: URL = {url}")
+    except Exception as e:
+        logger.error(f"Error getting image URL for {name}: {e}")
+        return None
+
+    # Solo devolver URLs de Cloudinary válidas
+    if url and url.startswith('https://res.cloudinary.com/'):
+        logger.debug(f"Cloudinary URL found: {url}")
+        return url
+
+    # Si es ruta local (/media/), devolver null en lugar de la ruta rota
+    if url and url.startswith('/media/'):
+        logger.debug(f"Local path detected (Cloudinary not configured): {url}")
+        return None
+
+    # Para cualquier otra URL válida con http/https
+    if url and url.startswith('http'):
+        return url
 
-       try:
-           url = obj.image.url
-           logger.debug(f"Product {obj.name}: Image URL = {url}")
+    return None
 
-           # Solo devolver URLs de Cloudinary válidas
-           if url and url.startswith('https://res.cloudinary.com/'):
-               logger.debug(f"Cloudinary URL found: {url}")
-               return url
 
-           # Si es ruta local (/media/), devolver null en lugar de la ruta rota
-           if url and url.startswith('/media/'):
-               logger.debug(f"Local path detected (Cloudinary not configured): {url}")
-               return None
+def image_variant_urls(name, variants):
+    """
+    URLs de las variantes WebP por tamaño ({'thumb': url, 'medium': url}) para
+    que los listados no descarguen la imagen original. Mientras la imagen se
+    procesa (o en productos anteriores a las variantes) se usa la original.
+    """
+    original = public_image_url(name)
+    variants = variants or {}
+    return {
+        label: public_image_url(variants.get(label)) or original
+        for label in ImageConfig.VARIANT_SIZES
+    }
 
-           # Para cualquier otra URL válida con http/https
-           if url and url.startswith('http'):
-               return url
 
-           return None
+class ProductValuesSerializer(ValuesSerializer):
+    """
+    Versión de solo lectura de ProductSerializer para GET /api/products/
+    (ver serializers/values_serializer.py). is_active se calcula en SQL.
+    """
 
-       except Exception as e:
-           logger.error(f"Error getting image for {obj.name}: {e}")
-           return None
\ No newline at end of file
+    fields = (
+        ('id', 'id'),
+        ('name', 'name'),
+        ('description', 'description'),
+        ('category', 'category_id'),
+        ('supplier', 'supplier_id'),
+        ('price', 'price'),
+        ('minimum_stock', 'minimum_stock'),
+        ('current_stock', 'current_stock'),
+        ('status', 'status'),
+        ('image_status', 'image_status'),
+        ('is_active', Case(
+            When(
+                reduce(operator.or_, [Q(status__iexact=value) for value in INACTIVE_STATUSES],
+                       Q(status__isnull=True) | Q(status='')),
+                then=Value(False),
+            ),
+            default=Value(True),
+            output_field=BooleanField(),
+        )),
+        ('category_name', 'category__name'),
+        ('supplier_name', 'supplier__name'),
+        ('_image', 'image'),
+        ('_image_variants', 'image_variants'),
+    )
+    formatters = {
+        'price': serializers.DecimalField(max_digits=10, decimal_places=2).to_representation,
+    }
+    computed = (
+        ('image_url', lambda row: public_image_url(row['_image'])),
+        ('image_variants', lambda row: image_variant_urls(row['_image'], row['_image_variants'])),
+    )
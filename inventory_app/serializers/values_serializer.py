@@ -0,0 +1,70 @@
+# serializers/values_serializer.py
+"""
+Serialización de solo lectura para listados de alto volumen.
+
+Un ModelSerializer construye una instancia del modelo por fila y recorre sus
+campos DRF uno por uno (incluidos los SerializerMethodField). Un
+ValuesSerializer proyecta solo las columnas necesarias con values_list()
+(los cálculos por fila se hacen en SQL con anotaciones) y emite diccionarios
+planos; Python solo formatea las columnas que lo requieren (fechas, decimales,
+URLs de archivos).
+
+La salida debe ser idéntica a la del ModelSerializer equivalente, que sigue
+usándose para escrituras y detalle (ver tests de equivalencia).
+"""
+
+
+class ValuesSerializer:
+    """
+    Base de los serializadores por values_list().
+
+    Las subclases definen:
+        fields: ((clave, lookup o expresión), ...) columnas a consultar. Las
+                claves que empiezan con '_' solo alimentan campos calculados y
+                no se incluyen en la salida.
+        formatters: {clave: función(valor)} formato Python de una columna
+        computed: ((clave, función(fila)), ...) campos calculados en Python a
+                  partir de la fila ya formateada
+
+    Uso:
+        rows = MovementValuesSerializer.project(queryset)[:100]
+        data = MovementValuesSerializer(rows, many=True).data
+    """
+
+    fields = ()
+    formatters = {}
+    computed = ()
+
+    def __init__(self, instance=None, many=True, **kwargs):
+        self.instance = instance
+        self.many = many
+
+    @classmethod
+    def project(cls, queryset):
+        """QuerySet de tuplas con las columnas de `fields` (admite paginación y slicing)."""
+        return queryset.values_list(*[expression for _, expression in cls.fields])
+
+    @classmethod
+    def to_representation(cls, rows):
+        keys = [key for key, _ in cls.fields]
+        formatters = list(cls.formatters.items())
+        computed = cls.computed
+        hidden = [key for key in keys if key.startswith('_')]
+
+        data = []
+        for values in rows:
+            row = dict(zip(keys, values))
+            for key, formatter in formatters:
+                row[key] = formatter(row[key])
+            for key, function in computed:
+                row[key] = function(row)
+            for key in hidden:
+                del row[key]
+            data.append(row)
+        return data
+
+    @property
+    def data(self):
+        if self.many:
+            return self.to_representation(self.instance)
+        return self.to_representation([self.instance])[0]
@@ -11,5 +11,22 @@ from .quotation_service import QuotationService
 from .movement_service import MovementService
 from .sale_service import SaleService
 from .purchase_service import PurchaseService
+from .stock_snapshot_service import StockSnapshotService
+from .report_service import ReportService
+from .stock_reconciliation_service import StockReconciliationService
+from .audit_partition_service import AuditPartitionService
+from .contact_import_service import ContactImportService
+from .product_image_service import ProductImageService
 
-__all__ = ['QuotationService', 'MovementService', 'SaleService', 'PurchaseService']
+__all__ = [
+    'QuotationService',
+    'MovementService',
+    'SaleService',
+    'PurchaseService',
+    'StockSnapshotService',
+    'ReportService',
+    'StockReconciliationService',
+    'AuditPartitionService',
+    'ContactImportService',
+    'ProductImageService',
+]
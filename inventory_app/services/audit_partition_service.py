@@ -0,0 +1,209 @@
+# services/audit_partition_service.py
+"""
+Servicio para el mantenimiento de las particiones mensuales de AuditLog (PostgreSQL).
+
+La tabla inventory_app_auditlog está particionada por rango de `timestamp`
+(una partición por mes, ver migración 0005). Este servicio crea las particiones
+futuras y archiva las que superan el período de retención: las separa de la
+tabla, exporta sus filas a JSON Lines comprimido (gzip) y las elimina.
+"""
+
+import gzip
+import logging
+import os
+import re
+from datetime import date, datetime, timezone as dt_timezone
+from pathlib import Path
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = 'inventory_app_auditlog'
+DEFAULT_PARTITION = f'{PARENT_TABLE}_default'
+PARTITION_RE = re.compile(rf'^{PARENT_TABLE}_p(\d{{4}})(\d{{2}})$')
+
+
+class AuditPartitionService:
+    """
+    Servicio para crear y archivar particiones mensuales de AuditLog.
+
+    Responsabilidades:
+    - Crear por adelantado las particiones de los próximos meses
+    - Archivar (separar, exportar a .jsonl.gz y eliminar) las particiones vencidas
+    """
+
+    # Filas leídas por vuelta al exportar una partición
+    EXPORT_BATCH_SIZE = 2000
+
+    @staticmethod
+    def is_supported() -> bool:
+        """El particionado nativo solo existe en PostgreSQL."""
+        return connection.vendor == 'postgresql'
+
+    @staticmethod
+    def add_months(month: date, months: int) -> date:
+        """Retorna el primer día del mes desplazado `months` meses."""
+        index = month.year * 12 + month.month - 1 + months
+        return date(index // 12, index % 12 + 1, 1)
+
+    @staticmethod
+    def partition_name(month: date) -> str:
+        """Nombre de la partición del mes (p. ej. inventory_app_auditlog_p202610)."""
+        return f"{PARENT_TABLE}_p{month:%Y%m}"
+
+    @staticmethod
+    def _month_bound(month: date) -> datetime:
+        return datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
+
+    @staticmethod
+    def list_partitions() -> List[date]:
+        """
+        Meses con tabla de partición existente, adjunta o no (una partición
+        separada por un archivado interrumpido sigue apareciendo aquí).
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT tablename FROM pg_tables WHERE schemaname = current_schema() "
+                "AND tablename LIKE %s",
+                [f'{PARENT_TABLE}_p%'],
+            )
+            names = [row[0] for row in cursor.fetchall()]
+
+        months = []
+        for name in names:
+            match = PARTITION_RE.match(name)
+            if match:
+                months.append(date(int(match.group(1)), int(match.group(2)), 1))
+        return sorted(months)
+
+    @staticmethod
+    def ensure_partitions(months_ahead: int = 3) -> List[str]:
+        """
+        Crea las particiones del mes actual y de los `months_ahead` meses siguientes.
+
+        Returns:
+            list: Nombres de las particiones creadas
+        """
+        if not AuditPartitionService.is_supported():
+            return []
+
+        current = timezone.now().date().replace(day=1)
+        existing = set(AuditPartitionService.list_partitions())
+        quote = connection.ops.quote_name
+        created = []
+
+        with connection.cursor() as cursor:
+            for offset in range(months_ahead + 1):
+                month = AuditPartitionService.add_months(current, offset)
+                if month in existing:
+                    continue
+                name = AuditPartitionService.partition_name(month)
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {quote(name)} PARTITION OF {quote(PARENT_TABLE)} "
+                    f"FOR VALUES FROM (%s) TO (%s)",
+                    [
+                        AuditPartitionService._month_bound(month),
+                        AuditPartitionService._month_bound(AuditPartitionService.add_months(month, 1)),
+                    ],
+                )
+                created.append(name)
+
+        if created:
+            logger.info(f"Particiones de auditoría creadas: {', '.join(created)}")
+        return created
+
+    @staticmethod
+    def archive_expired(retention_months: Optional[int] = None,
+                        archive_dir: Optional[str] = None) -> List[str]:
+        """
+        Archiva las particiones anteriores al período de retención.
+
+        Cada partición se separa de la tabla (deja de recibir consultas), se exporta
+        a <archive_dir>/<partición>.jsonl.gz y recién entonces se elimina. Si la
+        exportación falla, la partición queda separada y se reintenta en la
+        siguiente ejecución.
+
+        Args:
+            retention_months: Meses completos a conservar además del actual
+                              (por defecto settings.AUDIT_LOG_RETENTION_MONTHS)
+            archive_dir: Directorio de archivos (por defecto settings.AUDIT_LOG_ARCHIVE_DIR)
+
+        Returns:
+            list: Rutas de los archivos generados
+        """
+        if not AuditPartitionService.is_supported():
+            return []
+
+        if retention_months is None:
+            retention_months = getattr(settings, 'AUDIT_LOG_RETENTION_MONTHS', 12)
+        archive_dir = Path(archive_dir or settings.AUDIT_LOG_ARCHIVE_DIR)
+        archive_dir.mkdir(parents=True, exist_ok=True)
+
+        current = timezone.now().date().replace(day=1)
+        cutoff = AuditPartitionService.add_months(current, -retention_months)
+        quote = connection.ops.quote_name
+        archived = []
+
+        for month in AuditPartitionService.list_partitions():
+            if month >= cutoff:
+                continue
+            name = AuditPartitionService.partition_name(month)
+
+            if AuditPartitionService._is_attached(name):
+                with connection.cursor() as cursor:
+                    cursor.execute(f"ALTER TABLE {quote(PARENT_TABLE)} DETACH PARTITION {quote(name)}")
+
+            path = archive_dir / f"{name}.jsonl.gz"
+            try:
+                rows = AuditPartitionService._export(name, path)
+            except Exception as exc:
+                logger.error(f"No se pudo exportar la partición {name}; queda separada: {exc}")
+                continue
+
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE {quote(name)}")
+            archived.append(str(path))
+            logger.info(f"Partición de auditoría {name} archivada en {path} ({rows} filas)")
+
+        return archived
+
+    @staticmethod
+    def _is_attached(name: str) -> bool:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_inherits WHERE inhrelid = %s::regclass AND inhparent = %s::regclass",
+                [name, PARENT_TABLE],
+            )
+            return cursor.fetchone() is not None
+
+    @staticmethod
+    def _export(name: str, path: Path) -> int:
+        """
+        Exporta la tabla a JSON Lines comprimido usando un cursor del lado del servidor.
+        Escribe primero en un archivo temporal para no dejar archivos incompletos.
+
+        Returns:
+            int: Filas exportadas
+        """
+        tmp_path = path.with_suffix('.tmp')
+        rows = 0
+        with transaction.atomic(), gzip.open(tmp_path, 'wt', encoding='utf-8') as fh:
+            cursor = connection.chunked_cursor()
+            try:
+                cursor.execute(
+                    f"SELECT row_to_json(t)::text FROM {connection.ops.quote_name(name)} t ORDER BY t.id"
+                )
+                while True:
+                    batch = cursor.fetchmany(AuditPartitionService.EXPORT_BATCH_SIZE)
+                    if not batch:
+                        break
+                    fh.writelines(line + '\n' for (line,) in batch)
+                    rows += len(batch)
+            finally:
+                cursor.close()
+        os.replace(tmp_path, path)
+        return rows
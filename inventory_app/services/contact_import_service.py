@@ -0,0 +1,236 @@
+# services/contact_import_service.py
+"""
+Servicio para la importación masiva de clientes y proveedores desde CSV.
+
+Crear miles de registros con POST /api/customers/ cuesta por fila la validación
+del serializer y tres consultas de unicidad (correo, documento y teléfono). La
+importación procesa el CSV en lotes: valida los campos y el documento de cada
+fila sin consultar la base, verifica la unicidad de todo el lote con una
+consulta IN por campo único y crea las filas válidas con bulk_create. Las filas
+con errores se reportan con su número de línea y no detienen la importación.
+La codificación se verifica antes del primer lote: un error de decodificación
+a mitad del archivo dejaría creados los lotes anteriores.
+"""
+
+import codecs
+import csv
+import io
+import logging
+from typing import Dict, Iterable, List
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from inventory_app.models import Customer, Supplier
+from inventory_app.validators.ecuadorian_validators import (
+    validate_ecuadorian_cedula,
+    validate_ecuadorian_ruc,
+    validate_passport
+)
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_VALIDATORS = {
+    'cedula': validate_ecuadorian_cedula,
+    'ruc': validate_ecuadorian_ruc,
+    'passport': validate_passport,
+}
+
+
+class ContactImportService:
+    """
+    Servicio para importar clientes o proveedores en lote.
+
+    Columnas del CSV (encabezado obligatorio, las demás se ignoran):
+        clientes:    name, email, document_type, document, phone, address
+        proveedores: name, email, document_type, tax_id, phone, address
+    """
+
+    # Tipo de importación -> (modelo, campo del documento)
+    KINDS = {
+        'customers': (Customer, 'document'),
+        'suppliers': (Supplier, 'tax_id'),
+    }
+
+    # Filas validadas y creadas por lote
+    BATCH_SIZE = 500
+
+    @staticmethod
+    def import_csv(kind: str, stream, batch_size: int = None, dry_run: bool = False) -> Dict:
+        """
+        Importa un CSV de clientes o proveedores.
+
+        Args:
+            kind: 'customers' o 'suppliers'
+            stream: Archivo abierto en modo binario o texto (p. ej. UploadedFile)
+            batch_size: Filas por lote (por defecto BATCH_SIZE)
+            dry_run: Solo validar, sin crear registros
+
+        Returns:
+            dict: {total, created, failed, errors: [{row, errors: {campo: [mensajes]}}]}
+
+        Raises:
+            ValueError: Si el tipo es desconocido, el archivo no tiene encabezado
+            o no está codificado en UTF-8 (sin crear ningún registro)
+        """
+        if kind not in ContactImportService.KINDS:
+            raise ValueError(f"Tipo de importación desconocido: {kind}")
+
+        reader = csv.DictReader(ContactImportService._text_stream(stream))
+        if not reader.fieldnames:
+            raise ValueError("El archivo CSV está vacío o no tiene encabezado.")
+
+        batch_size = batch_size or ContactImportService.BATCH_SIZE
+        result = {'total': 0, 'created': 0, 'failed': 0, 'errors': []}
+        batch = []
+        # La línea 1 es el encabezado
+        for line_number, row in enumerate(reader, start=2):
+            batch.append((line_number, row))
+            if len(batch) >= batch_size:
+                ContactImportService._process_batch(kind, batch, result, dry_run)
+                batch = []
+        if batch:
+            ContactImportService._process_batch(kind, batch, result, dry_run)
+
+        result['errors'].sort(key=lambda error: error['row'])
+        result['failed'] = len(result['errors'])
+        logger.info(
+            f"Importación de {kind}: {result['created']} creados, {result['failed']} con errores "
+            f"de {result['total']} filas{' (dry run)' if dry_run else ''}"
+        )
+        return result
+
+    @staticmethod
+    def _text_stream(stream):
+        if isinstance(stream, io.TextIOBase):
+            return stream
+        ContactImportService._check_encoding(stream)
+        # utf-8-sig descarta el BOM que agrega Excel
+        return io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    @staticmethod
+    def _check_encoding(stream, chunk_size: int = 64 * 1024) -> None:
+        """
+        Decodifica el archivo completo antes de importar y vuelve al inicio.
+
+        Raises:
+            ValueError: Con la línea del primer byte que no es UTF-8
+        """
+        decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        line_number = 1
+        try:
+            for chunk in iter(lambda: stream.read(chunk_size), b''):
+                decoder.decode(chunk)
+                line_number += chunk.count(b'\n')
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError as e:
+            # e.object: el bloque que falló, precedido de los bytes pendientes del anterior
+            # (una secuencia incompleta, sin saltos de línea)
+            line_number += e.object[:e.start].count(b'\n')
+            raise ValueError(f"El archivo debe estar codificado en UTF-8 (línea {line_number}).") from e
+        stream.seek(0)
+
+    @staticmethod
+    def _process_batch(kind: str, batch: List, result: Dict, dry_run: bool) -> None:
+        model, document_field = ContactImportService.KINDS[kind]
+        result['total'] += len(batch)
+
+        candidates = []
+        for line_number, row in batch:
+            instance, errors = ContactImportService._build_instance(model, document_field, row)
+            if errors:
+                result['errors'].append({'row': line_number, 'errors': errors})
+            else:
+                candidates.append((line_number, instance))
+
+        unique_fields = ('email', document_field, 'phone')
+        duplicates = ContactImportService._find_duplicates(model, unique_fields, candidates)
+        valid = []
+        for line_number, instance in candidates:
+            if line_number in duplicates:
+                result['errors'].append({'row': line_number, 'errors': duplicates[line_number]})
+            else:
+                valid.append((line_number, instance))
+
+        if dry_run or not valid:
+            result['created'] += len(valid)
+            return
+
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create([instance for _, instance in valid])
+            result['created'] += len(valid)
+        except IntegrityError:
+            # Otro proceso creó un duplicado entre la verificación y la inserción:
+            # se insertan una por una para reportar solo las filas en conflicto
+            ContactImportService._create_one_by_one(valid, result)
+
+    @staticmethod
+    def _build_instance(model, document_field: str, row: Dict):
+        """
+        Construye la instancia de la fila y valida sus campos sin consultar la base.
+
+        Returns:
+            tuple: (instancia, {campo: [mensajes]} o {} si es válida)
+        """
+        values = {
+            field: (row.get(field) or '').strip()
+            for field in ('name', 'email', 'document_type', document_field, 'phone', 'address')
+        }
+        if not values['document_type']:
+            values['document_type'] = model._meta.get_field('document_type').default
+        values['address'] = values['address'] or None
+
+        instance = model(**values)
+        errors = {}
+        try:
+            instance.full_clean(validate_unique=False, validate_constraints=False)
+        except ValidationError as e:
+            errors = e.message_dict
+
+        validator = DOCUMENT_VALIDATORS.get(values['document_type'])
+        if validator and document_field not in errors:
+            try:
+                validator(values[document_field])
+            except ValidationError as e:
+                errors[document_field] = list(e.messages)
+        return instance, errors
+
+    @staticmethod
+    def _find_duplicates(model, unique_fields: Iterable[str], candidates: List) -> Dict[int, Dict]:
+        """
+        Verifica la unicidad del lote: repetidos dentro del archivo y existentes
+        en la base (incluidos los eliminados lógicamente, que conservan el índice
+        único), con una consulta IN por campo.
+
+        Returns:
+            dict: {línea: {campo: [mensajes]}}
+        """
+        duplicates = {}
+        for field in unique_fields:
+            message = model._meta.get_field(field).error_messages['unique']
+            values = {getattr(instance, field) for _, instance in candidates}
+            existing = set(
+                model.all_objects.filter(**{f'{field}__in': values}).values_list(field, flat=True)
+            ) if values else set()
+
+            seen = set(existing)
+            for line_number, instance in candidates:
+                value = getattr(instance, field)
+                if value in seen:
+                    duplicates.setdefault(line_number, {})[field] = [message]
+                seen.add(value)
+        return duplicates
+
+    @staticmethod
+    def _create_one_by_one(valid: List, result: Dict) -> None:
+        for line_number, instance in valid:
+            try:
+                with transaction.atomic():
+                    instance.save()
+                result['created'] += 1
+            except IntegrityError:
+                result['errors'].append({
+                    'row': line_number,
+                    'errors': {'non_field_errors': ['El registro ya existe (correo, documento o teléfono duplicado).']},
+                })
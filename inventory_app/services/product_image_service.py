@@ -0,0 +1,182 @@
+# services/product_image_service.py
+"""
+Servicio para el procesamiento asíncrono de imágenes de productos.
+
+La request solo valida la cabecera de la imagen y la guarda en un directorio
+de staging local; el worker (tarea process_product_image) la decodifica,
+sube el original al storage configurado (Cloudinary o disco) y genera las
+variantes WebP de ImageConfig.VARIANT_SIZES para que los listados no
+descarguen la imagen completa. Mientras tanto el producto queda con
+image_status='processing' y conserva su imagen anterior.
+
+El staging debe ser visible desde el worker. Si web y worker no comparten
+disco, PRODUCT_IMAGE_ASYNC=False procesa la imagen en la request al confirmar
+la transacción, sin pasar por la cola.
+"""
+
+import io
+import logging
+import os
+import uuid
+from functools import partial
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.db import transaction
+
+from inventory_app.constants import ImageConfig, TaskPriority
+from inventory_app.models import Product
+
+logger = logging.getLogger(__name__)
+
+
+class ProductImageService:
+    """
+    Servicio para preparar y procesar imágenes de productos.
+    """
+
+    # Directorio de las variantes dentro del storage
+    VARIANTS_DIR = 'products/variants'
+
+    @staticmethod
+    def staging_dir() -> str:
+        """Directorio local donde esperan las imágenes hasta que el worker las procesa."""
+        return getattr(settings, 'PRODUCT_IMAGE_STAGING_DIR', '') or \
+            os.path.join(settings.MEDIA_ROOT, 'staging', 'products')
+
+    @staticmethod
+    def stage_upload(product: Product, upload) -> str:
+        """
+        Guarda la imagen subida en staging y agenda su procesamiento al confirmar
+        la transacción.
+
+        Args:
+            product: Producto ya guardado
+            upload: Archivo subido (UploadedFile)
+
+        Returns:
+            str: Ruta del archivo en staging
+        """
+        staging_dir = ProductImageService.staging_dir()
+        os.makedirs(staging_dir, exist_ok=True)
+        extension = os.path.splitext(upload.name)[1].lower()
+        path = os.path.join(staging_dir, f"{product.pk}_{uuid.uuid4().hex}{extension}")
+        with open(path, 'wb') as staged:
+            for chunk in upload.chunks():
+                staged.write(chunk)
+
+        Product.all_objects.filter(pk=product.pk).update(image_status=Product.IMAGE_PROCESSING)
+        product.image_status = Product.IMAGE_PROCESSING
+        transaction.on_commit(
+            partial(ProductImageService._enqueue, product.pk, path, os.path.basename(upload.name))
+        )
+        return path
+
+    @staticmethod
+    def _enqueue(product_id: int, path: str, original_name: str) -> None:
+        from inventory_app.tasks import process_product_image
+
+        if not getattr(settings, 'PRODUCT_IMAGE_ASYNC', True):
+            ProductImageService.process(product_id, path, original_name)
+            return
+
+        try:
+            process_product_image.apply_async(
+                args=[product_id, path, original_name], priority=TaskPriority.INTERACTIVE
+            )
+        except Exception as e:
+            # Sin broker la imagen no debe perderse: se procesa en la request
+            logger.error(f"No se pudo encolar la imagen del producto {product_id}, se procesa en línea: {e}")
+            ProductImageService.process(product_id, path, original_name)
+
+    @staticmethod
+    def process(product_id: int, path: str, original_name: str):
+        """
+        Decodifica la imagen en staging, sube el original y sus variantes WebP al
+        storage y las registra en el producto. El archivo de staging se elimina
+        al terminar, salvo ante un error del storage (la tarea reintenta).
+
+        Args:
+            product_id: ID del producto
+            path: Ruta del archivo en staging
+            original_name: Nombre original del archivo subido
+
+        Returns:
+            dict: Variantes generadas {nombre: ruta en el storage}, o None si la
+            imagen no se pudo decodificar o el producto ya no existe
+        
+        Raises:
+            FileNotFoundError: Si el archivo no está en staging (el worker no
+            comparte PRODUCT_IMAGE_STAGING_DIR con el proceso web)
+        """
+        from PIL import Image, ImageOps
+
+        product = Product.all_objects.filter(pk=product_id).first()
+        if product is None:
+            ProductImageService.discard(path)
+            return None
+
+        try:
+            with Image.open(path) as img:
+                img.load()  # Decodificación completa: detecta archivos truncados o corruptos
+                img = ImageOps.exif_transpose(img)
+                img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+                encoded = ProductImageService._encode_variants(img)
+        except FileNotFoundError:
+            # No es una imagen inválida: el staging no es visible desde este proceso
+            logger.error(
+                f"La imagen del producto {product_id} no está en staging ({path}): "
+                f"PRODUCT_IMAGE_STAGING_DIR debe ser compartido con el worker o PRODUCT_IMAGE_ASYNC=False"
+            )
+            raise
+        except (OSError, Image.DecompressionBombError) as e:
+            logger.warning(f"Imagen inválida para el producto {product_id}: {e}")
+            ProductImageService.mark_failed(product_id, path)
+            return None
+
+        storage = product.image.storage
+        token = uuid.uuid4().hex[:8]
+        variants = {
+            label: storage.save(f"{ProductImageService.VARIANTS_DIR}/{product_id}_{token}_{label}.webp",
+                                ContentFile(content))
+            for label, content in encoded.items()
+        }
+        with open(path, 'rb') as staged:
+            product.image.save(original_name, File(staged), save=False)
+
+        Product.all_objects.filter(pk=product_id).update(
+            image=product.image.name,
+            image_variants=variants,
+            image_status=Product.IMAGE_READY,
+        )
+        ProductImageService.discard(path)
+        logger.info(f"Imagen del producto {product_id} procesada ({', '.join(variants)})")
+        return variants
+
+    @staticmethod
+    def _encode_variants(img) -> dict:
+        """Redimensiona la imagen a cada tamaño de ImageConfig.VARIANT_SIZES y la codifica en WebP."""
+        from PIL import Image
+
+        encoded = {}
+        for label, size in ImageConfig.VARIANT_SIZES.items():
+            variant = img.copy()
+            variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            variant.save(buffer, format='WEBP', quality=ImageConfig.WEBP_QUALITY, method=4)
+            encoded[label] = buffer.getvalue()
+        return encoded
+
+    @staticmethod
+    def mark_failed(product_id: int, path: str) -> None:
+        """Marca el procesamiento como fallido y elimina el archivo de staging."""
+        Product.all_objects.filter(pk=product_id).update(image_status=Product.IMAGE_FAILED)
+        ProductImageService.discard(path)
+
+    @staticmethod
+    def discard(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
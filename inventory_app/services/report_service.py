@@ -0,0 +1,72 @@
+# services/report_service.py
+"""
+Servicio para la gestión del ciclo de vida de los reportes PDF generados.
+"""
+
+import logging
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from inventory_app.models.report import Report
+
+logger = logging.getLogger(__name__)
+
+
+class ReportService:
+    """
+    Servicio para operaciones sobre reportes generados.
+
+    Responsabilidades:
+    - Eliminar reportes (filas y archivos) que superan el período de retención
+    """
+
+    # Cantidad de reportes procesados por lote al depurar
+    PRUNE_BATCH_SIZE = 500
+
+    @staticmethod
+    def prune_expired(retention_days: int = None) -> int:
+        """
+        Elimina los reportes generados hace más de `retention_days` días.
+
+        Borra primero los archivos del disco y luego las filas, por lotes,
+        para no cargar toda la tabla en memoria.
+
+        Args:
+            retention_days: Días de retención (por defecto settings.REPORT_RETENTION_DAYS)
+
+        Returns:
+            int: Número de reportes eliminados
+        """
+        if retention_days is None:
+            retention_days = getattr(settings, 'REPORT_RETENTION_DAYS', 30)
+
+        cutoff = timezone.now() - timedelta(days=retention_days)
+        media_root = Path(settings.MEDIA_ROOT)
+        deleted = 0
+
+        while True:
+            batch = list(
+                Report.objects.filter(generated_at__lt=cutoff)
+                .order_by('id')
+                .values_list('id', 'file')[:ReportService.PRUNE_BATCH_SIZE]
+            )
+            if not batch:
+                break
+
+            for _, name in batch:
+                if not name:
+                    continue
+                try:
+                    (media_root / name).unlink(missing_ok=True)
+                except OSError as exc:
+                    logger.warning(f"No se pudo eliminar el archivo de reporte {name}: {exc}")
+
+            Report.objects.filter(id__in=[report_id for report_id, _ in batch]).delete()
+            deleted += len(batch)
+
+        if deleted:
+            logger.info(f"Reportes depurados: {deleted} (anteriores a {cutoff:%Y-%m-%d})")
+        return deleted
@@ -0,0 +1,167 @@
+# services/stock_reconciliation_service.py
+"""
+Servicio para conciliar Product.current_stock contra el historial de movimientos.
+
+Algunas rutas de escritura actualizan el stock con lectura-modificación-escritura
+sin bloqueo (MovementService, PurchaseService, SaleService), por lo que dos
+operaciones concurrentes pueden perder una actualización. La conciliación
+recalcula el stock esperado a partir de los movimientos y reporta (u opcionalmente
+corrige) las diferencias.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, IntegerField, OuterRef, Subquery, Value, When
+from django.utils import timezone
+
+from inventory_app.models import Movement, Product, StockReconciliation
+from inventory_app.services.alert_service import AlertService
+from inventory_app.services.stock_snapshot_service import StockSnapshotService
+
+logger = logging.getLogger(__name__)
+
+
+class StockReconciliationService:
+    """
+    Servicio para detectar y corregir diferencias de stock.
+
+    El stock esperado de un producto es el stock previo a su primer movimiento
+    (stock_in_movement) más la suma neta de todos sus movimientos. Los productos
+    sin movimientos no tienen historial contra el cual comparar y se omiten.
+    """
+
+    # Máximo de productos guardados en el detalle de cada ejecución
+    MAX_DETAILS = 500
+
+    @staticmethod
+    def compute_expected_stock(product_ids: Optional[Iterable[int]] = None) -> Dict[int, int]:
+        """
+        Calcula el stock esperado de cada producto según sus movimientos.
+
+        La suma neta se obtiene con un único GROUP BY sobre la tabla de movimientos;
+        el stock inicial, con una búsqueda indexada del primer movimiento por producto.
+
+        Args:
+            product_ids: Restringir a estos productos (opcional)
+
+        Returns:
+            dict: {product_id: stock esperado}
+        """
+        delta = StockSnapshotService._movement_delta(None, None, product_ids)
+        if not delta:
+            return {}
+
+        first_movement = Movement.objects.filter(
+            product_id=OuterRef('pk'), deleted_at__isnull=True
+        ).order_by('date', 'id').values('stock_in_movement')[:1]
+        opening = Product.objects.filter(id__in=list(delta)).annotate(
+            opening=Subquery(first_movement, output_field=IntegerField())
+        ).values_list('id', 'opening')
+
+        return {product_id: (stock or 0) + delta[product_id] for product_id, stock in opening}
+
+    @staticmethod
+    def find_drift(product_ids: Optional[Iterable[int]] = None,
+                   expected: Optional[Dict[int, int]] = None) -> List[Dict]:
+        """
+        Compara current_stock con el stock esperado.
+
+        Args:
+            product_ids: Restringir a estos productos (opcional)
+            expected: Stock esperado ya calculado (opcional, evita recalcularlo)
+
+        Returns:
+            list: [{product_id, current_stock, expected_stock, drift}] ordenada por |drift| descendente
+        """
+        if expected is None:
+            expected = StockReconciliationService.compute_expected_stock(product_ids)
+        current = Product.objects.filter(
+            id__in=list(expected), deleted_at__isnull=True
+        ).values_list('id', 'current_stock')
+
+        drift = [
+            {
+                'product_id': product_id,
+                'current_stock': stock,
+                'expected_stock': expected[product_id],
+                'drift': stock - expected[product_id],
+            }
+            for product_id, stock in current
+            if stock != expected[product_id]
+        ]
+        drift.sort(key=lambda row: abs(row['drift']), reverse=True)
+        return drift
+
+    @staticmethod
+    def _repair(product_ids: List[int]) -> List[Dict]:
+        """
+        Corrige current_stock de los productos indicados en un único UPDATE.
+
+        Bloquea las filas y vuelve a calcular la diferencia dentro de la transacción,
+        para no pisar un movimiento registrado después del primer cálculo.
+        Los productos cuyo stock esperado es negativo no se corrigen.
+
+        Returns:
+            list: Filas efectivamente corregidas
+        """
+        with transaction.atomic():
+            list(Product.objects.select_for_update().filter(id__in=product_ids).values_list('id'))
+            rows = [
+                row for row in StockReconciliationService.find_drift(product_ids)
+                if row['expected_stock'] >= 0
+            ]
+            if rows:
+                Product.objects.filter(id__in=[row['product_id'] for row in rows]).update(
+                    current_stock=Case(
+                        *[When(id=row['product_id'], then=Value(row['expected_stock'])) for row in rows],
+                        output_field=IntegerField(),
+                    ),
+                    updated_at=timezone.now(),
+                )
+                for product in Product.objects.filter(id__in=[row['product_id'] for row in rows]):
+                    AlertService.update_stock_alerts(product)
+        return rows
+
+    @staticmethod
+    def reconcile(repair: Optional[bool] = None) -> StockReconciliation:
+        """
+        Ejecuta la conciliación completa y registra el resultado.
+
+        Args:
+            repair: Corregir las diferencias encontradas
+                    (por defecto settings.STOCK_RECONCILIATION_AUTO_REPAIR)
+
+        Returns:
+            StockReconciliation: Registro de la ejecución
+        """
+        if repair is None:
+            repair = getattr(settings, 'STOCK_RECONCILIATION_AUTO_REPAIR', False)
+
+        run = StockReconciliation.objects.create(started_at=timezone.now(), repair=repair)
+
+        expected = StockReconciliationService.compute_expected_stock()
+        drift = StockReconciliationService.find_drift(expected=expected)
+
+        repaired = []
+        if repair and drift:
+            repaired = StockReconciliationService._repair([row['product_id'] for row in drift])
+
+        run.products_checked = len(expected)
+        run.drift_count = len(drift)
+        run.total_abs_drift = sum(abs(row['drift']) for row in drift)
+        run.repaired_count = len(repaired)
+        run.details = drift[:StockReconciliationService.MAX_DETAILS]
+        run.finished_at = timezone.now()
+        run.save()
+
+        if drift:
+            logger.warning(
+                f"Conciliación de stock: {len(drift)} productos con diferencias "
+                f"(total {run.total_abs_drift} unidades), corregidos: {len(repaired)}"
+            )
+        else:
+            logger.info(f"Conciliación de stock: {len(expected)} productos sin diferencias")
+        return run
@@ -0,0 +1,185 @@
+# services/stock_snapshot_service.py
+"""
+Servicio para fotografías diarias de stock y consultas históricas de inventario.
+
+El stock histórico se obtiene combinando la fotografía más cercana con el
+delta de movimientos posterior, en lugar de recorrer todo el historial.
+"""
+
+import logging
+from datetime import date as date_type, datetime, time, timedelta
+from typing import Dict, Iterable, Optional
+
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Max, Min, Sum, Value, When
+from django.utils import timezone
+
+from inventory_app.constants import MovementType
+from inventory_app.models import Movement, Product, StockSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class StockSnapshotService:
+    """
+    Servicio para generar fotografías de stock y consultar el stock a una fecha.
+
+    Responsabilidades:
+    - Generar la fotografía diaria de todos los productos en una sola sentencia SQL
+    - Calcular el stock de cada producto al cierre de un día cualquiera
+    """
+
+    @staticmethod
+    def end_of_day(day: date_type) -> datetime:
+        """
+        Retorna el instante (aware) en que termina el día indicado en la zona horaria local.
+
+        Args:
+            day: Día a evaluar
+
+        Returns:
+            datetime: Medianoche local del día siguiente
+        """
+        return timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+
+    @staticmethod
+    def _signed_quantity():
+        """Expresión SQL: +quantity para entradas, -quantity para salidas."""
+        return Case(
+            When(movement_type=MovementType.INPUT, then=F('quantity')),
+            When(movement_type=MovementType.OUTPUT, then=-F('quantity')),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+
+    @staticmethod
+    def _movement_delta(start: Optional[datetime], end: Optional[datetime],
+                        product_ids: Optional[Iterable[int]] = None) -> Dict[int, int]:
+        """
+        Suma neta de movimientos por producto en el intervalo [start, end).
+
+        Args:
+            start: Inicio del intervalo (inclusive). None = sin límite inferior
+            end: Fin del intervalo (exclusivo). None = sin límite superior
+            product_ids: Restringir a estos productos (opcional)
+
+        Returns:
+            dict: {product_id: delta}
+        """
+        movements = Movement.objects.filter(deleted_at__isnull=True)
+        if start is not None:
+            movements = movements.filter(date__gte=start)
+        if end is not None:
+            movements = movements.filter(date__lt=end)
+        if product_ids is not None:
+            movements = movements.filter(product_id__in=list(product_ids))
+
+        rows = movements.values('product_id').annotate(
+            delta=Sum(StockSnapshotService._signed_quantity())
+        )
+        return {row['product_id']: row['delta'] or 0 for row in rows}
+
+    @staticmethod
+    def take_snapshot(day: Optional[date_type] = None) -> int:
+        """
+        Genera la fotografía de stock al cierre del día indicado para todos los productos.
+
+        Se ejecuta como un único INSERT ... SELECT: el stock al cierre se obtiene
+        restando al stock actual los movimientos registrados después del cierre,
+        de modo que la fotografía es correcta aunque la tarea se ejecute tarde.
+        Es idempotente: regenera las filas existentes para ese día.
+
+        Args:
+            day: Día a fotografiar (por defecto, el día anterior en hora local)
+
+        Returns:
+            int: Número de productos fotografiados
+        """
+        if day is None:
+            day = timezone.localdate() - timedelta(days=1)
+
+        cutoff = StockSnapshotService.end_of_day(day)
+        now = timezone.now()
+
+        snapshot_table = connection.ops.quote_name(StockSnapshot._meta.db_table)
+        product_table = connection.ops.quote_name(Product._meta.db_table)
+        movement_table = connection.ops.quote_name(Movement._meta.db_table)
+
+        sql = f"""
+            INSERT INTO {snapshot_table} (product_id, date, quantity, created_at)
+            SELECT p.id, %s, p.current_stock - COALESCE((
+                SELECT SUM(CASE WHEN m.movement_type = %s THEN m.quantity ELSE -m.quantity END)
+                FROM {movement_table} m
+                WHERE m.product_id = p.id AND m.deleted_at IS NULL AND m.date >= %s
+            ), 0), %s
+            FROM {product_table} p
+            WHERE p.deleted_at IS NULL
+        """
+
+        with transaction.atomic():
+            StockSnapshot.objects.filter(date=day).delete()
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [day, MovementType.INPUT, cutoff, now])
+                created = cursor.rowcount
+
+        logger.info(f"Fotografía de stock generada para {day}: {created} productos")
+        return created
+
+    @staticmethod
+    def get_stock_as_of(day: date_type, product_ids: Optional[Iterable[int]] = None) -> Dict:
+        """
+        Calcula el stock de cada producto al cierre del día indicado.
+
+        Usa la fotografía más cercana anterior (o, en su defecto, posterior) y aplica
+        el delta de movimientos entre esa fotografía y el día consultado. Los productos
+        sin fotografía se calculan hacia atrás desde su stock actual.
+
+        Args:
+            day: Día a consultar
+            product_ids: Restringir a estos productos (opcional)
+
+        Returns:
+            dict: {
+                'snapshot_date': fecha de la fotografía usada o None,
+                'stock': {product_id: cantidad}
+            }
+        """
+        target_end = StockSnapshotService.end_of_day(day)
+
+        # Solo productos que ya existían al cierre del día consultado
+        products = Product.objects.filter(deleted_at__isnull=True, created_at__lt=target_end)
+        if product_ids is not None:
+            products = products.filter(id__in=list(product_ids))
+        product_ids = list(products.values_list('id', flat=True))
+
+        snapshots = StockSnapshot.objects.filter(product_id__in=product_ids)
+
+        snapshot_date = snapshots.filter(date__lte=day).aggregate(d=Max('date'))['d']
+        forward = snapshot_date is not None
+        if not forward:
+            snapshot_date = snapshots.filter(date__gt=day).aggregate(d=Min('date'))['d']
+
+        stock = {}
+        if snapshot_date is not None:
+            stock = dict(
+                snapshots.filter(date=snapshot_date).values_list('product_id', 'quantity')
+            )
+            snapshot_end = StockSnapshotService.end_of_day(snapshot_date)
+            if forward:
+                delta = StockSnapshotService._movement_delta(snapshot_end, target_end, stock.keys())
+                sign = 1
+            else:
+                delta = StockSnapshotService._movement_delta(target_end, snapshot_end, stock.keys())
+                sign = -1
+            for product_id, value in delta.items():
+                stock[product_id] += sign * value
+
+        # Productos sin fotografía (p. ej. creados después): calcular desde el stock actual
+        missing = [pid for pid in product_ids if pid not in stock]
+        if missing:
+            current = dict(Product.objects.filter(id__in=missing).values_list('id', 'current_stock'))
+            delta = StockSnapshotService._movement_delta(target_end, None, missing)
+            for product_id in missing:
+                stock[product_id] = current[product_id] - delta.get(product_id, 0)
+
+        return {'snapshot_date': snapshot_date, 'stock': stock}
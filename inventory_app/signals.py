@@ -1,5 +1,90 @@
 # inventory_app/signals.py
 import logging
+import time
+
+from celery import states
+from celery.signals import before_task_publish, task_postrun, task_prerun
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 logger = logging.getLogger(__name__)
 
+# Header agregado a cada mensaje de Celery para medir el tiempo de espera en cola
+PUBLISHED_AT_HEADER = 'published_at'
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    """Métricas e inspector de consultas por contexto (utils/db_instrumentation.py)."""
+    from inventory_app.utils import db_instrumentation
+
+    db_instrumentation.install(connection)
+
+
+@before_task_publish.connect
+def stamp_publish_time(headers=None, **kwargs):
+    """Marca el instante de publicación de cada tarea."""
+    if headers is not None:
+        headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+
+
+@task_prerun.connect
+def log_queue_wait(task=None, **kwargs):
+    """
+    Registra cuánto esperó la tarea en su cola antes de ejecutarse.
+    Permite detectar colas saturadas (p. ej. pdf_interactive esperando detrás de reportes).
+    """
+    if task is None:
+        return
+    request = task.request
+    published_at = getattr(request, PUBLISHED_AT_HEADER, None)
+    if published_at is None:
+        published_at = (getattr(request, 'headers', None) or {}).get(PUBLISHED_AT_HEADER)
+    if published_at is None:
+        return
+
+    delivery_info = getattr(request, 'delivery_info', None) or {}
+    queue = delivery_info.get('routing_key') or 'unknown'
+    wait_ms = max((time.time() - float(published_at)) * 1000, 0)
+
+    logger.info(
+        f"[QUEUE_WAIT] queue={queue} task={task.name} wait_ms={wait_ms:.0f}",
+        extra={'queue': queue, 'task_name': task.name, 'queue_wait_ms': wait_ms},
+    )
+
+
+@task_postrun.connect
+def release_single_flight(task=None, task_id=None, retval=None, state=None, **kwargs):
+    """
+    Libera el lock single-flight de la tarea al terminar y guarda su resultado
+    para reutilizarlo. En reintentos (RETRY) el lock se conserva.
+    """
+    if task is None:
+        return
+    from inventory_app.utils import single_flight
+
+    key = getattr(task.request, single_flight.HEADER_NAME, None)
+    if key is None:
+        key = (getattr(task.request, 'headers', None) or {}).get(single_flight.HEADER_NAME)
+    if not key or state == states.RETRY:
+        return
+
+    result = retval if state == states.SUCCESS else None
+    single_flight.release(key, task_id, result=result)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance=None, update_fields=None, **kwargs):
+    """
+    Invalida la proyección cacheada del usuario (CachedJWTAuthentication) al
+    guardarlo o eliminarlo: cambios de rol, contraseña, estado o datos.
+    El update de last_login en cada login no cambia la proyección.
+    """
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    from inventory_app.authentication import invalidate_user
+
+    invalidate_user(instance.pk)
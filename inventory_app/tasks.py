@@ -1,122 +1,165 @@
 # tasks.py
 """
 Tareas asíncronas de Celery para operaciones pesadas.
-Principalmente generación de PDFs de cotizaciones y reportes.
+Principalmente generación de PDFs de cotizaciones y reportes, y envío de correos.
 """
 import os
+import smtplib
 from decimal import Decimal
 from datetime import datetime
+from uuid import uuid4
 from celery import shared_task
 from django.conf import settings
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import EmailMessage, get_connection
+from django.db import DatabaseError
 from inventory_app.models.quotation import Quotation
 from inventory_app.models.movement import Movement
 from inventory_app.models.report import Report
+from inventory_app.models.user import User
+from inventory_app.constants import TaskPriority
+from inventory_app.db_routers import read_from_replica
+from inventory_app.utils.task_events import (
+    publish_task_event, increment_progress,
+    STATE_STARTED, STATE_PROGRESS, STATE_SUCCESS, STATE_FAILURE,
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task(bind=True, max_retries=3)
-def generate_quotation_pdf(self, quotation_id, user_id):
-    """
-    Genera un PDF de cotización de forma asíncrona.
+# Subdirectorio de MEDIA_ROOT/reports donde cada lote renderiza sus PDFs
+BATCH_DIR = "batches"
 
-    Args:
-        quotation_id: ID de la cotización
-        user_id: ID del usuario que solicita el PDF
 
-    Returns:
-        str: Ruta relativa del archivo PDF generado
+def _render_quotation_pdf(quotation_id, subdir=""):
     """
-    try:
-        quotation = Quotation.objects.select_related(
-            'customer',
-            'user'
-        ).prefetch_related(
-            'quoted_products__product'
-        ).get(id=quotation_id, deleted_at__isnull=True)
-
-        # Generar nombre personalizado con fecha, hora e ID
-        # Convertir de UTC a zona horaria local (Ecuador)
-        from zoneinfo import ZoneInfo
-        ecuador_tz = ZoneInfo('America/Guayaquil')
-        local_date = quotation.date.astimezone(ecuador_tz)
-        datetime_str = local_date.strftime("%Y-%m-%d_%H-%M-%S")
-        customer_name = quotation.customer.name.replace(" ", "_").replace("/", "-")
-        filename = f"quotation_{quotation.id}_{customer_name}_{datetime_str}.pdf"
+    Renderiza el PDF de una cotización en MEDIA_ROOT/reports (o en el
+    subdirectorio `subdir`, usado por la exportación por lotes).
 
-        out_dir = os.path.join(settings.MEDIA_ROOT, "reports")
-        os.makedirs(out_dir, exist_ok=True)
-        filepath = os.path.join(out_dir, filename)
+    reportlab se importa acá y no a nivel de módulo: las vistas importan este
+    módulo para encolar tareas y los workers web no deben cargarlo.
 
-        # Generar PDF
-        doc = SimpleDocTemplate(filepath, pagesize=letter)
-        styles = getSampleStyleSheet()
-        styles.add(ParagraphStyle(name='HeaderTitle', fontSize=22, alignment=1, spaceAfter=14))
-        styles.add(ParagraphStyle(name='Totales', fontSize=11, textColor=colors.HexColor("#256029")))
-        styles.add(ParagraphStyle(name='TotalBold', fontSize=12, textColor=colors.HexColor("#1f2937"), spaceBefore=5))
-        styles.add(ParagraphStyle(name='ObsStyle', fontSize=10, textColor=colors.HexColor("#14532d")))
+    Args:
+        quotation_id: ID de la cotización
+        subdir: Subdirectorio dentro de MEDIA_ROOT/reports
 
-        elements = []
+    Returns:
+        str: Nombre del archivo PDF generado (sin directorio)
 
-        # Logo
-        logo_path = os.path.join(settings.BASE_DIR, "static", "images", "logo.png")
-        if os.path.exists(logo_path):
-            img = Image(logo_path, width=90, height=40)
-            img.hAlign = 'RIGHT'
-            elements.append(img)
+    Raises:
+        Quotation.DoesNotExist: Si la cotización no existe o fue eliminada
+    """
+    quotation = Quotation.objects.select_related(
+        'customer',
+        'user'
+    ).prefetch_related(
+        'quoted_products__product'
+    ).get(id=quotation_id, deleted_at__isnull=True)
+
+    # Generar nombre personalizado con fecha, hora e ID
+    # Convertir de UTC a zona horaria local (Ecuador)
+    from zoneinfo import ZoneInfo
+    ecuador_tz = ZoneInfo('America/Guayaquil')
+    local_date = quotation.date.astimezone(ecuador_tz)
+    datetime_str = local_date.strftime("%Y-%m-%d_%H-%M-%S")
+    customer_name = quotation.customer.name.replace(" ", "_").replace("/", "-")
+    filename = f"quotation_{quotation.id}_{customer_name}_{datetime_str}.pdf"
+
+    out_dir = os.path.join(settings.MEDIA_ROOT, "reports", subdir)
+    os.makedirs(out_dir, exist_ok=True)
+    filepath = os.path.join(out_dir, filename)
+
+    # Generar PDF
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+
+    doc = SimpleDocTemplate(filepath, pagesize=letter)
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(name='HeaderTitle', fontSize=22, alignment=1, spaceAfter=14))
+    styles.add(ParagraphStyle(name='Totales', fontSize=11, textColor=colors.HexColor("#256029")))
+    styles.add(ParagraphStyle(name='TotalBold', fontSize=12, textColor=colors.HexColor("#1f2937"), spaceBefore=5))
+    styles.add(ParagraphStyle(name='ObsStyle', fontSize=10, textColor=colors.HexColor("#14532d")))
+
+    elements = []
+
+    # Logo
+    logo_path = os.path.join(settings.BASE_DIR, "static", "images", "logo.png")
+    if os.path.exists(logo_path):
+        img = Image(logo_path, width=90, height=40)
+        img.hAlign = 'RIGHT'
+        elements.append(img)
+
+    # Encabezado
+    elements.append(Paragraph("COTIZACIÓN", styles['HeaderTitle']))
+    elements.append(Spacer(1, 8))
+    elements.append(Paragraph(f"<b>Fecha:</b> {local_date.strftime('%d/%m/%Y')}", styles["Normal"]))
+    elements.append(Paragraph(f"<b>Cliente:</b> {quotation.customer.name}", styles["Normal"]))
+    elements.append(Paragraph(f"<b>Vendedor:</b> {quotation.user.name}", styles["Normal"]))
+    elements.append(Spacer(1, 18))
+
+    # Tabla de productos
+    data = [["Producto", "Cantidad", "Precio Unitario", "Subtotal"]]
+    for p in quotation.quoted_products.all():
+        data.append([
+            p.product.name,
+            p.quantity,
+            f"${p.unit_price:.2f}",
+            f"${p.subtotal:.2f}"
+        ])
+
+    table = Table(data, colWidths=[200, 80, 80, 80])
+    table.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#10b981")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 10),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.whitesmoke, colors.lightgrey])
+    ]))
+    elements.append(table)
+    elements.append(Spacer(1, 18))
+
+    # Totales
+    elements.append(Paragraph(f"<b>Subtotal:</b> ${quotation.subtotal:.2f}", styles["Totales"]))
+    elements.append(Paragraph(f"<b>IVA (15%):</b> ${quotation.tax:.2f}", styles["Totales"]))
+    elements.append(Paragraph(f"<b>Total:</b> <b>${quotation.total:.2f}</b>", styles["TotalBold"]))
+
+    # Observaciones
+    if getattr(quotation, "notes", None):
+        elements.append(Spacer(1, 12))
+        elements.append(Paragraph("<b>OBSERVACIONES:</b>", styles["Normal"]))
+        elements.append(Spacer(1, 4))
+        elements.append(Paragraph(quotation.notes, styles["ObsStyle"]))
 
-        # Encabezado
-        elements.append(Paragraph("COTIZACIÓN", styles['HeaderTitle']))
-        elements.append(Spacer(1, 8))
-        elements.append(Paragraph(f"<b>Fecha:</b> {local_date.strftime('%d/%m/%Y')}", styles["Normal"]))
-        elements.append(Paragraph(f"<b>Cliente:</b> {quotation.customer.name}", styles["Normal"]))
-        elements.append(Paragraph(f"<b>Vendedor:</b> {quotation.user.name}", styles["Normal"]))
-        elements.append(Spacer(1, 18))
+    elements.append(Spacer(1, 12))
+    elements.append(Paragraph("<i>⚠ Cotización válida por 30 días</i>", styles["Normal"]))
 
-        # Tabla de productos
-        data = [["Producto", "Cantidad", "Precio Unitario", "Subtotal"]]
-        for p in quotation.quoted_products.all():
-            data.append([
-                p.product.name,
-                p.quantity,
-                f"${p.unit_price:.2f}",
-                f"${p.subtotal:.2f}"
-            ])
+    doc.build(elements)
 
-        table = Table(data, colWidths=[200, 80, 80, 80])
-        table.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#10b981")),
-            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-            ("FONTSIZE", (0, 0), (-1, -1), 10),
-            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.whitesmoke, colors.lightgrey])
-        ]))
-        elements.append(table)
-        elements.append(Spacer(1, 18))
+    return filename
 
-        # Totales
-        elements.append(Paragraph(f"<b>Subtotal:</b> ${quotation.subtotal:.2f}", styles["Totales"]))
-        elements.append(Paragraph(f"<b>IVA (15%):</b> ${quotation.tax:.2f}", styles["Totales"]))
-        elements.append(Paragraph(f"<b>Total:</b> <b>${quotation.total:.2f}</b>", styles["TotalBold"]))
 
-        # Observaciones
-        if getattr(quotation, "notes", None):
-            elements.append(Spacer(1, 12))
-            elements.append(Paragraph("<b>OBSERVACIONES:</b>", styles["Normal"]))
-            elements.append(Spacer(1, 4))
-            elements.append(Paragraph(quotation.notes, styles["ObsStyle"]))
+@shared_task(bind=True, max_retries=3, soft_time_limit=60, time_limit=90)
+def generate_quotation_pdf(self, quotation_id, user_id):
+    """
+    Genera un PDF de cotización de forma asíncrona.
 
-        elements.append(Spacer(1, 12))
-        elements.append(Paragraph("<i>⚠ Cotización válida por 30 días</i>", styles["Normal"]))
+    Args:
+        quotation_id: ID de la cotización
+        user_id: ID del usuario que solicita el PDF
 
-        doc.build(elements)
+    Returns:
+        str: Ruta relativa del archivo PDF generado
+    """
+    task_id = self.request.id
+    try:
+        publish_task_event(task_id, STATE_STARTED, progress=0)
+        filename = _render_quotation_pdf(quotation_id)
+        publish_task_event(task_id, STATE_PROGRESS, progress=90)
 
         # Registrar en BD
         from inventory_app.models.user import User
@@ -124,20 +167,157 @@ def generate_quotation_pdf(self, quotation_id, user_id):
         Report.objects.create(file=f"reports/{filename}", user=user)
 
         logger.info(f"PDF de cotización generado exitosamente: {filename}")
+        publish_task_event(task_id, STATE_SUCCESS, progress=100, result=f"reports/{filename}")
         return f"reports/{filename}"
 
     except Quotation.DoesNotExist:
         logger.error(f"Cotización {quotation_id} no encontrada")
+        publish_task_event(task_id, STATE_FAILURE, error="Cotización no encontrada")
         raise
     except Exception as exc:
         logger.error(f"Error generando PDF de cotización {quotation_id}: {str(exc)}")
+        if self.request.retries >= self.max_retries:
+            publish_task_event(task_id, STATE_FAILURE, error=str(exc))
         raise self.retry(exc=exc, countdown=60)
 
 
-@shared_task(bind=True, max_retries=3)
+@shared_task(bind=True, max_retries=3, soft_time_limit=60, time_limit=90)
+def render_quotation_pdf(self, quotation_id, batch_id=None, batch_size=None):
+    """
+    Renderiza el PDF de una cotización como parte de una exportación por lotes.
+    No registra un Report: el registro se hace sobre el ZIP final.
+
+    Cada lote renderiza en su propio directorio (reports/batches/<batch_id>):
+    el nombre del PDF es el mismo que registra generate_quotation_pdf, y el
+    callback borra estos archivos después de comprimirlos.
+
+    Args:
+        quotation_id: ID de la cotización
+        batch_id: task_id del callback del lote (para publicar el progreso)
+        batch_size: Número total de cotizaciones del lote
+
+    Returns:
+        str | None: Ruta del archivo generado relativa a MEDIA_ROOT/reports,
+        o None si la cotización no existe
+    """
+    subdir = os.path.join(BATCH_DIR, batch_id or self.request.id or uuid4().hex)
+    try:
+        filename = _render_quotation_pdf(quotation_id, subdir=subdir)
+        increment_progress(batch_id, batch_size)
+        return os.path.join(subdir, filename)
+    except Quotation.DoesNotExist:
+        logger.warning(f"Cotización {quotation_id} no encontrada, se omite del lote")
+        increment_progress(batch_id, batch_size)
+        return None
+    except Exception as exc:
+        logger.error(f"Error generando PDF de cotización {quotation_id} (lote): {str(exc)}")
+        raise self.retry(exc=exc, countdown=10)
+
+
+@shared_task(bind=True, soft_time_limit=120, time_limit=180)
+def bundle_quotation_pdfs(self, filenames, user_id):
+    """
+    Callback del chord de exportación por lotes: comprime los PDFs en un único ZIP.
+
+    Args:
+        filenames: Lista de rutas devueltas por render_quotation_pdf
+        user_id: ID del usuario que solicitó la exportación
+
+    Returns:
+        str: Ruta relativa del ZIP generado
+    """
+    import shutil
+    import zipfile
+    from inventory_app.models.user import User
+
+    out_dir = os.path.join(settings.MEDIA_ROOT, "reports")
+    os.makedirs(out_dir, exist_ok=True)
+    current_datetime = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    zip_name = f"quotations_batch_{user_id}_{current_datetime}.zip"
+
+    rendered = [name for name in filenames if name]
+    try:
+        with zipfile.ZipFile(os.path.join(out_dir, zip_name), "w", zipfile.ZIP_DEFLATED) as archive:
+            for name in rendered:
+                path = os.path.join(out_dir, name)
+                archive.write(path, arcname=os.path.basename(name))
+    except OSError as exc:
+        logger.error(f"Error generando ZIP de exportación por lotes: {str(exc)}")
+        publish_task_event(self.request.id, STATE_FAILURE, error=str(exc))
+        raise
+
+    # Los PDFs del lote solo existen dentro del ZIP; los de otros lotes y los
+    # registrados por generate_quotation_pdf están en otros directorios
+    for batch_dir in {os.path.dirname(name) for name in rendered}:
+        if os.path.dirname(batch_dir) == BATCH_DIR:
+            shutil.rmtree(os.path.join(out_dir, batch_dir), ignore_errors=True)
+
+    user = User.objects.get(id=user_id)
+    Report.objects.create(file=f"reports/{zip_name}", user=user)
+
+    logger.info(f"Exportación por lotes generada: {zip_name} ({len(rendered)} cotizaciones)")
+    publish_task_event(self.request.id, STATE_SUCCESS, progress=100, result=f"reports/{zip_name}")
+    return f"reports/{zip_name}"
+
+
+@shared_task
+def fail_quotation_pdf_batch(request, exc, traceback):
+    """
+    Errback del chord de exportación por lotes. Si una tarea de renderizado agota
+    sus reintentos, bundle_quotation_pdfs no se ejecuta: se publica la falla en
+    el canal del lote (para que el stream SSE termine) y se borran los PDFs ya
+    renderizados en su directorio.
+
+    Args:
+        request: Request del callback del chord (su id es el batch_id)
+        exc: Excepción que hizo fallar el lote
+        traceback: Traceback de la excepción (puede ser None)
+    """
+    import shutil
+
+    batch_id = request.id
+    logger.error(f"Exportación por lotes {batch_id} fallida: {exc}")
+    publish_task_event(batch_id, STATE_FAILURE, error=str(exc))
+    if batch_id:
+        shutil.rmtree(os.path.join(settings.MEDIA_ROOT, "reports", BATCH_DIR, batch_id), ignore_errors=True)
+
+
+def start_quotation_pdf_batch(quotation_ids, user_id):
+    """
+    Lanza la exportación por lotes: un grupo de tareas de renderizado repartido
+    entre los workers y un callback que genera el ZIP (con fail_quotation_pdf_batch
+    como errback si el lote falla).
+
+    Args:
+        quotation_ids: IDs de las cotizaciones a exportar
+        user_id: ID del usuario que solicita la exportación
+
+    Returns:
+        AsyncResult: Resultado del callback (su id es el task_id para el cliente)
+    """
+    from celery import chord
+
+    # El id del callback se fija de antemano para que cada tarea del grupo
+    # publique el progreso acumulado en el canal de eventos del lote
+    batch_id = str(uuid4())
+    header = [
+        render_quotation_pdf.s(
+            quotation_id, batch_id=batch_id, batch_size=len(quotation_ids)
+        ).set(priority=TaskPriority.NORMAL)
+        for quotation_id in quotation_ids
+    ]
+    publish_task_event(batch_id, STATE_STARTED, progress=0)
+    callback = bundle_quotation_pdfs.s(user_id).set(task_id=batch_id)
+    callback.link_error(fail_quotation_pdf_batch.s())
+    return chord(header)(callback)
+
+
+@shared_task(bind=True, max_retries=3, soft_time_limit=10 * 60, time_limit=15 * 60)
+@read_from_replica()
 def generate_movements_report_pdf(self, user_id, filters=None):
     """
-    Genera un PDF de reporte de movimientos de forma asíncrona.
+    Genera un PDF de reporte de movimientos de forma asíncrona. Los
+    movimientos se leen de la réplica si está configurada.
 
     Args:
         user_id: ID del usuario que solicita el reporte
@@ -146,8 +326,15 @@ def generate_movements_report_pdf(self, user_id, filters=None):
     Returns:
         str: Ruta relativa del archivo PDF generado
     """
+    task_id = self.request.id
     try:
         from inventory_app.models.user import User
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+
+        publish_task_event(task_id, STATE_STARTED, progress=0)
 
         # Construir queryset con filtros
         movements = Movement.objects.select_related(
@@ -197,7 +384,13 @@ def generate_movements_report_pdf(self, user_id, filters=None):
 
         # Tabla de movimientos
         data = [["Fecha", "Tipo", "Producto", "Cantidad", "Stock"]]
-        for mov in movements:
+        movements = list(movements)
+        total_rows = len(movements)
+        progress_step = max(total_rows // 10, 1)
+        for index, mov in enumerate(movements, start=1):
+            # Progreso de 10% a 60% mientras se arma la tabla
+            if index % progress_step == 0:
+                publish_task_event(task_id, STATE_PROGRESS, progress=10 + index * 50 // total_rows)
             tipo = "Entrada" if mov.movement_type == "input" else "Salida"
             data.append([
                 mov.date.strftime('%d/%m/%Y'),
@@ -219,15 +412,224 @@ def generate_movements_report_pdf(self, user_id, filters=None):
         ]))
         elements.append(table)
 
+        publish_task_event(task_id, STATE_PROGRESS, progress=60)
         doc.build(elements)
+        publish_task_event(task_id, STATE_PROGRESS, progress=90)
 
         # Registrar en BD
         user = User.objects.get(id=user_id)
         Report.objects.create(file=f"reports/{filename}", user=user)
 
         logger.info(f"PDF de reporte de movimientos generado exitosamente: {filename}")
+        publish_task_event(task_id, STATE_SUCCESS, progress=100, result=f"reports/{filename}")
         return f"reports/{filename}"
 
     except Exception as exc:
         logger.error(f"Error generando reporte de movimientos: {str(exc)}")
+        if self.request.retries >= self.max_retries:
+            publish_task_event(task_id, STATE_FAILURE, error=str(exc))
         raise self.retry(exc=exc, countdown=60)
+
+
+@shared_task(autoretry_for=(DatabaseError,), retry_backoff=True, max_retries=5,
+             soft_time_limit=60, time_limit=90)
+def write_audit_logs(entries):
+    """
+    Inserta un bloque de registros de auditoría (modo AUDIT_LOG_WRITE_MODE='celery').
+
+    Args:
+        entries: Lista de dicts generados por utils.audit_buffer.serialize
+
+    Returns:
+        int: Número de registros insertados
+    """
+    from django.utils.dateparse import parse_datetime
+    from inventory_app.models.audit_log import AuditLog
+
+    logs = [
+        AuditLog(**{**entry, 'timestamp': parse_datetime(entry['timestamp'])})
+        for entry in entries
+    ]
+    AuditLog.objects.bulk_create(logs, batch_size=500)
+    return len(logs)
+
+
+@shared_task(bind=True, max_retries=3, soft_time_limit=60, time_limit=90)
+def process_product_image(self, product_id, path, original_name):
+    """
+    Procesa la imagen de un producto guardada en staging: sube el original y
+    genera las variantes WebP (ver ProductImageService).
+
+    Args:
+        product_id: ID del producto
+        path: Ruta del archivo en staging
+        original_name: Nombre original del archivo subido
+
+    Returns:
+        dict: Variantes generadas, o None si la imagen no es válida
+    """
+    from inventory_app.services.product_image_service import ProductImageService
+
+    try:
+        return ProductImageService.process(product_id, path, original_name)
+    except Exception as exc:
+        logger.error(f"Error procesando la imagen del producto {product_id}: {str(exc)}")
+        if self.request.retries >= self.max_retries:
+            ProductImageService.mark_failed(product_id, path)
+            raise
+        raise self.retry(exc=exc, countdown=30)
+
+
+@shared_task(soft_time_limit=10 * 60, time_limit=15 * 60)
+def take_daily_stock_snapshot(day=None):
+    """
+    Genera la fotografía diaria de stock (programada con Celery beat).
+
+    Args:
+        day: Fecha ISO (YYYY-MM-DD) a fotografiar. Por defecto, el día anterior.
+
+    Returns:
+        int: Número de productos fotografiados
+    """
+    from datetime import date as date_type
+    from inventory_app.services.stock_snapshot_service import StockSnapshotService
+
+    target_day = date_type.fromisoformat(day) if day else None
+    return StockSnapshotService.take_snapshot(target_day)
+
+
+@shared_task(soft_time_limit=10 * 60, time_limit=15 * 60)
+def prune_expired_reports():
+    """
+    Elimina reportes PDF (filas y archivos) que superan el período de retención.
+    Programada con Celery beat.
+
+    Returns:
+        int: Número de reportes eliminados
+    """
+    from inventory_app.services.report_service import ReportService
+
+    return ReportService.prune_expired()
+
+
+@shared_task(soft_time_limit=10 * 60, time_limit=15 * 60)
+def reconcile_stock_ledger(repair=None):
+    """
+    Compara el stock de cada producto con su historial de movimientos.
+    Programada con Celery beat.
+
+    Args:
+        repair: Corregir las diferencias (por defecto settings.STOCK_RECONCILIATION_AUTO_REPAIR)
+
+    Returns:
+        dict: Resumen de la ejecución
+    """
+    from inventory_app.services.stock_reconciliation_service import StockReconciliationService
+
+    run = StockReconciliationService.reconcile(repair=repair)
+    return {
+        'reconciliation_id': run.id,
+        'products_checked': run.products_checked,
+        'drift_count': run.drift_count,
+        'repaired_count': run.repaired_count,
+    }
+
+
+# Errores transitorios de SMTP/red que justifican reintentar el envío
+EMAIL_RETRY_EXCEPTIONS = (smtplib.SMTPException, OSError)
+
+
+def _send_messages(messages):
+    """
+    Envía varios correos reutilizando una sola conexión del backend configurado.
+
+    Args:
+        messages: Lista de EmailMessage
+
+    Returns:
+        int: Número de correos enviados
+    """
+    if not messages:
+        return 0
+    with get_connection(fail_silently=False) as connection:
+        return connection.send_messages(messages) or 0
+
+
+def _build_password_reset_message(user):
+    """Construye el correo de recuperación de contraseña para el usuario."""
+    token = default_token_generator.make_token(user)
+    frontend_base_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:3000')
+    reset_url = f"{frontend_base_url}/reset-password?uid={user.pk}&token={token}"
+    return EmailMessage(
+        subject="Recupera tu contraseña",
+        body=(
+            f"Hola,\n\n"
+            f"Hemos recibido una solicitud para restablecer la contraseña de tu cuenta en QualityCore Services.\n\n"
+            f"Para crear una nueva contraseña, haz clic en el siguiente enlace o cópialo y pégalo en tu navegador:\n"
+            f"{reset_url}\n\n"
+            f"Si tú no solicitaste este cambio, puedes ignorar este correo y tu contraseña actual seguirá siendo válida. Si tienes alguna duda o detectas actividad sospechosa, por favor comunícate con la administradora.\n\n"
+            f"Gracias por confiar en nosotros.\n"
+            f"Equipo de QualityCore Services"
+        ),
+        to=[user.email],
+    )
+
+
+@shared_task(
+    autoretry_for=EMAIL_RETRY_EXCEPTIONS, retry_backoff=True, max_retries=3,
+    soft_time_limit=30, time_limit=60,
+)
+def send_password_reset_email(email):
+    """
+    Envía el enlace de recuperación de contraseña si el correo está registrado.
+
+    La búsqueda del usuario se hace aquí y no en la vista, para que la respuesta
+    HTTP tarde lo mismo exista o no el correo.
+
+    Args:
+        email: Correo ingresado en el formulario
+
+    Returns:
+        int: 1 si se envió el correo, 0 si el correo no está registrado
+    """
+    user = User.objects.filter(email=email).first()
+    if user is None:
+        return 0
+    return _send_messages([_build_password_reset_message(user)])
+
+
+@shared_task(
+    autoretry_for=EMAIL_RETRY_EXCEPTIONS, retry_backoff=True, max_retries=3,
+    soft_time_limit=5 * 60, time_limit=6 * 60,
+)
+def send_email_batch(messages):
+    """
+    Envía un lote de correos sobre una única conexión SMTP.
+
+    Args:
+        messages: Lista de dicts {'subject', 'body', 'to': [correos]}
+
+    Returns:
+        int: Número de correos enviados
+    """
+    return _send_messages([
+        EmailMessage(subject=m['subject'], body=m['body'], to=m['to'])
+        for m in messages
+    ])
+
+
+@shared_task(soft_time_limit=30 * 60, time_limit=35 * 60)
+def maintain_audit_partitions():
+    """
+    Crea las particiones futuras de AuditLog y archiva las vencidas.
+    Programada con Celery beat (sin efecto fuera de PostgreSQL).
+
+    Returns:
+        dict: Particiones creadas y archivos generados
+    """
+    from inventory_app.services.audit_partition_service import AuditPartitionService
+
+    return {
+        'created': AuditPartitionService.ensure_partitions(),
+        'archived': AuditPartitionService.archive_expired(),
+    }
@@ -0,0 +1,70 @@
+# tests/helpers.py
+"""
+Utilidades compartidas por los módulos de tests.
+"""
+import time
+
+
+class FakeRedis:
+    """
+    Redis mínimo en memoria (GET/SET NX XX GET/EXISTS/DELETE, hashes, sets, pipeline y
+    el script del rate limiter) para tests; ignora los TTL.
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
+    def hincrbyfloat(self, key, field, amount):
+        values = self.data.setdefault(key, {})
+        field = field.encode()
+        values[field] = str(float(values.get(field, b'0')) + amount).encode()
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def register_script(self, script):
+        """Solo el script GCRA del rate limiter, emulado con su implementación local."""
+        from inventory_app.utils.rate_limiter import _LocalStore
+
+        if not hasattr(self, '_gcra'):
+            self._gcra = _LocalStore()
+
+        def run(keys, args):
+            limits = [(key, float(args[2 * i]), float(args[2 * i + 1])) for i, key in enumerate(keys)]
+            allowed, waits = self._gcra.check(limits, time.time() * 1000)
+            return [0 if allowed else 1] + [f'{wait:.3f}' for wait in waits]
+        return run
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, ex=None, xx=False, get=False):
+        previous = self.data.get(key)
+        if (nx and key in self.data) or (xx and key not in self.data):
+            return previous if get else None
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        return previous if get else True
+
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(
+            member.encode() if isinstance(member, str) else member for member in members
+        )
+
+    def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    def expire(self, key, seconds):
+        return key in self.data
+
+    def exists(self, *keys):
+        return sum(key in self.data for key in keys)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
@@ -0,0 +1,673 @@
+# tests/test_middleware.py
+"""
+Tests para middlewares.
+Cubre: AuditMiddleware, el pipeline de logging de auditoría, la escritura en bloque de AuditLog
+MetricsMiddleware, el detector de consultas lentas y N+1, el envío de logs al colector y el
+enrutamiento de lecturas a la réplica (ReplicaRouter y ReplicaRoutingMiddleware).
+"""
+import json
+import logging
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import DatabaseError, OperationalError, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from redis import RedisError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from inventory_app import db_routers
+from inventory_app.middleware import (
+    AuditMiddleware, MetricsMiddleware, QueryInspectorMiddleware, ReplicaRoutingMiddleware,
+)
+from inventory_app.models import AuditLog, Category, User
+from inventory_app.tasks import write_audit_logs
+from inventory_app.tests.helpers import FakeRedis
+from inventory_app.utils import audit_buffer, metrics
+from inventory_app.utils.audit_logging import AuditQueueHandler, JsonLinesFormatter
+from inventory_app.utils import log_shipping
+from inventory_app.utils.query_inspector import QueryPatternError, sql_shape
+
+
+# =============================================================================
+# Tests de AuditMiddleware
+# =============================================================================
+class TestAuditMiddleware(TestCase):
+    """Tests para el registro de auditoría por request."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = AuditMiddleware(lambda request: HttpResponse(status=201))
+
+    def call(self, request):
+        request.user = AnonymousUser()
+        with self.assertLogs('inventory_app.audit', level='INFO') as logs:
+            self.middleware(request)
+        self.assertEqual(len(logs.records), 1)
+        return logs.records[0].msg
+
+    def test_un_registro_por_request(self):
+        """Debe encolar un único dict con los datos de la request y la response."""
+        record = self.call(self.factory.get('/api/products/', REMOTE_ADDR='10.0.0.1'))
+
+        self.assertEqual(record['method'], 'GET')
+        self.assertEqual(record['path'], '/api/products/')
+        self.assertEqual(record['status'], 201)
+        self.assertEqual(record['user'], 'Anonymous')
+        self.assertEqual(record['ip'], '10.0.0.1')
+        self.assertNotIn('body', record)
+
+    def test_body_se_captura_sin_parsear(self):
+        """El body JSON se pasa como bytes; el parseo ocurre en el hilo de escritura."""
+        payload = json.dumps({'email': 'a@b.com', 'password': 'secreto'})
+        record = self.call(self.factory.post('/api/login/', payload, content_type='application/json'))
+        self.assertEqual(record['body'], payload.encode())
+
+    @override_settings(AUDIT_BODY_MAX_BYTES=10)
+    def test_body_grande_se_trunca(self):
+        """Un body mayor al límite no debe leerse."""
+        middleware = AuditMiddleware(lambda request: HttpResponse())
+        request = self.factory.post('/api/products/', json.dumps({'name': 'x' * 50}),
+                                    content_type='application/json')
+        request.user = AnonymousUser()
+        with self.assertLogs('inventory_app.audit', level='INFO') as logs:
+            middleware(request)
+        self.assertTrue(logs.records[0].msg['body'].startswith('<truncated'))
+
+
+# =============================================================================
+# Tests del pipeline de logging de auditoría
+# =============================================================================
+class TestAuditLogging(TestCase):
+    """Tests para el formatter JSON y el QueueHandler de auditoría."""
+
+    def make_record(self, msg):
+        return logging.LogRecord('inventory_app.audit', logging.INFO, __file__, 1, msg, None, None)
+
+    def test_formatter_oculta_campos_sensibles(self):
+        """El formatter debe parsear el body y ocultar contraseñas."""
+        record = self.make_record({
+            'method': 'POST',
+            'body': json.dumps({'email': 'a@b.com', 'password': 'secreto'}).encode(),
+        })
+        line = json.loads(JsonLinesFormatter().format(record))
+
+        self.assertEqual(line['body']['email'], 'a@b.com')
+        self.assertEqual(line['body']['password'], '***REDACTED***')
+        self.assertIn('ts', line)
+
+    def test_formatter_body_no_json(self):
+        """Un body que no es JSON debe registrarse con un marcador."""
+        line = json.loads(JsonLinesFormatter().format(self.make_record({'body': b'\xff\x00'})))
+        self.assertEqual(line['body'], '<binary or non-JSON data>')
+
+    def test_cola_llena_descarta_sin_bloquear(self):
+        """Con la cola llena el registro se descarta en lugar de bloquear la request."""
+        handler = AuditQueueHandler(queue.Queue(maxsize=1))
+        handler.handle(self.make_record({'n': 1}))
+        handler.handle(self.make_record({'n': 2}))
+
+        self.assertEqual(handler.dropped, 1)
+        self.assertEqual(handler.queue.get_nowait().msg, {'n': 1})
+
+
+# =============================================================================
+# Tests del envío de logs al colector
+# =============================================================================
+class TestLogShipping(TestCase):
+    """Tests para el muestreo, el ruteo y el colector de logs."""
+
+    def make_record(self, name, level=logging.INFO, msg='mensaje'):
+        return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+    def test_ruteo_por_logger_y_nivel(self):
+        """Cada logger va a su archivo y los errores además a errors.log."""
+        route = log_shipping.route
+        self.assertEqual(route(self.make_record('inventory_app.services.inventory_service')), ['inventory'])
+        self.assertEqual(route(self.make_record('inventory_app.audit')), ['audit'])
+        self.assertEqual(route(self.make_record('django.request', logging.ERROR)), ['general', 'errors'])
+
+    def test_muestreo_limita_por_segundo(self):
+        """Sobre el tope por segundo se descarta y el siguiente registro informa cuántos se omitieron."""
+        sampling = log_shipping.SamplingFilter({'inventory_app.services': {'max_per_second': 2}})
+        with mock.patch('inventory_app.utils.log_shipping.time.monotonic', return_value=100.0):
+            kept = [sampling.filter(self.make_record('inventory_app.services.x')) for _ in range(5)]
+        self.assertEqual(kept, [True, True, False, False, False])
+        # Los WARNING y otros loggers no se muestrean
+        with mock.patch('inventory_app.utils.log_shipping.time.monotonic', return_value=100.0):
+            self.assertTrue(sampling.filter(self.make_record('inventory_app.services.x', logging.WARNING)))
+            self.assertTrue(sampling.filter(self.make_record('django')))
+
+        with mock.patch('inventory_app.utils.log_shipping.time.monotonic', return_value=101.0):
+            record = self.make_record('inventory_app.services.x')
+            self.assertTrue(sampling.filter(record))
+        self.assertEqual(record.suppressed, 3)
+
+    def test_decision_de_muestreo_compartida_entre_handlers(self):
+        """El mismo registro evaluado por dos handlers no debe contarse dos veces."""
+        sampling = log_shipping.SamplingFilter({'inventory_app.services': {'sample_rate': 0.5}})
+        record = self.make_record('inventory_app.services.x')
+        with mock.patch('inventory_app.utils.log_shipping.random.random', side_effect=[0.9, 0.1]):
+            self.assertFalse(sampling.filter(record))
+            self.assertFalse(sampling.filter(record))
+
+    def test_colector_escribe_lineas_json(self):
+        """El colector recibe los registros por el socket y los escribe en el archivo que corresponde."""
+        logs_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, logs_dir, ignore_errors=True)
+        socket_path = os.path.join(logs_dir, 'c.sock')
+        collector = log_shipping.LogCollector(socket_path, logs_dir)
+        thread = threading.Thread(target=collector.serve_forever, daemon=True)
+        thread.start()
+
+        client = log_shipping.CollectorClient(socket_path)
+        client.setFormatter(log_shipping.ShippingFormatter())
+        client.emit(self.make_record('inventory_app.services.inventory_service', msg='Salida de 3 unidades'))
+        client.emit(self.make_record('inventory_app', logging.ERROR, msg='falló'))
+        client.close()
+
+        for _ in range(50):
+            if collector.written == 2:
+                break
+            time.sleep(0.05)
+        collector.shutdown()
+        collector.server_close()
+        thread.join(timeout=2)
+
+        with open(os.path.join(logs_dir, 'inventory.log'), encoding='utf-8') as fh:
+            entry = json.loads(fh.readline())
+        self.assertEqual(entry['message'], 'Salida de 3 unidades')
+        self.assertEqual(entry['logger'], 'inventory_app.services.inventory_service')
+        with open(os.path.join(logs_dir, 'errors.log'), encoding='utf-8') as fh:
+            self.assertEqual(json.loads(fh.readline())['message'], 'falló')
+        self.assertFalse(os.path.exists(socket_path))
+
+    def test_sin_colector_auditoria_va_a_stderr(self):
+        """Sin colector la auditoría no se pierde; el resto se descarta y se cuenta."""
+        client = log_shipping.CollectorClient('')
+        client.setFormatter(log_shipping.ShippingFormatter())
+        with mock.patch('sys.stderr') as stderr:
+            client.emit(self.make_record('inventory_app.audit', msg={'method': 'GET', 'path': '/api/'}))
+            client.emit(self.make_record('inventory_app'))
+        self.assertEqual(json.loads(stderr.write.call_args[0][0])['path'], '/api/')
+        self.assertEqual(client.dropped, 1)
+
+    def test_reinicia_el_hilo_en_procesos_hijos(self):
+        """Tras un fork (otro pid) el handler crea su propio hilo de envío."""
+        handler = log_shipping.build_shipping_handler('', queue_size=10)
+        self.addCleanup(handler.close)
+        handler.handle(self.make_record('inventory_app'))
+        first_listener = handler.listener
+
+        with mock.patch('inventory_app.utils.log_shipping.os.getpid', return_value=-1):
+            handler.handle(self.make_record('inventory_app'))
+            self.assertIsNot(handler.listener, first_listener)
+            handler.close()
+        first_listener.stop()
+
+# =============================================================================
+class TestAuditBuffer(TestCase):
+    """Tests para el buffer de AuditLog."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='audit@test.com',
+            password='TestPass1!',
+            name='Audit User',
+            role='Administrator',
+            phone='0991234567',
+        )
+
+    def log(self, action='update'):
+        return AuditLog.log_action(self.user, action, 'Product')
+
+    def test_request_escribe_un_solo_bulk_create(self):
+        """Los registros de la request se insertan juntos al final."""
+        with audit_buffer.collect():
+            with self.captureOnCommitCallbacks(execute=True):
+                for _ in range(3):
+                    self.log()
+            # Transacción confirmada: los registros esperan el fin de la request
+            self.assertEqual(AuditLog.objects.count(), 0)
+        self.assertEqual(AuditLog.objects.filter(user=self.user).count(), 3)
+
+    def test_bulk_create_en_una_consulta(self):
+        """Fuera de transacción, el buffer se escribe con una sola consulta."""
+        with mock.patch('inventory_app.utils.audit_buffer.connection') as conn:
+            conn.in_atomic_block = False
+            with self.assertNumQueries(1):
+                with audit_buffer.collect():
+                    for _ in range(5):
+                        self.log()
+        self.assertEqual(AuditLog.objects.count(), 5)
+
+    def test_rollback_descarta_registro(self):
+        """Un registro de una transacción revertida no debe guardarse."""
+        with audit_buffer.collect(), self.captureOnCommitCallbacks(execute=True):
+            self.log('create')
+            try:
+                with transaction.atomic():
+                    self.log('delete')
+                    raise DatabaseError('rollback')
+            except DatabaseError:
+                pass
+        self.assertEqual(list(AuditLog.objects.values_list('action', flat=True)), ['create'])
+
+    @override_settings(AUDIT_LOG_BUFFER_SIZE=2)
+    def test_buffer_lleno_escribe_de_inmediato(self):
+        """Al alcanzar el límite el buffer se escribe sin esperar el fin de la request."""
+        with audit_buffer.collect():
+            with self.captureOnCommitCallbacks(execute=True):
+                for _ in range(3):
+                    self.log()
+            self.assertEqual(AuditLog.objects.count(), 2)
+        self.assertEqual(AuditLog.objects.count(), 3)
+
+    @override_settings(AUDIT_LOG_WRITE_MODE='sync')
+    def test_modo_sync(self):
+        """En modo sync cada registro se guarda al instante."""
+        log = self.log()
+        self.assertIsNotNone(log.pk)
+
+    @override_settings(AUDIT_LOG_WRITE_MODE='celery')
+    def test_modo_celery(self):
+        """En modo celery el bloque se delega a la tarea write_audit_logs."""
+        with mock.patch('inventory_app.tasks.write_audit_logs.delay') as delay:
+            with audit_buffer.collect(), self.captureOnCommitCallbacks(execute=True):
+                self.log()
+                self.log()
+        entries = delay.call_args[0][0]
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(AuditLog.objects.count(), 0)
+
+        self.assertEqual(write_audit_logs(entries), 2)
+        self.assertEqual(AuditLog.objects.filter(user=self.user).count(), 2)
+
+    def test_error_de_bd_no_pierde_registros(self):
+        """Si el bulk_create falla, los registros se vuelcan al log de auditoría."""
+        log = AuditLog(user=self.user, user_email=self.user.email, action='update', model_name='Product')
+        with mock.patch.object(AuditLog.objects, 'bulk_create', side_effect=DatabaseError('down')):
+            with self.assertLogs('inventory_app.audit', level='WARNING') as logs:
+                audit_buffer.flush([log])
+        self.assertEqual(logs.records[0].msg['audit_log']['user_email'], 'audit@test.com')
+
+
+# =============================================================================
+# Tests de MetricsMiddleware
+# =============================================================================
+class TestMetricsMiddleware(TestCase):
+    """Tests para las métricas de latencia y consultas por endpoint."""
+
+    def setUp(self):
+        self.redis = FakeRedis()
+        patcher = mock.patch('inventory_app.utils.redis_client.get_redis', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        metrics.recorder.flush()
+        self.redis.data.clear()
+
+    def test_cuenta_consultas_de_la_request(self):
+        """El middleware debe etiquetar por ruta y contar las consultas SQL ejecutadas."""
+        def view(request):
+            list(User.objects.all())
+            list(User.objects.all())
+            return HttpResponse('ok')
+
+        request = RequestFactory().get('/api/products/')
+        request.resolver_match = mock.Mock(route='api/products/', view_name='products')
+        MetricsMiddleware(view)(request)
+
+        text = metrics.render_prometheus()
+        labels = 'view="api/products/",method="GET",status="200"'
+        self.assertIn(f'http_request_db_queries_bucket{{{labels},le="2.0"}} 1', text)
+        self.assertIn(f'http_request_db_queries_bucket{{{labels},le="1.0"}} 0', text)
+        self.assertIn(f'http_request_db_queries_sum{{{labels}}} 2.0', text)
+        self.assertIn(f'http_request_duration_seconds_count{{{labels}}} 1', text)
+
+    def test_async_cuenta_consultas_del_hilo_del_orm(self):
+        """Con ASGI las consultas async corren en otro hilo y también deben contarse."""
+        async def view(request):
+            for _ in range(3):
+                await User.objects.acount()
+            return HttpResponse('ok')
+
+        request = RequestFactory().get('/api/products/')
+        request.resolver_match = mock.Mock(route='api/products/', view_name='products')
+        async_to_sync(MetricsMiddleware(view))(request)
+
+        labels = 'view="api/products/",method="GET",status="200"'
+        self.assertIn(f'http_request_db_queries_sum{{{labels}}} 3.0', metrics.render_prometheus())
+
+    def test_buckets_acumulativos(self):
+        """Los buckets del histograma deben ser acumulativos y terminar en +Inf."""
+        labels = ('api/config/', 'GET', '200')
+        metrics.recorder.observe(labels, 0.003, 0, 0.0)
+        metrics.recorder.observe(labels, 0.2, 1, 0.01)
+        metrics.recorder.observe(labels, 30.0, 1, 0.02)
+
+        text = metrics.render_prometheus()
+        prefix = 'http_request_duration_seconds_bucket{view="api/config/",method="GET",status="200"'
+        self.assertIn(f'{prefix},le="0.005"}} 1', text)
+        self.assertIn(f'{prefix},le="0.25"}} 2', text)
+        self.assertIn(f'{prefix},le="10.0"}} 2', text)
+        self.assertIn(f'{prefix},le="+Inf"}} 3', text)
+        self.assertIn('# TYPE http_request_db_duration_seconds_total counter', text)
+
+    def test_request_sin_ruta(self):
+        """Las URLs sin match se agrupan en 'unmatched' para acotar la cardinalidad."""
+        request = RequestFactory().get('/no-existe/')
+        MetricsMiddleware(lambda r: HttpResponse(status=404))(request)
+        self.assertIn('view="unmatched",method="GET",status="404"', metrics.render_prometheus())
+
+    def test_metricas_del_pool(self):
+        """Los contadores del pool de conexiones se publican por alias, con la espera en segundos."""
+        pool = mock.Mock()
+        pool.pop_stats.return_value = {
+            'requests_num': 40, 'requests_queued': 3, 'requests_wait_ms': 250, 'pool_size': 4,
+        }
+        pooled = mock.Mock(alias='default', settings_dict={'OPTIONS': {'pool': {'max_size': 4}}}, pool=pool)
+        plain = mock.Mock(alias='replica', settings_dict={'OPTIONS': {}})
+
+        with mock.patch('django.db.connections') as connections:
+            connections.all.return_value = [pooled, plain]
+            metrics.recorder.flush()
+            pool.pop_stats.return_value = {'requests_num': 2}
+            text = metrics.render_prometheus()
+
+        self.assertIn('# TYPE db_pool_wait_seconds_total counter', text)
+        self.assertIn('db_pool_wait_seconds_total{alias="default"} 0.25', text)
+        self.assertIn('db_pool_requests_queued_total{alias="default"} 3.0', text)
+        self.assertIn('db_pool_requests_total{alias="default"} 42.0', text)
+        self.assertNotIn('alias="replica"', text)
+        self.assertNotIn('db_pool_timeouts_total', text)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_desactivado(self):
+        """Con METRICS_ENABLED=False no se registra nada."""
+        MetricsMiddleware(lambda r: HttpResponse('ok'))(RequestFactory().get('/'))
+        metrics.recorder.flush()
+        self.assertEqual(self.redis.hgetall(metrics.REDIS_KEY), {})
+
+
+# =============================================================================
+# Tests del detector de consultas lentas y N+1
+# =============================================================================
+@override_settings(QUERY_INSPECTOR_ENABLED=True, QUERY_INSPECTOR_RAISE=False, QUERY_INSPECTOR_REPEAT_THRESHOLD=5)
+class TestQueryInspectorMiddleware(TestCase):
+    """Tests para QueryInspectorMiddleware."""
+
+    @staticmethod
+    def n_plus_one_view(request):
+        for user_id in range(6):
+            User.objects.filter(pk=user_id).first()
+        return HttpResponse('ok')
+
+    def request(self):
+        request = RequestFactory().get('/api/users/')
+        request.resolver_match = mock.Mock(route='api/users/', view_name='users')
+        return request
+
+    def test_forma_sql_ignora_valores(self):
+        """Listas IN de distinto largo y literales numéricos comparten forma."""
+        self.assertEqual(
+            sql_shape('SELECT * FROM t WHERE id IN (%s, %s) LIMIT 21'),
+            sql_shape('SELECT * FROM t WHERE id IN (%s, %s, %s) LIMIT 1'),
+        )
+
+    def test_detecta_n_mas_uno_con_vista_y_stack(self):
+        """Consultas repetidas deben registrarse con la vista y el frame que las originó."""
+        with self.assertLogs('inventory_app.queries', level='WARNING') as logs:
+            QueryInspectorMiddleware(self.n_plus_one_view)(self.request())
+
+        finding = logs.records[0].query_finding
+        self.assertEqual(finding['kind'], 'n_plus_one')
+        self.assertEqual(finding['view'], 'GET api/users/')
+        self.assertEqual(finding['count'], 6)
+        self.assertTrue(any('n_plus_one_view' in frame for frame in finding['stack']))
+
+    def test_async_detecta_n_mas_uno(self):
+        """El detector debe ver las consultas async aunque corran en el hilo de sync_to_async."""
+        async def view(request):
+            for user_id in range(6):
+                await User.objects.filter(pk=user_id).afirst()
+            return HttpResponse('ok')
+
+        with self.assertLogs('inventory_app.queries', level='WARNING') as logs:
+            async_to_sync(QueryInspectorMiddleware(view))(self.request())
+        self.assertEqual(logs.records[0].query_finding['count'], 6)
+
+    def test_sin_hallazgos_no_registra(self):
+        """Pocas consultas distintas no deben reportarse."""
+        def view(request):
+            User.objects.count()
+            return HttpResponse('ok')
+
+        with self.assertNoLogs('inventory_app.queries', level='WARNING'):
+            QueryInspectorMiddleware(view)(self.request())
+
+    @override_settings(QUERY_INSPECTOR_SLOW_MS=0)
+    def test_detecta_consulta_lenta(self):
+        """Consultas sobre el umbral deben reportarse como lentas."""
+        def view(request):
+            User.objects.count()
+            return HttpResponse('ok')
+
+        with self.assertLogs('inventory_app.queries', level='WARNING') as logs:
+            QueryInspectorMiddleware(view)(self.request())
+        self.assertIn('[SLOW_QUERY] GET api/users/', logs.output[0])
+
+    @override_settings(QUERY_INSPECTOR_RAISE=True)
+    def test_modo_ci_falla(self):
+        """En modo CI un N+1 debe lanzar QueryPatternError."""
+        with self.assertLogs('inventory_app.queries', level='WARNING'):
+            with self.assertRaises(QueryPatternError):
+                QueryInspectorMiddleware(self.n_plus_one_view)(self.request())
+
+
+# =============================================================================
+# Tests del enrutamiento a la réplica de lectura
+# =============================================================================
+class TestReplicaRouter(SimpleTestCase):
+    """Tests para las decisiones de ReplicaRouter (sin conectarse a ninguna base)."""
+
+    def setUp(self):
+        self.router = db_routers.ReplicaRouter()
+        patcher = mock.patch.object(db_routers, 'replica_available', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_sin_contexto_lee_del_primario(self):
+        """Fuera de un contexto habilitado las lecturas van al router por defecto."""
+        self.assertIsNone(self.router.db_for_read(User))
+        with db_routers.routing(use_replica=False):
+            self.assertIsNone(self.router.db_for_read(User))
+
+    def test_contexto_habilitado_lee_de_la_replica(self):
+        """Dentro de read_from_replica() las lecturas van a la réplica."""
+        with db_routers.read_from_replica():
+            self.assertEqual(self.router.db_for_read(User), db_routers.REPLICA)
+        self.assertIsNone(self.router.db_for_read(User))
+
+    def test_decorador(self):
+        """read_from_replica() también funciona como decorador."""
+        @db_routers.read_from_replica()
+        def report():
+            return self.router.db_for_read(User)
+
+        self.assertEqual(report(), db_routers.REPLICA)
+
+    def test_despues_de_escribir_lee_del_primario(self):
+        """Tras una escritura el contexto lee del primario y queda marcado."""
+        with db_routers.read_from_replica() as state:
+            self.assertEqual(self.router.db_for_write(User), 'default')
+            self.assertIsNone(self.router.db_for_read(User))
+        self.assertTrue(state.wrote)
+
+    def test_transaccion_abierta_lee_del_primario(self):
+        """Dentro de transaction.atomic() la lectura debe ver lo escrito en la transacción."""
+        with mock.patch.object(db_routers.connections['default'], 'in_atomic_block', True):
+            with db_routers.read_from_replica():
+                self.assertIsNone(self.router.db_for_read(User))
+
+    def test_no_migra_la_replica(self):
+        """La réplica recibe el esquema por replicación, no por migrate."""
+        self.assertFalse(self.router.allow_migrate(db_routers.REPLICA, 'inventory_app'))
+        self.assertIsNone(self.router.allow_migrate('default', 'inventory_app'))
+
+
+class TestReplicaAvailable(SimpleTestCase):
+    """Tests para el fallback al primario cuando la réplica no responde."""
+
+    def setUp(self):
+        db_routers._replica_down_until = 0.0
+        self.addCleanup(setattr, db_routers, '_replica_down_until', 0.0)
+        self.replica = mock.Mock()
+        patcher = mock.patch.object(db_routers, 'connections', {db_routers.REPLICA: self.replica})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_sin_replica_configurada(self):
+        """Sin alias 'replica' no se intenta conectar."""
+        with mock.patch.object(db_routers, 'replica_configured', return_value=False):
+            self.assertFalse(db_routers.replica_available())
+        self.replica.ensure_connection.assert_not_called()
+
+    @override_settings(REPLICA_RETRY_SECONDS=30)
+    def test_replica_caida_usa_el_primario_por_un_tiempo(self):
+        """Tras un fallo de conexión no se reintenta hasta REPLICA_RETRY_SECONDS."""
+        self.replica.ensure_connection.side_effect = OperationalError('connection refused')
+        with mock.patch.object(db_routers, 'replica_configured', return_value=True):
+            with self.assertLogs('inventory_app.db_routers', level='WARNING'):
+                self.assertFalse(db_routers.replica_available())
+            self.assertFalse(db_routers.replica_available())
+            self.assertEqual(self.replica.ensure_connection.call_count, 1)
+
+            self.replica.ensure_connection.side_effect = None
+            db_routers._replica_down_until = 0.0
+            self.assertTrue(db_routers.replica_available())
+
+
+@override_settings(REPLICA_STICKY_SECONDS=5)
+class TestReplicaRoutingMiddleware(SimpleTestCase):
+    """Tests para el contexto de enrutamiento por request y el pin al primario."""
+
+    def setUp(self):
+        self.redis = FakeRedis()
+        for target, value in [
+            ('inventory_app.utils.redis_client.get_redis', mock.Mock(return_value=self.redis)),
+            ('inventory_app.db_routers.replica_configured', mock.Mock(return_value=True)),
+        ]:
+            patcher = mock.patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.factory = RequestFactory()
+        self.seen = []
+
+    def view(self, write=False):
+        def get_response(request):
+            state = db_routers._state.get()
+            self.seen.append(state.use_replica)
+            if write:
+                db_routers.ReplicaRouter().db_for_write(User)
+            return HttpResponse('ok')
+        return get_response
+
+    def request(self, method='get', user_id=7):
+        token = AccessToken()
+        token['user_id'] = user_id
+        return getattr(self.factory, method)('/api/products/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_get_habilita_la_replica(self):
+        """GET/HEAD/OPTIONS leen de la réplica."""
+        ReplicaRoutingMiddleware(self.view())(self.request())
+        self.assertEqual(self.seen, [True])
+
+    def test_post_no_habilita_la_replica(self):
+        """Los métodos de escritura leen del primario."""
+        ReplicaRoutingMiddleware(self.view())(self.request('post'))
+        self.assertEqual(self.seen, [False])
+
+    def test_escritura_fija_al_cliente_en_el_primario(self):
+        """Después de escribir, los GET del mismo usuario leen del primario; los de otros no."""
+        ReplicaRoutingMiddleware(self.view(write=True))(self.request('post'))
+        middleware = ReplicaRoutingMiddleware(self.view())
+        middleware(self.request(user_id=7))
+        middleware(self.request(user_id=8))
+
+        self.assertEqual(self.seen, [False, False, True])
+        self.assertIn(db_routers.pin_key('user:7'), self.redis.data)
+
+    def test_token_invalido_no_fija(self):
+        """Sin identidad verificable no se fija ningún cliente."""
+        request = self.factory.get('/api/products/', HTTP_AUTHORIZATION='Bearer no-es-un-jwt')
+        ReplicaRoutingMiddleware(self.view(write=True))(request)
+        self.assertEqual(self.redis.data, {})
+
+    def test_redis_caido_lee_del_primario(self):
+        """Si no se puede verificar el pin, la request no arriesga leer datos viejos."""
+        self.redis.exists = mock.Mock(side_effect=RedisError('down'))
+        ReplicaRoutingMiddleware(self.view())(self.request())
+        self.assertEqual(self.seen, [False])
+
+    def test_sin_replica_no_hace_nada(self):
+        """Sin alias 'replica' no se abre contexto ni se consulta Redis."""
+        states = []
+        with mock.patch('inventory_app.db_routers.replica_configured', return_value=False):
+            middleware = ReplicaRoutingMiddleware(lambda request: states.append(db_routers._state.get()))
+        self.redis.exists = mock.Mock()
+        middleware(self.request())
+        self.assertEqual(states, [None])
+        self.redis.exists.assert_not_called()
+
+    def test_modo_async(self):
+        """Con ASGI el pin se consulta y se escribe con el cliente async de Redis."""
+        redis = self.redis
+
+        class AsyncFakeRedis:
+            async def exists(self, *keys):
+                return redis.exists(*keys)
+
+            async def set(self, *args, **kwargs):
+                return redis.set(*args, **kwargs)
+
+        async def write_view(request):
+            return self.view(write=True)(request)
+
+        async def read_view(request):
+            return self.view()(request)
+
+        with mock.patch('inventory_app.utils.redis_client.get_async_redis', return_value=AsyncFakeRedis()):
+            async_to_sync(ReplicaRoutingMiddleware(write_view))(self.request('post'))
+            async_to_sync(ReplicaRoutingMiddleware(read_view))(self.request())
+            async_to_sync(ReplicaRoutingMiddleware(read_view))(self.request(user_id=8))
+
+        self.assertEqual(self.seen, [False, False, True])
+
+
+@unittest.skipUnless(db_routers.REPLICA in settings.DATABASES, 'Sin alias replica (DB_REPLICA_HOST)')
+class TestReplicaRoutingIntegration(TransactionTestCase):
+    """Lecturas reales a través del alias 'replica' (espejo del primario en tests)."""
+
+    databases = '__all__'
+
+    def setUp(self):
+        db_routers._replica_down_until = 0.0
+
+    def test_queryset_usa_la_replica(self):
+        """Dentro de read_from_replica() el queryset se ejecuta en el alias 'replica'."""
+        Category.objects.create(name='Réplica')
+        with db_routers.read_from_replica():
+            queryset = Category.objects.filter(name='Réplica')
+            self.assertEqual(queryset.db, db_routers.REPLICA)
+            self.assertEqual(queryset.count(), 1)
+        self.assertEqual(Category.objects.all().db, 'default')
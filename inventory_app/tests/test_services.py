@@ -1,20 +1,39 @@
 # tests/test_services.py
 """
 Tests para servicios de lógica de negocio.
-Cubre: InventoryService, SaleService, AlertService, PurchaseService.
+Cubre: InventoryService, SaleService, AlertService, PurchaseService,
+StockSnapshotService, ReportService, StockReconciliationService, AuditPartitionService,
+ContactImportService y los comandos de benchmark, prueba de carga y tiempo de arranque.
 """
+import os
+import shutil
+import tempfile
+
+from io import BytesIO, StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import TestCase
 from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework.exceptions import ValidationError as DRFValidationError
 from django.utils import timezone
 from decimal import Decimal
+from datetime import datetime, time, timedelta
 
-from inventory_app.models import Product, Category, Supplier, Customer, User, Movement, Sale, Purchase
+from inventory_app.models import Product, Category, Supplier, Customer, User, Movement, Sale, Purchase, Report
 from inventory_app.models.alert import Alert
+from inventory_app.models.stock_snapshot import StockSnapshot
+from inventory_app.models.stock_reconciliation import StockReconciliation
 from inventory_app.services.inventory_service import InventoryService
 from inventory_app.services.sale_service import SaleService
 from inventory_app.services.alert_service import AlertService
 from inventory_app.services.purchase_service import PurchaseService
+from inventory_app.services.stock_snapshot_service import StockSnapshotService
+from inventory_app.services.report_service import ReportService
+from inventory_app.services.stock_reconciliation_service import StockReconciliationService
+from inventory_app.services.audit_partition_service import AuditPartitionService
+from inventory_app.services.contact_import_service import ContactImportService
+from inventory_app.models.audit_log import AuditLog
 
 
 class ServiceBaseTestCase(TestCase):
@@ -455,3 +474,444 @@ class TestPurchaseService(ServiceBaseTestCase):
                 user_id=self.user.id,
                 items=[{'product': 99999, 'quantity': 1}]
             )
+
+
+# =============================================================================
+# Tests de StockSnapshotService
+# =============================================================================
+class TestStockSnapshotService(ServiceBaseTestCase):
+    """Tests para fotografías de stock y consultas históricas."""
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.yesterday = self.today - timedelta(days=1)
+        self.three_days_ago = self.today - timedelta(days=3)
+
+    def create_old_product(self, stock):
+        """Crea un producto con fecha de creación anterior a las fechas consultadas."""
+        product = self.create_product(stock=stock)
+        Product.objects.filter(pk=product.pk).update(created_at=timezone.now() - timedelta(days=30))
+        return product
+
+    def create_movement(self, product, movement_type, quantity, day):
+        """Crea un movimiento a mediodía del día indicado (sin modificar el stock)."""
+        return Movement.objects.create(
+            product=product,
+            movement_type=movement_type,
+            quantity=quantity,
+            user=self.user,
+            date=timezone.make_aware(datetime.combine(day, time(12, 0))),
+        )
+
+    def test_snapshot_descuenta_movimientos_posteriores(self):
+        """La fotografía de ayer no debe incluir los movimientos de hoy."""
+        product = self.create_old_product(stock=15)
+        self.create_movement(product, 'input', 5, self.today)
+
+        created = StockSnapshotService.take_snapshot(self.yesterday)
+
+        self.assertEqual(created, 1)
+        snapshot = StockSnapshot.objects.get(product=product, date=self.yesterday)
+        self.assertEqual(snapshot.quantity, 10)
+
+    def test_snapshot_es_idempotente(self):
+        """Regenerar la fotografía de un día no debe duplicar filas."""
+        self.create_old_product(stock=15)
+        StockSnapshotService.take_snapshot(self.yesterday)
+        StockSnapshotService.take_snapshot(self.yesterday)
+        self.assertEqual(StockSnapshot.objects.filter(date=self.yesterday).count(), 1)
+
+    def test_stock_as_of_con_fotografia_anterior(self):
+        """Debe combinar la fotografía anterior con el delta de movimientos."""
+        product = self.create_old_product(stock=20)
+        StockSnapshot.objects.create(product=product, date=self.three_days_ago, quantity=12)
+        self.create_movement(product, 'input', 10, self.three_days_ago + timedelta(days=1))
+        self.create_movement(product, 'output', 2, self.yesterday)
+
+        result = StockSnapshotService.get_stock_as_of(self.yesterday)
+
+        self.assertEqual(result['snapshot_date'], self.three_days_ago)
+        self.assertEqual(result['stock'][product.id], 20)
+
+    def test_stock_as_of_sin_fotografia(self):
+        """Sin fotografías debe calcular hacia atrás desde el stock actual."""
+        product = self.create_old_product(stock=15)
+        self.create_movement(product, 'output', 3, self.today)
+        self.create_movement(product, 'input', 8, self.today)
+
+        result = StockSnapshotService.get_stock_as_of(self.yesterday)
+
+        self.assertIsNone(result['snapshot_date'])
+        self.assertEqual(result['stock'][product.id], 10)
+
+    def test_stock_as_of_excluye_productos_posteriores(self):
+        """Los productos creados después de la fecha consultada no deben aparecer."""
+        product = self.create_product(stock=5)
+        result = StockSnapshotService.get_stock_as_of(self.yesterday)
+        self.assertNotIn(product.id, result['stock'])
+
+
+# =============================================================================
+# Tests de ReportService
+# =============================================================================
+class TestReportService(ServiceBaseTestCase):
+    """Tests para la depuración de reportes antiguos."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        os.makedirs(os.path.join(self.media_root, 'reports'))
+
+    def create_report(self, name, days_old):
+        """Crea un reporte con su archivo y lo envejece `days_old` días."""
+        with open(os.path.join(self.media_root, 'reports', name), 'wb') as fh:
+            fh.write(b'%PDF')
+        report = Report.objects.create(file=f'reports/{name}', user=self.user)
+        Report.objects.filter(pk=report.pk).update(generated_at=timezone.now() - timedelta(days=days_old))
+        return report
+
+    def test_elimina_reportes_vencidos(self):
+        """Debe eliminar filas y archivos de reportes fuera del período de retención."""
+        old = self.create_report('old.pdf', days_old=40)
+        recent = self.create_report('recent.pdf', days_old=2)
+
+        with self.settings(MEDIA_ROOT=self.media_root):
+            deleted = ReportService.prune_expired(retention_days=30)
+
+        self.assertEqual(deleted, 1)
+        self.assertFalse(Report.objects.filter(pk=old.pk).exists())
+        self.assertTrue(Report.objects.filter(pk=recent.pk).exists())
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, 'reports', 'old.pdf')))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, 'reports', 'recent.pdf')))
+
+
+# =============================================================================
+# Tests de StockReconciliationService
+# =============================================================================
+class TestStockReconciliationService(ServiceBaseTestCase):
+    """Tests para la conciliación de stock contra los movimientos."""
+
+    def create_movement(self, product, movement_type, quantity, stock_before, minutes_ago):
+        """Crea un movimiento con el stock previo indicado (sin modificar el stock)."""
+        return Movement.objects.create(
+            product=product,
+            movement_type=movement_type,
+            quantity=quantity,
+            user=self.user,
+            stock_in_movement=stock_before,
+            date=timezone.now() - timedelta(minutes=minutes_ago),
+        )
+
+    def test_stock_esperado_desde_movimientos(self):
+        """Stock esperado = stock previo al primer movimiento + suma neta."""
+        product = self.create_product(stock=17)
+        self.create_movement(product, 'input', 10, stock_before=5, minutes_ago=30)
+        self.create_movement(product, 'output', 3, stock_before=15, minutes_ago=20)
+        self.create_movement(product, 'input', 5, stock_before=12, minutes_ago=10)
+
+        expected = StockReconciliationService.compute_expected_stock()
+
+        self.assertEqual(expected[product.id], 17)
+        self.assertEqual(StockReconciliationService.find_drift(), [])
+
+    def test_productos_sin_movimientos_se_omiten(self):
+        """Un producto sin historial no puede conciliarse."""
+        product = self.create_product(stock=9)
+        self.assertNotIn(product.id, StockReconciliationService.compute_expected_stock())
+
+    def test_reporta_diferencia_sin_corregir(self):
+        """Una actualización perdida debe reportarse y registrarse sin tocar el stock."""
+        product = self.create_product(stock=12)
+        self.create_movement(product, 'input', 10, stock_before=0, minutes_ago=20)
+        self.create_movement(product, 'input', 5, stock_before=10, minutes_ago=10)
+
+        run = StockReconciliationService.reconcile(repair=False)
+
+        self.assertEqual(run.products_checked, 1)
+        self.assertEqual(run.drift_count, 1)
+        self.assertEqual(run.total_abs_drift, 3)
+        self.assertEqual(run.repaired_count, 0)
+        self.assertEqual(run.details[0]['expected_stock'], 15)
+        self.assertIsNotNone(run.finished_at)
+        product.refresh_from_db()
+        self.assertEqual(product.current_stock, 12)
+
+    def test_corrige_diferencias(self):
+        """Con repair debe dejar current_stock igual al stock esperado."""
+        product = self.create_product(stock=12)
+        ok_product = self.create_product(name='Sin diferencias', stock=4)
+        self.create_movement(product, 'input', 15, stock_before=0, minutes_ago=10)
+        self.create_movement(ok_product, 'output', 1, stock_before=5, minutes_ago=10)
+
+        run = StockReconciliationService.reconcile(repair=True)
+
+        self.assertEqual(run.repaired_count, 1)
+        product.refresh_from_db()
+        ok_product.refresh_from_db()
+        self.assertEqual(product.current_stock, 15)
+        self.assertEqual(ok_product.current_stock, 4)
+
+    def test_comando_reconcile_stock(self):
+        """El comando debe ejecutar la conciliación y mostrar las diferencias."""
+        product = self.create_product(stock=2)
+        self.create_movement(product, 'input', 5, stock_before=0, minutes_ago=10)
+        out = StringIO()
+
+        call_command('reconcile_stock', '--repair', stdout=out)
+
+        self.assertIn(f'Producto {product.id}', out.getvalue())
+        self.assertEqual(StockReconciliation.objects.count(), 1)
+        product.refresh_from_db()
+        self.assertEqual(product.current_stock, 5)
+
+
+# =============================================================================
+# Tests de AuditPartitionService
+# =============================================================================
+class TestAuditPartitionService(ServiceBaseTestCase):
+    """Tests para las particiones mensuales de AuditLog."""
+
+    def test_suma_meses(self):
+        """Debe desplazar meses cruzando años en ambos sentidos."""
+        from datetime import date
+
+        self.assertEqual(AuditPartitionService.add_months(date(2026, 11, 1), 3), date(2027, 2, 1))
+        self.assertEqual(AuditPartitionService.add_months(date(2026, 1, 1), -13), date(2024, 12, 1))
+
+    def test_nombre_de_particion(self):
+        """El nombre debe seguir el formato <tabla>_pYYYYMM."""
+        from datetime import date
+
+        self.assertEqual(
+            AuditPartitionService.partition_name(date(2026, 3, 1)),
+            'inventory_app_auditlog_p202603',
+        )
+
+    def test_sin_postgres_no_hace_nada(self):
+        """Fuera de PostgreSQL no debe crear ni archivar particiones."""
+        self.assertEqual(AuditPartitionService.ensure_partitions(), [])
+        self.assertEqual(AuditPartitionService.archive_expired(), [])
+        out = StringIO()
+        call_command('manage_audit_partitions', '--archive', stdout=out)
+        self.assertIn('PostgreSQL', out.getvalue())
+
+    def test_consultas_acotadas_por_fecha(self):
+        """between()/recent() deben filtrar por timestamp (poda de particiones)."""
+        old = AuditLog.objects.create(user_email='a@test.com', action='update', model_name='Product',
+                                      timestamp=timezone.now() - timedelta(days=90))
+        recent = AuditLog.objects.create(user_email='a@test.com', action='update', model_name='Product')
+
+        self.assertEqual(list(AuditLog.objects.recent(30)), [recent])
+        self.assertEqual(
+            list(AuditLog.objects.between(timezone.now() - timedelta(days=120),
+                                          timezone.now() - timedelta(days=60))),
+            [old],
+        )
+
+
+# =============================================================================
+# Tests de ContactImportService
+# =============================================================================
+class TestContactImportService(ServiceBaseTestCase):
+    """Tests para la importación masiva de clientes y proveedores."""
+
+    HEADER = 'name,email,document_type,document,phone,address\n'
+
+    def import_customers(self, rows, **kwargs):
+        return ContactImportService.import_csv('customers', StringIO(self.HEADER + rows), **kwargs)
+
+    def test_codificacion_invalida_no_crea_ningun_lote(self):
+        """Un byte no UTF-8 después del primer lote se detecta antes de crear registros."""
+        content = (
+            self.HEADER
+            + 'Ana,ana@test.com,cedula,0100000017,0990000001,Quito\n'
+            + 'Luis,luis@test.com,cedula,0100000025,0990000002,\n'
+        ).encode('utf-8') + 'José,jose@test.com,cedula,0100000033,0990000003,Cuenca\n'.encode('latin-1')
+
+        with self.assertRaisesMessage(ValueError, 'UTF-8 (línea 4)'):
+            ContactImportService.import_csv('customers', BytesIO(content), batch_size=1)
+        self.assertFalse(Customer.objects.filter(email__in=['ana@test.com', 'luis@test.com']).exists())
+
+    def test_utf8_en_bloques_y_bom(self):
+        """Los caracteres multibyte partidos entre bloques y el BOM de Excel se aceptan."""
+        content = ('\ufeff' + self.HEADER + 'Ñandú,nandu@test.com,cedula,0100000017,0990000001,Loja\n').encode('utf-8')
+        stream = BytesIO(content)
+        for chunk_size in (1, 2, 3):
+            ContactImportService._check_encoding(stream, chunk_size=chunk_size)
+            self.assertEqual(stream.tell(), 0)
+        result = ContactImportService.import_csv('customers', stream)
+        self.assertEqual(result['created'], 1)
+
+    def test_crea_filas_validas_y_reporta_errores(self):
+        """Las filas válidas se crean y las inválidas se reportan por línea."""
+        result = self.import_customers(
+            'Ana,ana@test.com,cedula,0100000017,0990000001,Quito\n'
+            'Luis,luis@test.com,cedula,0100000018,0990000002,\n'
+            'Eva,no-es-correo,,0100000025,0990000003,\n'
+        )
+
+        self.assertEqual((result['total'], result['created'], result['failed']), (3, 1, 2))
+        self.assertEqual([error['row'] for error in result['errors']], [3, 4])
+        self.assertIn('document', result['errors'][0]['errors'])
+        self.assertIn('email', result['errors'][1]['errors'])
+        self.assertTrue(Customer.objects.filter(document='0100000017', address='Quito').exists())
+
+    def test_unicidad_con_una_consulta_por_campo(self):
+        """Duplicados en la base o en el archivo se rechazan; el lote cuesta 3 consultas IN y 1 INSERT."""
+        rows = (
+            'Ana,ana@test.com,cedula,0100000017,0990000001,\n'
+            'Dup Base,customer@service.com,cedula,0100000025,0990000002,\n'
+            'Dup Archivo,otra@test.com,cedula,0100000017,0990000003,\n'
+            'Eva,eva@test.com,cedula,0100000033,0990000004,\n'
+        )
+        # 3 SELECT IN + 1 INSERT (más SAVEPOINT/RELEASE del atomic dentro del test)
+        with self.assertNumQueries(6):
+            result = self.import_customers(rows)
+
+        self.assertEqual(result['created'], 2)
+        self.assertEqual(result['errors'], [
+            {'row': 3, 'errors': {'email': ['Ya existe un cliente con este correo electrónico.']}},
+            {'row': 4, 'errors': {'document': ['Ya existe un cliente con este documento.']}},
+        ])
+
+    def test_eliminados_logicamente_cuentan_como_duplicados(self):
+        """El índice único incluye los registros eliminados lógicamente."""
+        self.customer.deleted_at = timezone.now()
+        self.customer.save()
+        result = self.import_customers('Otro,nuevo@test.com,cedula,1710034065,0990000001,\n')
+        self.assertEqual(result['created'], 0)
+        self.assertIn('document', result['errors'][0]['errors'])
+
+    def test_dry_run_no_crea_registros(self):
+        """dry_run valida todo pero no inserta."""
+        result = self.import_customers('Ana,ana@test.com,cedula,0100000017,0990000001,\n', dry_run=True)
+        self.assertEqual(result['created'], 1)
+        self.assertFalse(Customer.objects.filter(email='ana@test.com').exists())
+
+    def test_comando_importa_proveedores(self):
+        """import_contacts procesa el archivo por lotes y muestra el resumen."""
+        path = os.path.join(tempfile.mkdtemp(), 'proveedores.csv')
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        with open(path, 'w', encoding='utf-8-sig') as f:
+            f.write('name,email,tax_id,phone\n'
+                    'Prov A,a@prov.com,0100000017001,0990000001\n'
+                    'Prov B,b@prov.com,0100000025001,0990000002\n'
+                    'Prov C,c@prov.com,123,0990000003\n')
+
+        out = StringIO()
+        call_command('import_contacts', 'suppliers', path, '--batch-size', '2', stdout=out)
+
+        self.assertEqual(Supplier.objects.filter(email__endswith='@prov.com').count(), 2)
+        self.assertIn('Creados: 2', out.getvalue())
+        self.assertIn('Línea 4', out.getvalue())
+
+
+# =============================================================================
+# Tests del benchmark de serializers
+# =============================================================================
+class TestBenchmarkSerializersCommand(TestCase):
+    """Tests para el comando benchmark_serializers."""
+
+    def test_mide_y_revierte_los_datos_sinteticos(self):
+        """Debe reportar filas/s por tamaño de página y no dejar filas creadas."""
+        out = StringIO()
+        call_command('benchmark_serializers', '--seed', '30', '--sizes', '5,20', '--repeat', '1', stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('Productos (30 filas disponibles)', output)
+        self.assertIn('Movimientos (30 filas disponibles)', output)
+        self.assertEqual(Product.objects.count(), 0)
+        self.assertFalse(User.objects.filter(email='benchmark@serializers.local').exists())
+
+
+class TestBenchmarkRenderersCommand(TestCase):
+    """Tests para el comando benchmark_renderers."""
+
+    def test_mide_y_verifica_salida_identica(self):
+        """Debe reportar ambos renderers, confirmar la salida idéntica y revertir los datos."""
+        out = StringIO()
+        call_command('benchmark_renderers', '--seed', '30', '--sizes', '5,20', '--repeat', '1', stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('Productos (30 filas disponibles)', output)
+        self.assertIn('Movimientos (30 filas disponibles)', output)
+        self.assertIn('Salida idéntica', output)
+        self.assertEqual(Product.objects.count(), 0)
+
+
+class TestLoadTestCommand(TestCase):
+    """Tests para el comando load_test."""
+
+    def test_reporta_clientes_normales_y_lentos(self):
+        """Contra un servidor HTTP/1.1 local debe reportar ambos grupos sin errores."""
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                body = b'{"ok": true}'
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        out = StringIO()
+        call_command(
+            'load_test', '--url', f'http://127.0.0.1:{server.server_port}', '--concurrency', '4',
+            '--slow-clients', '1', '--slow-delay', '0.1', '--duration', '0.5', stdout=out,
+        )
+
+        output = out.getvalue()
+        self.assertIn('Clientes normales completadas', output)
+        self.assertIn('Clientes lentos (+0.1s) completadas', output)
+        self.assertIn('Status: 200', output)
+        self.assertNotIn('Errores', output)
+
+
+# =============================================================================
+# Tests del tiempo de arranque (-X importtime)
+# =============================================================================
+class TestImportTimeCommand(TestCase):
+    """Tests para el comando import_time y los imports diferidos del worker web."""
+
+    def test_arranque_no_importa_dependencias_pesadas(self):
+        """El worker web no debe cargar reportlab, PIL ni celery.result al arrancar."""
+        out = StringIO()
+        call_command('import_time', '--top', '3', stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('Arranque de inventory.wsgi + URLconf', output)
+        self.assertIn('✅ No se importa reportlab, PIL, celery.result al arrancar', output)
+
+    def test_reporta_la_cadena_de_imports(self):
+        """Un paquete prohibido que se importa al arrancar debe fallar mostrando quién lo importó."""
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('import_time', '--top', '0', '--forbid', 'inventory_app.views.report_view', stdout=out)
+        self.assertIn('❌ inventory_app.views.report_view ← inventory_app.views', out.getvalue())
+
+    def test_parsea_importtime(self):
+        """La profundidad sale de la indentación y la cadena sube hasta el import de primer nivel."""
+        from inventory_app.management.commands.import_time import import_chain, parse_importtime
+
+        rows = parse_importtime(
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:        50 |         50 |     reportlab.lib\n'
+            'import time:        20 |         70 |   reportlab\n'
+            'import time:        10 |         10 |   json\n'
+            'import time:       100 |        180 | inventory_app.tasks\n'
+        )
+
+        self.assertEqual(rows[0], ('reportlab.lib', 2, 50, 50))
+        self.assertEqual(rows[3], ('inventory_app.tasks', 0, 100, 180))
+        self.assertEqual(import_chain(rows, 0), ['reportlab.lib', 'reportlab', 'inventory_app.tasks'])
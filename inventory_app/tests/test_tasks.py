@@ -0,0 +1,418 @@
+# tests/test_tasks.py
+"""
+Tests para tareas de Celery.
+Cubre: exportación por lotes de cotizaciones, eventos de progreso, enrutamiento a colas,
+envío de correos, deduplicación de tareas (single-flight) y procesamiento de imágenes
+de productos.
+"""
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.core import mail
+from django.test import TestCase
+
+from inventory_app.models import Product, Category, Supplier, Customer, User, Quotation, QuotedProduct, Report
+from inventory_app.tasks import (
+    generate_quotation_pdf, render_quotation_pdf, bundle_quotation_pdfs, fail_quotation_pdf_batch,
+    start_quotation_pdf_batch, send_password_reset_email,
+    send_email_batch, process_product_image,
+)
+from inventory_app import signals, tasks
+from inventory_app.tests.helpers import FakeRedis
+from inventory_app.utils import single_flight, task_events
+
+
+class TaskBaseTestCase(TestCase):
+    """Clase base con datos de prueba y MEDIA_ROOT temporal."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='tasks@test.com',
+            password='TestPass1!',
+            name='Task User',
+            role='Administrator',
+            phone='0991234567',
+        )
+        cls.category = Category.objects.create(name='Electrónica')
+        cls.supplier = Supplier.objects.create(
+            name='Proveedor Tasks',
+            email='supplier@tasks.com',
+            document_type='ruc',
+            tax_id='1710034065001',
+            phone='0997654321',
+        )
+        cls.customer = Customer.objects.create(
+            name='Cliente Tasks',
+            email='customer@tasks.com',
+            document_type='cedula',
+            document='1710034065',
+            phone='0993456789',
+        )
+        cls.product = Product.objects.create(
+            name='Producto Tasks',
+            category=cls.category,
+            price=Decimal('10.00'),
+            current_stock=10,
+            minimum_stock=1,
+            status='Disponible',
+            supplier=cls.supplier,
+        )
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = self.settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def create_quotation(self):
+        """Helper para crear una cotización con un producto."""
+        quotation = Quotation.objects.create(
+            customer=self.customer,
+            user=self.user,
+            subtotal=Decimal('20.00'),
+            tax=Decimal('3.00'),
+            total=Decimal('23.00'),
+        )
+        QuotedProduct.objects.create(
+            quotation=quotation,
+            product=self.product,
+            quantity=2,
+            unit_price=Decimal('10.00'),
+        )
+        return quotation
+
+
+# =============================================================================
+# Tests de exportación por lotes
+# =============================================================================
+class TestQuotationBatchTasks(TaskBaseTestCase):
+    """Tests para las tareas del chord de exportación por lotes."""
+
+    def test_render_cotizacion_inexistente_retorna_none(self):
+        """Una cotización inexistente se omite del lote en lugar de fallar."""
+        self.assertIsNone(render_quotation_pdf.run(99999))
+
+    def test_bundle_genera_zip_y_reporte(self):
+        """El callback debe empaquetar los PDFs en un ZIP y registrar un Report."""
+        q1 = self.create_quotation()
+        q2 = self.create_quotation()
+        filenames = [render_quotation_pdf.run(q1.id), render_quotation_pdf.run(q2.id), None]
+
+        result = bundle_quotation_pdfs.run(filenames, self.user.id)
+
+        zip_path = os.path.join(self.media_root, result)
+        with zipfile.ZipFile(zip_path) as archive:
+            self.assertEqual(sorted(archive.namelist()), sorted(os.path.basename(name) for name in filenames[:2]))
+        self.assertTrue(Report.objects.filter(file=result, user=self.user).exists())
+        # Los PDFs individuales se eliminan tras empaquetarlos
+        for name in filenames[:2]:
+            self.assertFalse(os.path.exists(os.path.join(self.media_root, 'reports', name)))
+
+    def test_lote_no_borra_el_pdf_individual_ni_otros_lotes(self):
+        """Cada lote renderiza en su directorio: no pisa ni borra PDFs registrados ni de otro lote."""
+        quotation = self.create_quotation()
+        single = generate_quotation_pdf.run(quotation.id, self.user.id)
+        first = render_quotation_pdf.run(quotation.id, batch_id='lote-a', batch_size=1)
+        second = render_quotation_pdf.run(quotation.id, batch_id='lote-b', batch_size=1)
+
+        bundle_quotation_pdfs.run([first], self.user.id)
+
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, single)))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, 'reports', second)))
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, 'reports', 'batches', 'lote-a')))
+        result = bundle_quotation_pdfs.run([second], self.user.id)
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, result)))
+
+
+    def test_lote_fallido_publica_la_falla_y_borra_sus_pdfs(self):
+        """Si una tarea del lote agota sus reintentos, el errback cierra el stream y limpia el directorio."""
+        quotation = self.create_quotation()
+        rendered = render_quotation_pdf.run(quotation.id, batch_id='lote-a', batch_size=2)
+        other = render_quotation_pdf.run(quotation.id, batch_id='lote-b', batch_size=1)
+
+        with mock.patch('inventory_app.tasks.publish_task_event') as publish:
+            fail_quotation_pdf_batch(mock.Mock(id='lote-a'), RuntimeError('sin memoria'), None)
+
+        publish.assert_called_once_with('lote-a', task_events.STATE_FAILURE, error='sin memoria')
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, 'reports', os.path.dirname(rendered))))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, 'reports', other)))
+
+    def test_chord_con_errback(self):
+        """El callback del chord lleva fail_quotation_pdf_batch como errback."""
+        with mock.patch('celery.chord') as chord, mock.patch('inventory_app.tasks.publish_task_event'):
+            start_quotation_pdf_batch([1, 2], self.user.id)
+
+        callback = chord.return_value.call_args.args[0]
+        self.assertEqual([errback['task'] for errback in callback.options['link_error']],
+                         [fail_quotation_pdf_batch.name])
+
+# =============================================================================
+# Tests de eventos de tareas
+# =============================================================================
+class TestTaskEvents(TestCase):
+    """Tests para la publicación de eventos de progreso."""
+
+    def test_publica_y_guarda_ultimo_evento(self):
+        """Debe guardar el último evento con TTL y publicarlo en el canal de la tarea."""
+        redis_client = mock.Mock()
+        pipe = redis_client.pipeline.return_value
+        with mock.patch('inventory_app.utils.redis_client.get_redis', return_value=redis_client):
+            task_events.publish_task_event('abc', task_events.STATE_PROGRESS, progress=40)
+
+        key, payload = pipe.set.call_args[0]
+        self.assertEqual(key, 'task-events:last:abc')
+        self.assertEqual(json.loads(payload)['progress'], 40)
+        pipe.publish.assert_called_once_with('task-events:abc', payload)
+
+    def test_redis_caido_no_interrumpe_la_tarea(self):
+        """Un error de Redis al publicar no debe propagarse a la tarea."""
+        from redis import ConnectionError as RedisConnectionError
+
+        redis_client = mock.Mock()
+        redis_client.pipeline.return_value.execute.side_effect = RedisConnectionError('down')
+        with mock.patch('inventory_app.utils.redis_client.get_redis', return_value=redis_client):
+            task_events.publish_task_event('abc', task_events.STATE_SUCCESS, result='reports/x.pdf')
+
+
+# =============================================================================
+# Tests de colas y prioridades
+# =============================================================================
+class TestTaskRouting(TestCase):
+    """Tests para el enrutamiento de tareas a colas dedicadas."""
+
+    def test_todas_las_tareas_tienen_cola(self):
+        """Cada tarea de la app debe estar enrutada a una cola declarada."""
+        from celery import Task
+
+        declared = {queue.name for queue in settings.CELERY_TASK_QUEUES}
+        app_tasks = [
+            obj.name for obj in vars(tasks).values()
+            if isinstance(obj, Task) and obj.name.startswith('inventory_app.tasks.')
+        ]
+        self.assertTrue(app_tasks)
+        for name in app_tasks:
+            self.assertIn(name, settings.CELERY_TASK_ROUTES)
+            self.assertIn(settings.CELERY_TASK_ROUTES[name]['queue'], declared)
+
+    def test_pdf_interactivo_separado_de_reportes(self):
+        """El PDF de cotización no debe compartir cola con los reportes masivos."""
+        routes = settings.CELERY_TASK_ROUTES
+        self.assertNotEqual(
+            routes['inventory_app.tasks.generate_quotation_pdf']['queue'],
+            routes['inventory_app.tasks.generate_movements_report_pdf']['queue'],
+        )
+
+    def test_mide_espera_en_cola(self):
+        """Debe registrar el tiempo de espera a partir del header de publicación."""
+        headers = {}
+        signals.stamp_publish_time(headers=headers)
+        self.assertIn(signals.PUBLISHED_AT_HEADER, headers)
+
+        task = mock.Mock()
+        task.name = 'inventory_app.tasks.generate_quotation_pdf'
+        task.request.published_at = headers[signals.PUBLISHED_AT_HEADER] - 2
+        task.request.delivery_info = {'routing_key': 'pdf_interactive'}
+        with self.assertLogs('inventory_app.signals', level='INFO') as logs:
+            signals.log_queue_wait(task=task)
+
+        self.assertIn('queue=pdf_interactive', logs.output[0])
+        record = logs.records[0]
+        self.assertGreaterEqual(record.queue_wait_ms, 2000)
+
+
+# =============================================================================
+# Tests de envío de correos
+# =============================================================================
+class TestEmailTasks(TaskBaseTestCase):
+    """Tests para las tareas de la cola notifications."""
+
+    def test_recuperacion_envia_enlace(self):
+        """Debe enviar el enlace de recuperación al usuario registrado."""
+        self.assertEqual(send_password_reset_email(self.user.email), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.user.email])
+        self.assertIn(f'uid={self.user.pk}', mail.outbox[0].body)
+
+    def test_recuperacion_correo_inexistente(self):
+        """Un correo no registrado no debe enviar nada."""
+        self.assertEqual(send_password_reset_email('noexiste@test.com'), 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_lote_usa_una_conexion(self):
+        """Todo el lote debe enviarse con una sola conexión del backend."""
+        messages = [
+            {'subject': f'Aviso {i}', 'body': 'Contenido', 'to': [f'u{i}@test.com']}
+            for i in range(3)
+        ]
+        with mock.patch('inventory_app.tasks.get_connection', wraps=mail.get_connection) as get_connection:
+            sent = send_email_batch(messages)
+        self.assertEqual(sent, 3)
+        get_connection.assert_called_once()
+        self.assertEqual(len(mail.outbox), 3)
+
+
+# =============================================================================
+# Tests de deduplicación de tareas (single-flight)
+# =============================================================================
+class TestSingleFlight(TestCase):
+    """Tests para la deduplicación de tareas idénticas."""
+
+    def setUp(self):
+        self.redis = FakeRedis()
+        patcher = mock.patch('inventory_app.utils.redis_client.get_redis', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.task = mock.Mock()
+        self.task.name = 'inventory_app.tasks.generate_movements_report_pdf'
+
+    def test_clave_normaliza_parametros(self):
+        """El orden y los parámetros vacíos no deben cambiar la clave."""
+        key_a = single_flight.single_flight_key('t', {'a': 1, 'b': '2', 'c': None})
+        key_b = single_flight.single_flight_key('t', {'b': '2', 'a': 1})
+        self.assertEqual(key_a, key_b)
+        self.assertNotEqual(key_a, single_flight.single_flight_key('t', {'a': 2, 'b': '2'}))
+
+    def test_solicitud_duplicada_se_adjunta(self):
+        """La segunda solicitud idéntica debe recibir el task_id en curso."""
+        first = single_flight.dispatch_single_flight(self.task, {'start_date': '2026-01-01'}, args=[1])
+        second = single_flight.dispatch_single_flight(self.task, {'start_date': '2026-01-01'}, args=[2])
+
+        self.assertEqual(first['status'], single_flight.STATUS_STARTED)
+        self.assertEqual(second['status'], single_flight.STATUS_IN_FLIGHT)
+        self.assertEqual(second['task_id'], first['task_id'])
+        self.task.apply_async.assert_called_once()
+        headers = self.task.apply_async.call_args.kwargs['headers']
+        self.assertIn(single_flight.HEADER_NAME, headers)
+
+    def test_resultado_reciente_se_reutiliza(self):
+        """Tras terminar, las solicitudes idénticas deben reutilizar el resultado."""
+        first = single_flight.dispatch_single_flight(self.task, {'movement_type': 'input'})
+        key = self.task.apply_async.call_args.kwargs['headers'][single_flight.HEADER_NAME]
+        single_flight.release(key, first['task_id'], result='reports/movements.pdf')
+
+        second = single_flight.dispatch_single_flight(self.task, {'movement_type': 'input'})
+
+        self.assertEqual(second['status'], single_flight.STATUS_CACHED)
+        self.assertEqual(second['result'], 'reports/movements.pdf')
+        self.task.apply_async.assert_called_once()
+
+    def test_fallo_libera_lock(self):
+        """Si la tarea falla, la siguiente solicitud debe lanzar una tarea nueva."""
+        first = single_flight.dispatch_single_flight(self.task, {})
+        key = self.task.apply_async.call_args.kwargs['headers'][single_flight.HEADER_NAME]
+        single_flight.release(key, first['task_id'])
+
+        second = single_flight.dispatch_single_flight(self.task, {})
+
+        self.assertEqual(second['status'], single_flight.STATUS_STARTED)
+        self.assertNotEqual(second['task_id'], first['task_id'])
+
+    def test_signal_libera_al_terminar(self):
+        """El signal task_postrun debe guardar el resultado y liberar el lock."""
+        first = single_flight.dispatch_single_flight(self.task, {})
+        key = self.task.apply_async.call_args.kwargs['headers'][single_flight.HEADER_NAME]
+        task = mock.Mock()
+        setattr(task.request, single_flight.HEADER_NAME, key)
+
+        signals.release_single_flight(task=task, task_id=first['task_id'], retval='reports/x.pdf', state='SUCCESS')
+
+        self.assertIsNone(self.redis.get(key))
+        self.assertIsNotNone(self.redis.get(key + single_flight.RESULT_SUFFIX))
+
+    def test_redis_caido_lanza_sin_deduplicar(self):
+        """Sin Redis la tarea debe lanzarse igualmente."""
+        from redis import ConnectionError as RedisConnectionError
+
+        broken = mock.Mock()
+        broken.get.side_effect = RedisConnectionError('down')
+        with mock.patch('inventory_app.utils.redis_client.get_redis', return_value=broken):
+            result = single_flight.dispatch_single_flight(self.task, {})
+
+        self.assertEqual(result['status'], single_flight.STATUS_STARTED)
+        self.assertNotIn(single_flight.HEADER_NAME, self.task.apply_async.call_args.kwargs['headers'])
+
+
+# =============================================================================
+# Tests de procesamiento de imágenes de productos
+# =============================================================================
+class TestProductImageTask(TaskBaseTestCase):
+    """Tests para process_product_image (original + variantes WebP)."""
+
+    def stage(self, content, name='foto.png'):
+        """Helper: archivo en el directorio de staging."""
+        from inventory_app.services.product_image_service import ProductImageService
+
+        staging_dir = ProductImageService.staging_dir()
+        os.makedirs(staging_dir, exist_ok=True)
+        path = os.path.join(staging_dir, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def png(self, width=1200, height=800):
+        from io import BytesIO
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new('RGB', (width, height), 'blue').save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    def test_genera_original_y_variantes_webp(self):
+        """Debe subir el original, crear cada variante WebP y marcar la imagen como lista."""
+        from PIL import Image
+        from inventory_app.constants import ImageConfig
+
+        path = self.stage(self.png())
+        variants = process_product_image.apply(args=[self.product.id, path, 'foto.png']).get()
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.image_status, Product.IMAGE_READY)
+        self.assertTrue(self.product.image.name.startswith('products/'))
+        self.assertEqual(self.product.image_variants, variants)
+        for label, size in ImageConfig.VARIANT_SIZES.items():
+            with Image.open(os.path.join(self.media_root, variants[label])) as variant:
+                self.assertEqual(variant.format, 'WEBP')
+                self.assertEqual(max(variant.size), size)
+        self.assertFalse(os.path.exists(path))
+
+    def test_imagen_corrupta_queda_fallida(self):
+        """Una imagen que no se puede decodificar no se reintenta y se descarta."""
+        path = self.stage(self.png()[:200])
+        result = process_product_image.apply(args=[self.product.id, path, 'foto.png']).get()
+
+        self.assertIsNone(result)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.image_status, Product.IMAGE_FAILED)
+        self.assertFalse(self.product.image)
+        self.assertFalse(os.path.exists(path))
+
+    def test_archivo_ausente_reintenta_sin_marcar_invalida(self):
+        """Sin el archivo en staging (staging no compartido) la tarea reintenta; no es una imagen inválida."""
+        from inventory_app.services.product_image_service import ProductImageService
+
+        Product.all_objects.filter(pk=self.product.id).update(image_status=Product.IMAGE_PROCESSING)
+        path = os.path.join(ProductImageService.staging_dir(), 'no_existe.png')
+
+        with self.assertRaises(FileNotFoundError):
+            ProductImageService.process(self.product.id, path, 'foto.png')
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.image_status, Product.IMAGE_PROCESSING)
+
+        with mock.patch.object(process_product_image, 'retry', side_effect=RuntimeError('retry')) as retry:
+            with self.assertRaises(RuntimeError):
+                process_product_image.apply(args=[self.product.id, path, 'foto.png'], throw=True)
+        self.assertIsInstance(retry.call_args.kwargs['exc'], FileNotFoundError)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.image_status, Product.IMAGE_PROCESSING)
+
+    def test_en_cola_media(self):
+        """La tarea debe estar enrutada a la cola de imágenes."""
+        self.assertEqual(settings.CELERY_TASK_ROUTES['inventory_app.tasks.process_product_image']['queue'], 'media')
@@ -1,11 +1,12 @@
 # tests/test_validators.py
 """
 Tests para validadores del sistema.
-Cubre: cédula ecuatoriana, RUC, pasaporte, contraseña, teléfono, precios y cantidades.
+Cubre: cédula ecuatoriana, RUC, pasaporte, contraseña, teléfono, precios, cantidades e imágenes.
 """
 from django.test import TestCase
 from django.core.exceptions import ValidationError
 from decimal import Decimal
+from io import BytesIO
 
 from inventory_app.validators.ecuadorian_validators import (
     validate_ecuadorian_cedula,
@@ -18,6 +19,17 @@ from inventory_app.validators.business_validators import (
     PriceValidator,
     QuantityValidator,
 )
+from inventory_app.validators.image_validators import read_image_header, validate_image_dimensions
+
+
+def make_image(width, height, image_format='PNG'):
+    """Helper: imagen en memoria con las dimensiones indicadas."""
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), 'red').save(buffer, format=image_format)
+    buffer.seek(0)
+    return buffer
 
 
 # =============================================================================
@@ -293,3 +305,40 @@ class TestQuantityValidator(TestCase):
         """Cantidad 0 debe fallar con validate_min_one."""
         with self.assertRaises(ValidationError):
             QuantityValidator.validate_min_one(0)
+
+
+# =============================================================================
+# Tests de imágenes
+# =============================================================================
+class TestImageDimensionsValidator(TestCase):
+    """Tests para la validación de imágenes por cabecera."""
+
+    def test_imagen_valida(self):
+        """PNG y JPEG dentro de los límites no deben lanzar error."""
+        validate_image_dimensions(make_image(400, 300))
+        validate_image_dimensions(make_image(2000, 2000, 'JPEG'))
+
+    def test_dimensiones_fuera_de_rango(self):
+        """Menos de 300 px o más de 2000 px por lado debe fallar."""
+        with self.assertRaises(ValidationError):
+            validate_image_dimensions(make_image(299, 400))
+        with self.assertRaises(ValidationError):
+            validate_image_dimensions(make_image(2001, 400, 'JPEG'))
+
+    def test_archivo_que_no_es_imagen(self):
+        """Un archivo que no es JPEG/PNG debe fallar."""
+        with self.assertRaises(ValidationError):
+            validate_image_dimensions(BytesIO(b'%PDF-1.4 no es una imagen' * 100))
+        with self.assertRaises(ValidationError):
+            validate_image_dimensions(make_image(400, 400, 'GIF'))
+
+    def test_solo_lee_la_cabecera(self):
+        """Debe leer pocos bytes y conservar la posición del archivo."""
+        image = make_image(1200, 1200, 'JPEG')
+        data = image.getvalue()
+        # Imagen truncada: la cabecera basta para validar (el worker la decodifica)
+        truncated = BytesIO(data[:2048])
+        truncated.seek(10)
+
+        self.assertEqual(read_image_header(truncated), ('JPEG', 1200, 1200))
+        self.assertEqual(truncated.tell(), 10)
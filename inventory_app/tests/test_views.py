@@ -1,14 +1,27 @@
 # tests/test_views.py
 """
 Tests para vistas/API endpoints.
-Cubre: autenticación, CRUD de productos, clientes, proveedores y dashboard.
+Cubre: autenticación (incluida la resolución del usuario JWT en caché y la detección de
+reuso de refresh tokens), CRUD y listados rápidos (values) de productos y movimientos,
+clientes, proveedores (incluida la importación CSV), dashboard, inventario histórico, descarga y generación asíncrona de
+reportes, listado, generación y exportación de cotizaciones, eventos de tareas, métricas,
+rate limiting, el renderer/parser JSON con orjson y las vistas async del perfil ASGI.
 """
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
 from rest_framework.test import APIClient
 from rest_framework import status
+from django.utils import timezone
 from decimal import Decimal
 
-from inventory_app.models import Product, Category, Supplier, Customer, User
+from inventory_app.models import Product, Category, Supplier, Customer, User, Report, Quotation
+from inventory_app.constants import TaskPriority
+from inventory_app.tests.helpers import FakeRedis
 
 
 class APIBaseTestCase(TestCase):
@@ -91,12 +104,336 @@ class TestAuthAPI(TestCase):
         }, format='json')
         self.assertNotEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_recuperacion_encola_correo(self):
+        """Forgot password debe encolar el envío y no enviar el correo en la request."""
+        from django.core import mail
+
+        for email in ('auth@test.com', 'noexiste@test.com'):
+            with mock.patch('inventory_app.views.auth_view.send_password_reset_email') as task:
+                response = self.client.post('/api/forgot-password/', {'email': email}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            task.apply_async.assert_called_once_with(args=[email], priority=TaskPriority.INTERACTIVE)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_recuperacion_broker_caido(self):
+        """Si no se puede encolar, debe responder igual sin revelar nada."""
+        with mock.patch('inventory_app.views.auth_view.send_password_reset_email') as task:
+            task.apply_async.side_effect = ConnectionError('broker down')
+            response = self.client.post('/api/forgot-password/', {'email': 'auth@test.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def test_endpoint_sin_autenticacion(self):
         """Acceder a endpoint protegido sin token debe retornar 401."""
         response = self.client.get('/api/products/')
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+# =============================================================================
+# Tests de autenticación JWT con usuario en caché
+# =============================================================================
+class TestCachedJWTAuthentication(TestCase):
+    """Tests para CachedJWTAuthentication (JWT_USER_RESOLUTION)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='jwt@test.com',
+            password='TestPass1!',
+            name='JWT User',
+            role='Administrator',
+            phone='0992222222',
+        )
+
+    def setUp(self):
+        self.redis = FakeRedis()
+        patcher = mock.patch('inventory_app.utils.redis_client.get_redis', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def login(self):
+        response = APIClient().post('/api/login/', {'email': 'jwt@test.com', 'password': 'TestPass1!'}, format='json')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['tokens']['access']}")
+        return client, response.data['tokens']
+
+    def user_queries(self, client, path='/api/alerts/'):
+        """Consultas a la tabla de usuarios hechas por una request."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(path)
+        return response, [q for q in ctx.captured_queries if 'inventory_app_user' in q['sql']]
+
+    def test_cached_no_consulta_el_usuario_en_cada_request(self):
+        """Solo la primera request debe leer el usuario de la base de datos."""
+        client, _ = self.login()
+        first, first_queries = self.user_queries(client)
+        second, second_queries = self.user_queries(client)
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(first_queries), 1)
+        self.assertEqual(second_queries, [])
+
+    def test_cambio_de_rol_invalida_la_cache(self):
+        """Al guardar el usuario con otro rol, la siguiente request debe verlo."""
+        client, _ = self.login()
+        self.assertEqual(client.get('/api/metrics').status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.role = 'User'
+            self.user.save()
+        self.assertIn(client.get('/api/metrics').status_code,
+                      (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+    def test_soft_delete_masivo_invalida_la_cache(self):
+        """Un update() masivo (soft delete) no dispara post_save pero debe invalidar."""
+        client, _ = self.login()
+        self.assertEqual(client.get('/api/alerts/').status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.user.pk).delete()
+        self.assertEqual(client.get('/api/alerts/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cambio_de_password_con_usuario_proyectado(self):
+        """El usuario cacheado carga la contraseña al usarla y save() no pisa otros campos."""
+        client, _ = self.login()
+        client.get('/api/alerts/')
+        response = client.post('/api/change-password/', {
+            'old_password': 'TestPass1!', 'new_password': 'OtraClave9$',
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('OtraClave9$'))
+        self.assertEqual(self.user.phone, '0992222222')
+
+    @override_settings(JWT_USER_RESOLUTION='stateless')
+    def test_stateless_cambio_de_password_no_restaura_rol_ni_estado(self):
+        """Los claims viejos del token no deben volver a escribirse en la base al guardar."""
+        client, _ = self.login()
+        User.objects.filter(pk=self.user.pk).update(role='User', is_active=False)
+
+        response = client.post('/api/change-password/', {
+            'old_password': 'TestPass1!', 'new_password': 'OtraClave9$',
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('OtraClave9$'))
+        self.assertEqual(self.user.role, 'User')
+        self.assertFalse(self.user.is_active)
+
+    @override_settings(JWT_USER_RESOLUTION='stateless')
+    def test_stateless_save_solo_escribe_campos_modificados(self):
+        """Un save() sin update_fields sobre el usuario proyectado omite los claims sin cambios."""
+        from inventory_app.authentication import build_user
+
+        User.objects.filter(pk=self.user.pk).update(role='User', is_active=False)
+        user = build_user({'id': self.user.pk, 'email': 'jwt@test.com', 'role': 'Administrator',
+                           'name': 'JWT User', 'is_active': True})
+        user.name = 'Nombre Nuevo'
+        user.save()
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, 'Nombre Nuevo')
+        self.assertEqual(self.user.role, 'User')
+        self.assertFalse(self.user.is_active)
+
+    @override_settings(JWT_USER_RESOLUTION='stateless')
+    def test_stateless_no_permite_inactivarse_a_si_mismo(self):
+        """request.user.id es el entero de la base aunque el claim llegue como texto."""
+        for email, phone in (('super@test.com', '0992222223'), ('super2@test.com', '0992222224')):
+            superadmin = User.objects.create_user(email=email, password='TestPass1!', name='Super',
+                                                  role='SuperAdmin', phone=phone)
+        response = APIClient().post('/api/login/', {'email': 'super2@test.com', 'password': 'TestPass1!'}, format='json')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['tokens']['access']}")
+
+        response = client.patch(f'/api/users/{superadmin.pk}/', {'is_active': False}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(str(response.data['detail']), 'No puedes inactivarte a ti mismo.')
+        superadmin.refresh_from_db()
+        self.assertTrue(superadmin.is_active)
+
+    @override_settings(JWT_USER_RESOLUTION='stateless')
+    def test_stateless_usa_los_claims_del_token(self):
+        """En modo stateless el rol sale del token sin consultar la base ni Redis."""
+        client, tokens = self.login()
+        response, queries = self.user_queries(client)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, [])
+        self.assertNotIn(f'auth:user:{self.user.pk}', self.redis.data)
+
+        # El refresh vuelve a firmar el rol actual
+        User.objects.filter(pk=self.user.pk).update(role='User')
+        refreshed = APIClient().post('/api/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        from rest_framework_simplejwt.tokens import AccessToken
+        self.assertEqual(AccessToken(refreshed.data['access'])['role'], 'User')
+
+
+# =============================================================================
+# Tests de familias de refresh tokens
+# =============================================================================
+class TestRefreshTokenFamilies(TestCase):
+    """Tests para la rotación de refresh tokens con detección de reuso."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='rt@test.com',
+            password='TestPass1!',
+            name='RT User',
+            role='User',
+            phone='0993333333',
+        )
+
+    def setUp(self):
+        self.redis = FakeRedis()
+        patcher = mock.patch('inventory_app.utils.redis_client.get_redis', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def login(self):
+        response = APIClient().post('/api/login/', {'email': 'rt@test.com', 'password': 'TestPass1!'}, format='json')
+        return response.data['tokens']['refresh']
+
+    def refresh(self, token):
+        return APIClient().post('/api/token/refresh/', {'refresh': token}, format='json')
+
+    def test_rotacion_encadenada(self):
+        """Cada refresh devuelve un token nuevo que sirve para el siguiente."""
+        first = self.refresh(self.login())
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        second = self.refresh(first.data['refresh'])
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+
+    def test_reuso_revoca_la_familia(self):
+        """Reutilizar un token ya rotado invalida también el último emitido."""
+        original = self.login()
+        rotated = self.refresh(original).data['refresh']
+
+        self.assertEqual(self.refresh(original).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.refresh(rotated).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cambio_de_password_revoca_las_sesiones(self):
+        """Tras cambiar la contraseña, los refresh tokens previos no rotan."""
+        token = self.login()
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post('/api/change-password/', {
+            'old_password': 'TestPass1!', 'new_password': 'OtraClave9$',
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.refresh(token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_revoca_solo_esa_sesion(self):
+        """El logout invalida su familia sin afectar otras sesiones del usuario."""
+        session, other = self.login(), self.login()
+        response = APIClient().post('/api/logout/', {'refresh': session}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.refresh(session).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.refresh(other).status_code, status.HTTP_200_OK)
+
+    def test_redis_caido_permite_el_refresh(self):
+        """Sin Redis el refresh sigue funcionando (sin detección de reuso)."""
+        from redis import RedisError
+
+        token = self.login()
+        with mock.patch.object(self.redis, 'set', side_effect=RedisError('down')):
+            response = self.refresh(token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_login_con_redis_caido_no_cierra_la_sesion(self):
+        """Un token cuya familia no se registró rota como uno anterior al registro e inicia la familia."""
+        from redis import RedisError
+        from rest_framework_simplejwt.tokens import RefreshToken
+        from inventory_app.utils import refresh_token_store
+
+        with mock.patch.object(self.redis, 'pipeline', side_effect=RedisError('down')):
+            token = self.login()
+        self.assertNotIn(refresh_token_store.FAMILY_CLAIM, RefreshToken(token))
+
+        response = self.refresh(token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rotated = response.data['refresh']
+        self.assertIn(refresh_token_store.FAMILY_CLAIM, RefreshToken(rotated))
+        self.assertEqual(self.refresh(rotated).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.refresh(rotated).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+# =============================================================================
+# Tests de rate limiting compartido
+# =============================================================================
+class TestSharedRateLimiting(APIBaseTestCase):
+    """Tests para el motor GCRA de throttling (utils/rate_limiter.py)."""
+
+    def setUp(self):
+        super().setUp()
+        from inventory_app.utils.rate_limiter import RateLimiter
+
+        self.redis = FakeRedis()
+        patcher = mock.patch('inventory_app.utils.redis_client.get_redis', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.limiter = RateLimiter()
+        patcher = mock.patch('inventory_app.throttles.limiter', self.limiter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_limite_compartido_entre_procesos(self):
+        """Dos workers (dos RateLimiter) deben compartir el mismo contador."""
+        from inventory_app.utils.rate_limiter import RateLimiter
+
+        other_worker = RateLimiter()
+        results = [
+            limiter.check([('throttle_burst_1', 3, 60)])[0]
+            for limiter in (self.limiter, other_worker, self.limiter, other_worker)
+        ]
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_scope_excedido_no_consume_los_demas(self):
+        """Si un scope rechaza la request, los otros scopes no se consumen."""
+        allowed, _ = self.limiter.check([('a', 1, 60), ('b', 3, 60)])
+        self.assertTrue(allowed)
+        allowed, waits = self.limiter.check([('a', 1, 60), ('b', 3, 60)])
+        self.assertFalse(allowed)
+        self.assertGreater(waits[0], 59)
+        self.assertEqual(waits[1], 0)
+        # 'b' conserva sus dos requests restantes
+        self.assertTrue(self.limiter.check([('b', 3, 60)])[0])
+        self.assertTrue(self.limiter.check([('b', 3, 60)])[0])
+        self.assertFalse(self.limiter.check([('b', 3, 60)])[0])
+
+    def test_redis_caido_usa_memoria_local(self):
+        """Sin Redis debe limitar en memoria y no reintentar Redis en cada request."""
+        from redis import ConnectionError as RedisConnectionError
+
+        self.redis.register_script = mock.Mock(side_effect=RedisConnectionError('down'))
+        with self.assertLogs('inventory_app.utils.rate_limiter', level='WARNING'):
+            results = [self.limiter.check([('k', 2, 60)])[0] for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(self.redis.register_script.call_count, 1)
+
+    def test_api_evalua_todos_los_scopes_en_una_llamada(self):
+        """Burst y sustained se evalúan juntos, y al exceder se responde 429 con Retry-After."""
+        from rest_framework.throttling import SimpleRateThrottle
+
+        with mock.patch.dict(SimpleRateThrottle.THROTTLE_RATES, {'burst': '2/min'}), \
+                mock.patch.object(self.limiter, 'check', wraps=self.limiter.check) as check:
+            responses = [self.client.get('/api/alerts/') for _ in range(3)]
+
+        self.assertEqual([r.status_code for r in responses], [200, 200, 429])
+        self.assertGreaterEqual(int(responses[2]['Retry-After']), 1)
+        self.assertEqual(check.call_count, 3)
+        scopes = sorted(key.split('_')[1] for key, _, _ in check.call_args[0][0])
+        self.assertEqual(scopes, ['burst', 'sustained'])
+
+
 # =============================================================================
 # Tests de Products API
 # =============================================================================
@@ -117,12 +454,168 @@ class TestProductsAPI(APIBaseTestCase):
         response = self.client.get('/api/products/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_crear_producto_con_imagen_la_procesa_en_el_worker(self):
+        """La request solo guarda la imagen en staging y encola su procesamiento."""
+        from io import BytesIO
+        from PIL import Image
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        buffer = BytesIO()
+        Image.new('RGB', (400, 400), 'green').save(buffer, format='PNG')
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+
+        with self.settings(MEDIA_ROOT=media_root), \
+                mock.patch('inventory_app.tasks.process_product_image.apply_async') as apply_async, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/products/', {
+                'name': 'Con imagen', 'category': self.category.id, 'supplier': self.supplier.id,
+                'price': '5.00', 'minimum_stock': 1, 'status': 'Disponible',
+                'image': SimpleUploadedFile('foto.png', buffer.getvalue(), content_type='image/png'),
+            }, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['image_status'], Product.IMAGE_PROCESSING)
+        self.assertEqual(response.data['image_variants'], {'thumb': None, 'medium': None})
+        product_id, staged_path, original_name = apply_async.call_args.kwargs['args']
+        self.assertEqual(product_id, response.data['id'])
+        self.assertTrue(os.path.exists(staged_path))
+        self.assertFalse(Product.objects.get(pk=product_id).image)
+
+    def test_sin_staging_compartido_procesa_en_la_request(self):
+        """Con PRODUCT_IMAGE_ASYNC=False la imagen se procesa al confirmar, sin encolar."""
+        from io import BytesIO
+        from PIL import Image
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        buffer = BytesIO()
+        Image.new('RGB', (400, 400), 'green').save(buffer, format='PNG')
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+
+        with self.settings(MEDIA_ROOT=media_root, PRODUCT_IMAGE_ASYNC=False), \
+                mock.patch('inventory_app.tasks.process_product_image.apply_async') as apply_async, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/products/', {
+                'name': 'Con imagen', 'category': self.category.id, 'supplier': self.supplier.id,
+                'price': '5.00', 'minimum_stock': 1, 'status': 'Disponible',
+                'image': SimpleUploadedFile('foto.png', buffer.getvalue(), content_type='image/png'),
+            }, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        apply_async.assert_not_called()
+        product = Product.objects.get(pk=response.data['id'])
+        self.assertEqual(product.image_status, Product.IMAGE_READY)
+        self.assertEqual(set(product.image_variants), {'thumb', 'medium'})
+
+    def test_imagen_invalida_rechazada(self):
+        """Un archivo que no es imagen se rechaza leyendo solo su cabecera."""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        response = self.client.post('/api/products/', {
+            'name': 'Sin imagen', 'category': self.category.id, 'supplier': self.supplier.id,
+            'price': '5.00', 'minimum_stock': 1, 'status': 'Disponible',
+            'image': SimpleUploadedFile('foto.png', b'no es una imagen', content_type='image/png'),
+        }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('image', response.data)
+
+    def test_variantes_en_el_listado(self):
+        """El listado expone la URL de cada variante."""
+        product = Product.objects.create(
+            name='Con variantes', category=self.category, price=Decimal('1.00'), minimum_stock=1,
+            status='Disponible', supplier=self.supplier, image='products/foto.png',
+            image_variants={'thumb': 'products/variants/1_thumb.webp'}, image_status=Product.IMAGE_READY,
+        )
+        with mock.patch('django.core.files.storage.FileSystemStorage.url',
+                        side_effect=lambda name: f'https://cdn.test/{name}'):
+            response = self.client.get(f'/api/products/{product.id}/')
+
+        self.assertEqual(response.data['image_url'], 'https://cdn.test/products/foto.png')
+        self.assertEqual(response.data['image_variants'], {
+            'thumb': 'https://cdn.test/products/variants/1_thumb.webp',
+            'medium': 'https://cdn.test/products/foto.png',
+        })
+
     def test_listar_productos_vacio(self):
         """GET /api/products/ sin productos debe retornar lista vacía."""
         response = self.client.get('/api/products/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
 
+# =============================================================================
+# Tests de listados con ValuesSerializer
+# =============================================================================
+class TestValuesListSerializers(APIBaseTestCase):
+    """Los listados por values_list() deben producir lo mismo que los ModelSerializer."""
+
+    def setUp(self):
+        super().setUp()
+        from inventory_app.constants import MovementType
+        from inventory_app.models import Movement
+
+        self.products = [
+            Product.objects.create(
+                name=f'Producto {status_value}', category=self.category, price=Decimal('12.50'),
+                current_stock=8, minimum_stock=2, status=status_value, supplier=self.supplier,
+                description='Desc' if status_value == 'Disponible' else None,
+            )
+            for status_value in ('Disponible', 'AGOTADO', 'inactive', '')
+        ]
+        self.products[0].image = 'products/foto.png'
+        self.products[0].image_variants = {'thumb': 'products/variants/1_thumb.webp'}
+        self.products[0].save()
+        for movement_type, customer in ((MovementType.INPUT, None), (MovementType.OUTPUT, self.customer)):
+            Movement.objects.create(
+                movement_type=movement_type, date=timezone.now(), quantity=3, product=self.products[0],
+                user=self.user, customer=customer, stock_in_movement=10,
+            )
+
+    def assert_same_output(self, view_class, values_serializer):
+        view = view_class()
+        queryset = view.get_queryset()
+        expected = view_class.serializer_class(queryset, many=True).data
+        actual = values_serializer(values_serializer.project(queryset), many=True).data
+        self.assertEqual([dict(row) for row in expected], actual)
+
+    def test_productos_equivalentes(self):
+        """is_active en SQL, precio como string y URLs de imagen iguales al serializer."""
+        from inventory_app.serializers.product_serializer import ProductValuesSerializer
+        from inventory_app.views.product_view import ProductListCreateView
+
+        with mock.patch('django.core.files.storage.FileSystemStorage.url',
+                        side_effect=lambda name: f'https://cdn.test/{name}'):
+            self.assert_same_output(ProductListCreateView, ProductValuesSerializer)
+
+    def test_movimientos_equivalentes(self):
+        """stock_after_movement en SQL, fechas y cliente vacío iguales al serializer."""
+        from inventory_app.serializers.movement_serializer import MovementValuesSerializer
+        from inventory_app.views.movement_view import MovementListCreateView
+
+        self.assert_same_output(MovementListCreateView, MovementValuesSerializer)
+
+    def test_listado_en_una_consulta(self):
+        """GET /api/movements/ cuesta COUNT + una sola consulta sin importar las filas."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/movements/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+        movement_queries = [q for q in ctx.captured_queries if 'inventory_app_movement' in q['sql']]
+        self.assertEqual(len(movement_queries), 2)
+
+    @override_settings(FAST_LIST_SERIALIZERS=False)
+    def test_desactivable(self):
+        """Con FAST_LIST_SERIALIZERS=False el listado usa el serializer del modelo."""
+        with mock.patch('inventory_app.serializers.product_serializer.ProductValuesSerializer.to_representation') as fast:
+            response = self.client.get('/api/products/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 4)
+        fast.assert_not_called()
+
+
 # =============================================================================
 # Tests de Customers API
 # =============================================================================
@@ -162,6 +655,65 @@ class TestSuppliersAPI(APIBaseTestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
 
+# =============================================================================
+# Tests de importación CSV de clientes y proveedores
+# =============================================================================
+class TestContactImportAPI(APIBaseTestCase):
+    """Tests para POST /api/customers/import/ y /api/suppliers/import/."""
+
+    def upload(self, path, content, query=''):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        csv_file = SimpleUploadedFile('contactos.csv', content.encode('utf-8'), content_type='text/csv')
+        return self.client.post(f'{path}{query}', {'file': csv_file}, format='multipart')
+
+    def test_importa_clientes(self):
+        """Retorna 201 con el resumen y los errores por fila."""
+        response = self.upload('/api/customers/import/', (
+            'name,email,document,phone\n'
+            'Ana,ana@test.com,0100000017,0990000001\n'
+            'Dup,customer@api.com,0100000025,0990000002\n'
+        ))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'][0]['row'], 3)
+
+    def test_codificacion_invalida(self):
+        """Un archivo que no es UTF-8 retorna 400 con la línea, sin crear registros."""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        content = ('name,email,document,phone\n'
+                   'Ana,ana@test.com,0100000017,0990000001\n'
+                   'José,jose@test.com,0100000025,0990000002\n').encode('latin-1')
+        response = self.client.post('/api/customers/import/', {
+            'file': SimpleUploadedFile('contactos.csv', content, content_type='text/csv'),
+        }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['message'], 'El archivo debe estar codificado en UTF-8 (línea 3).')
+        self.assertFalse(Customer.objects.filter(email='ana@test.com').exists())
+
+    def test_dry_run_de_proveedores(self):
+        """Con ?dry_run=true solo valida."""
+        response = self.upload('/api/suppliers/import/', (
+            'name,email,tax_id,phone\n'
+            'Prov,prov@test.com,0100000017001,0990000001\n'
+        ), query='?dry_run=true')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['dry_run'])
+        self.assertFalse(Supplier.objects.filter(email='prov@test.com').exists())
+
+    def test_requiere_archivo_y_rol_admin(self):
+        """Sin archivo retorna 400; un usuario sin rol admin recibe 403."""
+        self.assertEqual(self.client.post('/api/customers/import/', {}, format='multipart').status_code,
+                         status.HTTP_400_BAD_REQUEST)
+
+        seller = User.objects.create_user(email='seller@test.com', password='TestPass1!', name='Seller',
+                                          role='User', phone='0990000009')
+        self.client.force_authenticate(user=seller)
+        response = self.upload('/api/customers/import/', 'name,email,document,phone\n')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
 # =============================================================================
 # Tests de Dashboard API
 # =============================================================================
@@ -211,3 +763,637 @@ class TestAlertsAPI(APIBaseTestCase):
         """GET /api/alerts/ debe retornar lista de alertas."""
         response = self.client.get('/api/alerts/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(QUERY_INSPECTOR_ENABLED=True, QUERY_INSPECTOR_RAISE=True)
+    def test_listar_alertas_sin_n_mas_uno(self):
+        """El nombre del producto de cada alerta no debe generar una consulta por alerta."""
+        from inventory_app.models import Alert
+
+        for index in range(6):
+            product = Product.objects.create(
+                name=f'Producto {index}', category=self.category, price=Decimal('1.00'),
+                current_stock=10, minimum_stock=5, status='Disponible', supplier=self.supplier,
+            )
+            Alert.objects.create(type='low_stock', message='Stock bajo', product=product)
+
+        response = self.client.get('/api/alerts/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 6)
+
+
+# =============================================================================
+# Tests de Inventario histórico API
+# =============================================================================
+class TestInventoryAsOfAPI(APIBaseTestCase):
+    """Tests para el endpoint de stock a una fecha."""
+
+    def test_stock_as_of(self):
+        """GET /api/inventory/as-of/?date= debe retornar el stock por producto."""
+        product = Product.objects.create(
+            name='Producto Histórico',
+            category=self.category,
+            price=Decimal('10.00'),
+            current_stock=7,
+            minimum_stock=1,
+            status='Disponible',
+            supplier=self.supplier,
+        )
+        today = timezone.localdate().isoformat()
+        response = self.client.get(f'/api/inventory/as-of/?date={today}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['product'], product.id)
+        self.assertEqual(response.data['results'][0]['stock'], 7)
+
+    def test_stock_as_of_fecha_invalida(self):
+        """Una fecha con formato inválido debe retornar 400."""
+        response = self.client.get('/api/inventory/as-of/?date=31-12-2025')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+# =============================================================================
+# Tests de descarga de reportes
+# =============================================================================
+class TestReportDownloadAPI(APIBaseTestCase):
+    """Tests para la descarga de reportes PDF."""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        os.makedirs(os.path.join(self.media_root, 'reports'))
+        with open(os.path.join(self.media_root, 'reports', 'test.pdf'), 'wb') as fh:
+            fh.write(b'0123456789')
+        self.report = Report.objects.create(file='reports/test.pdf', user=self.user)
+        self.url = f'/api/reports/download/{self.report.id}/'
+
+    def test_descarga_completa(self):
+        """Sin Range debe retornar el archivo completo."""
+        with self.settings(MEDIA_ROOT=self.media_root):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+    def test_descarga_parcial(self):
+        """Con Range debe retornar 206 y solo los bytes solicitados."""
+        with self.settings(MEDIA_ROOT=self.media_root):
+            response = self.client.get(self.url, HTTP_RANGE='bytes=2-5')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b''.join(response.streaming_content), b'2345')
+        self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+
+    def test_descarga_condicional(self):
+        """Con If-None-Match igual al ETag debe retornar 304."""
+        with self.settings(MEDIA_ROOT=self.media_root):
+            etag = self.client.get(self.url)['ETag']
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_descarga_delegada_a_nginx(self):
+        """En modo nginx debe responder con X-Accel-Redirect sin cuerpo."""
+        with self.settings(MEDIA_ROOT=self.media_root, PROTECTED_FILE_SERVING='nginx'):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/reports/test.pdf')
+        self.assertEqual(response.content, b'')
+
+    def test_descarga_archivo_inexistente(self):
+        """Si el archivo no existe en disco debe retornar 404."""
+        os.remove(os.path.join(self.media_root, 'reports', 'test.pdf'))
+        with self.settings(MEDIA_ROOT=self.media_root):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+# =============================================================================
+# Tests de listado de cotizaciones
+# =============================================================================
+class TestQuotationListAPI(APIBaseTestCase):
+    """Tests para GET /api/quotations/."""
+
+    @override_settings(QUERY_INSPECTOR_ENABLED=True, QUERY_INSPECTOR_RAISE=True)
+    def test_listar_sin_n_mas_uno(self):
+        """Los productos cotizados anidados deben cargarse con una sola consulta."""
+        from inventory_app.models import QuotedProduct
+
+        product = Product.objects.create(
+            name='Producto cotizado', category=self.category, price=Decimal('5.00'),
+            current_stock=10, minimum_stock=5, status='Disponible', supplier=self.supplier,
+        )
+        for _ in range(6):
+            quotation = Quotation.objects.create(
+                customer=self.customer, user=self.user,
+                subtotal=Decimal('10.00'), tax=Decimal('1.50'), total=Decimal('11.50'),
+            )
+            QuotedProduct.objects.create(
+                quotation=quotation, product=product, quantity=2, unit_price=Decimal('5.00'),
+            )
+
+        response = self.client.get('/api/quotations/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 6)
+        self.assertEqual(len(response.data['results'][0]['quoted_products']), 1)
+
+
+# =============================================================================
+# Tests de generación de PDF de cotización
+# =============================================================================
+class TestQuotationPDFAPI(APIBaseTestCase):
+    """Tests para POST /api/quotations/pdf/<id>/."""
+
+    def test_pdf_se_encola_con_prioridad_interactiva(self):
+        """Debe lanzar la tarea con la prioridad más alta y retornar su task_id."""
+        quotation = Quotation.objects.create(
+            customer=self.customer,
+            user=self.user,
+            subtotal=Decimal('10.00'),
+            tax=Decimal('1.50'),
+            total=Decimal('11.50'),
+        )
+        with mock.patch('inventory_app.views.quotation_view.generate_quotation_pdf') as task:
+            task.apply_async.return_value = mock.Mock(id='pdf-task-id')
+            response = self.client.post(f'/api/quotations/pdf/{quotation.id}/')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['task_id'], 'pdf-task-id')
+        task.apply_async.assert_called_once_with(
+            args=[quotation.id, self.user.id], priority=TaskPriority.INTERACTIVE
+        )
+
+    def test_pdf_cotizacion_inexistente(self):
+        """Una cotización inexistente debe retornar 404 sin encolar nada."""
+        with mock.patch('inventory_app.views.quotation_view.generate_quotation_pdf') as task:
+            response = self.client.post('/api/quotations/pdf/99999/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        task.apply_async.assert_not_called()
+
+
+# =============================================================================
+# Tests de generación asíncrona de reportes
+# =============================================================================
+class TestReportGenerateAsyncAPI(APIBaseTestCase):
+    """Tests para POST /api/reports/generate/async/."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch('inventory_app.utils.redis_client.get_redis', return_value=FakeRedis())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_solicitudes_identicas_comparten_tarea(self):
+        """Un doble clic con los mismos filtros debe lanzar una sola tarea."""
+        payload = {'start_date': '2026-01-01', 'end_date': '2026-01-31'}
+        with mock.patch('inventory_app.views.report_view.generate_movements_report_pdf') as task:
+            task.name = 'inventory_app.tasks.generate_movements_report_pdf'
+            first = self.client.post('/api/reports/generate/async/', payload, format='json')
+            second = self.client.post('/api/reports/generate/async/', payload, format='json')
+
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(second.data['status'], 'in_flight')
+        self.assertEqual(second.data['task_id'], first.data['task_id'])
+        task.apply_async.assert_called_once()
+        filters = task.apply_async.call_args.kwargs['args'][1]
+        self.assertEqual(filters, {'start_date': '2026-01-01T00:00:00', 'end_date': '2026-01-31T23:59:59'})
+
+    def test_fechas_invalidas(self):
+        """Fechas con formato inválido deben retornar 400."""
+        response = self.client.post('/api/reports/generate/async/', {'start_date': '01/01/2026'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+# =============================================================================
+# Tests de exportación por lotes de cotizaciones
+# =============================================================================
+class TestQuotationPDFBatchAPI(APIBaseTestCase):
+    """Tests para POST /api/quotations/pdf/batch/."""
+
+    def create_quotation(self, user=None):
+        return Quotation.objects.create(
+            customer=self.customer,
+            user=user or self.user,
+            subtotal=Decimal('10.00'),
+            tax=Decimal('1.50'),
+            total=Decimal('11.50'),
+        )
+
+    def test_lote_inicia_tarea(self):
+        """Debe lanzar una única tarea y retornar su task_id."""
+        q1 = self.create_quotation()
+        q2 = self.create_quotation()
+        with mock.patch('inventory_app.views.quotation_view.start_quotation_pdf_batch') as start:
+            start.return_value = mock.Mock(id='batch-task-id')
+            response = self.client.post('/api/quotations/pdf/batch/', {
+                'quotation_ids': [q1.id, q2.id, q1.id],
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['task_id'], 'batch-task-id')
+        start.assert_called_once_with([q1.id, q2.id], self.user.id)
+
+    def test_lote_vacio_falla(self):
+        """Una lista vacía debe retornar 400."""
+        response = self.client.post('/api/quotations/pdf/batch/', {'quotation_ids': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_lote_cotizacion_inexistente(self):
+        """Si alguna cotización no existe debe retornar 404 con los IDs faltantes."""
+        q1 = self.create_quotation()
+        response = self.client.post('/api/quotations/pdf/batch/', {
+            'quotation_ids': [q1.id, 99999],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['quotation_ids'], [99999])
+
+
+# =============================================================================
+# Tests de eventos de tareas (SSE)
+# =============================================================================
+class TestTaskEventsAPI(APIBaseTestCase):
+    """Tests para GET /api/tasks/<task_id>/events/ y su token de stream."""
+
+    def read_stream(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_stream_evento_final(self):
+        """Si la tarea ya terminó debe emitir el último evento y cerrar el stream."""
+        redis_client = mock.Mock()
+        redis_client.get.return_value = json.dumps({
+            'task_id': 'abc', 'state': 'SUCCESS', 'progress': 100, 'result': 'reports/x.pdf',
+        })
+        with mock.patch('inventory_app.utils.redis_client.get_redis', return_value=redis_client):
+            response = self.client.get('/api/tasks/abc/events/', HTTP_ACCEPT='text/event-stream')
+            body = self.read_stream(response)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertIn('"state": "SUCCESS"', body)
+        redis_client.pubsub.return_value.subscribe.assert_called_once_with('task-events:abc')
+
+    def test_stream_redis_no_disponible(self):
+        """Sin Redis debe emitir `unavailable` para que el cliente use polling."""
+        from redis import ConnectionError as RedisConnectionError
+
+        redis_client = mock.Mock()
+        redis_client.pubsub.side_effect = RedisConnectionError('down')
+        with mock.patch('inventory_app.utils.redis_client.get_redis', return_value=redis_client):
+            response = self.client.get('/api/tasks/abc/events/')
+            body = self.read_stream(response)
+
+        self.assertIn('event: unavailable', body)
+
+    def test_stream_sin_autenticacion(self):
+        """Sin autenticación debe retornar 401."""
+        response = APIClient().get('/api/tasks/abc/events/', HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def final_event_redis(self):
+        redis_client = mock.Mock()
+        redis_client.get.return_value = json.dumps({'task_id': 'abc', 'state': 'SUCCESS', 'progress': 100})
+        # Rate limiting (script GCRA): todos los límites permitidos
+        redis_client.register_script.return_value.side_effect = lambda keys, args: [0] + [0] * len(keys)
+        return mock.patch('inventory_app.utils.redis_client.get_redis', return_value=redis_client)
+
+    def test_stream_con_token_en_query_string(self):
+        """EventSource no envía cabeceras: el token firmado de la tarea autentica el stream."""
+        response = self.client.post('/api/tasks/abc/events/token/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['events_url'], f"/api/tasks/abc/events/?token={response.data['token']}")
+
+        with self.final_event_redis():
+            stream = APIClient().get(response.data['events_url'], HTTP_ACCEPT='text/event-stream')
+            body = self.read_stream(stream)
+        self.assertEqual(stream.status_code, status.HTTP_200_OK)
+        self.assertIn('"state": "SUCCESS"', body)
+
+    def test_token_de_otra_tarea_o_expirado(self):
+        """El token solo vale para su tarea y durante TASK_EVENTS_TOKEN_MAX_AGE."""
+        import time
+        from inventory_app.utils import task_events
+
+        token = task_events.make_stream_token('otra', self.user.pk)
+        response = APIClient().get(f'/api/tasks/abc/events/?token={token}', HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with mock.patch('django.core.signing.time.time', return_value=time.time() - 301):
+            token = task_events.make_stream_token('abc', self.user.pk)
+        response = APIClient().get(f'/api/tasks/abc/events/?token={token}', HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_requiere_autenticacion(self):
+        response = APIClient().post('/api/tasks/abc/events/token/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(TASK_EVENTS_MAX_STREAMS=1)
+    def test_limite_de_streams_por_proceso(self):
+        """Con WSGI, superado el límite de streams responde 503; el cupo se libera al cerrar el stream."""
+        with self.final_event_redis():
+            first = self.client.get('/api/tasks/abc/events/', HTTP_ACCEPT='text/event-stream')
+            rejected = self.client.get('/api/tasks/abc/events/', HTTP_ACCEPT='text/event-stream')
+            self.assertEqual(rejected.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+            self.assertIn('Retry-After', rejected)
+
+            self.read_stream(first)  # Al consumir el stream, Django cierra la respuesta
+            second = self.client.get('/api/tasks/abc/events/', HTTP_ACCEPT='text/event-stream')
+            self.assertEqual(second.status_code, status.HTTP_200_OK)
+            self.read_stream(second)
+
+
+# =============================================================================
+# Tests del endpoint de métricas
+# =============================================================================
+@override_settings(METRICS_TOKEN='scrape-token')
+class TestMetricsAPI(APIBaseTestCase):
+    """Tests para GET /api/metrics."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch('inventory_app.utils.redis_client.get_redis', return_value=FakeRedis())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_admin_obtiene_metricas(self):
+        """Un administrador debe recibir el formato de texto de Prometheus."""
+        response = self.client.get('/api/metrics')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertIn(b'# TYPE http_request_duration_seconds histogram', response.content)
+
+    def test_scraper_con_token(self):
+        """El scraper se autentica con `Authorization: Metrics <token>`."""
+        response = APIClient().get('/api/metrics', HTTP_AUTHORIZATION='Metrics scrape-token')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_token_invalido_o_anonimo(self):
+        """Un token incorrecto o una request anónima deben ser rechazados."""
+        bad = APIClient().get('/api/metrics', HTTP_AUTHORIZATION='Metrics otro')
+        anonymous = APIClient().get('/api/metrics')
+        self.assertIn(bad.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+        self.assertIn(anonymous.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+    def test_redis_no_disponible(self):
+        """Sin Redis debe retornar 503."""
+        from redis import ConnectionError as RedisConnectionError
+
+        redis_client = mock.Mock()
+        redis_client.hgetall.side_effect = RedisConnectionError('down')
+        with mock.patch('inventory_app.utils.redis_client.get_redis', return_value=redis_client):
+            response = self.client.get('/api/metrics')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+# =============================================================================
+# Tests del renderer y parser JSON con orjson
+# =============================================================================
+class TestOrjsonRendererParser(APIBaseTestCase):
+    """La salida y la entrada deben ser idénticas a las de JSONRenderer/JSONParser de DRF."""
+
+    def assertSameOutput(self, data, renderer_context=None):
+        from rest_framework.renderers import JSONRenderer
+        from inventory_app.renderers import OrjsonRenderer
+
+        expected = JSONRenderer().render(data, 'application/json', renderer_context)
+        self.assertEqual(OrjsonRenderer().render(data, 'application/json', renderer_context), expected)
+
+    def test_tipos_no_nativos(self):
+        """Decimal, lazy strings, UUID, sets y tuplas se serializan igual que DRF."""
+        import uuid
+        from django.utils.translation import gettext_lazy
+
+        self.assertSameOutput({
+            'decimal': Decimal('10.50'),
+            'texto': gettext_lazy('Producto'),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'tupla': (1, 2),
+            'conjunto': {3},
+            'anidado': [{'precio': Decimal('0.10')}],
+        })
+
+    def test_valores_no_finitos(self):
+        """Un Decimal NaN/Infinity falla como en DRF; un float nativo no finito se escribe como null."""
+        from rest_framework.renderers import JSONRenderer
+        from inventory_app.renderers import OrjsonRenderer
+
+        for value in (Decimal('NaN'), Decimal('Infinity'), Decimal('-Infinity')):
+            with self.assertRaises(ValueError):
+                JSONRenderer().render({'precio': value}, 'application/json')
+            with self.assertRaises(ValueError):
+                OrjsonRenderer().render({'precio': value}, 'application/json')
+
+        # Diferencia documentada en renderers.py: DRF lanzaría ValueError
+        self.assertEqual(OrjsonRenderer().render({'a': float('nan'), 'b': float('inf')}, 'application/json'),
+                         b'{"a":null,"b":null}')
+
+    def test_fechas(self):
+        """Datetimes con zona (UTC y otras), naive, date y time igual que DRF."""
+        import datetime
+
+        self.assertSameOutput({
+            'utc': datetime.datetime(2024, 5, 1, 10, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'guayaquil': datetime.datetime(
+                2024, 5, 1, 10, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=-5))
+            ),
+            'naive': datetime.datetime(2024, 5, 1, 10, 30),
+            'fecha': datetime.date(2024, 5, 1),
+            'hora': datetime.time(8, 15, 30, 500),
+        })
+
+    def test_floats_enteros_y_unicode(self):
+        """Floats con exponente, enteros grandes y \u2028 deben coincidir con json.dumps."""
+        self.assertSameOutput({'valores': [0.1, 1e16, -1.5e-7, 1e-5, 0.0001, 123.456]})
+        self.assertSameOutput({'grande': 2 ** 70})
+        self.assertSameOutput({'texto': 'línea\u2028separador\u2029ñandú', 'codigo': 'x1e5'})
+        self.assertSameOutput({1: 'a', None: 'b', True: 'c'})
+
+    def test_indentacion(self):
+        """Con indentación (API navegable o ?indent=) se usa el formato de DRF."""
+        self.assertSameOutput({'a': [1, 2]}, {'indent': 4})
+
+    def test_listado_paginado_identico(self):
+        """La respuesta de un listado debe ser la misma con orjson que con DRF."""
+        from rest_framework.renderers import JSONRenderer
+
+        response = self.client.get('/api/products/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_parser_json(self):
+        """El parser debe aceptar lo mismo que JSONParser y con sus mismos errores."""
+        import io
+        from rest_framework.exceptions import ParseError
+        from rest_framework.parsers import JSONParser
+        from inventory_app.parsers import OrjsonParser
+
+        def parse(parser, body):
+            return parser.parse(io.BytesIO(body), 'application/json', {})
+
+        for body in (b'{"a": [1, 2.5, "\xc3\xb1"]}', b'{"n": 1180591620717411303424}'):
+            self.assertEqual(repr(parse(OrjsonParser(), body)), repr(parse(JSONParser(), body)))
+
+        for body in (b'{"a": ', b'[NaN]'):
+            with self.assertRaises(ParseError) as expected:
+                parse(JSONParser(), body)
+            with self.assertRaises(ParseError) as error:
+                parse(OrjsonParser(), body)
+            self.assertEqual(str(error.exception.detail), str(expected.exception.detail))
+
+    def test_post_json(self):
+        """Las escrituras JSON deben seguir funcionando con el parser por defecto."""
+        response = self.client.post('/api/categories/', {'name': 'Orjson'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['name'], 'Orjson')
+
+        response = self.client.post('/api/categories/', '{"name": ', content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+# =============================================================================
+# Tests de vistas async (perfil ASGI)
+# =============================================================================
+def reload_urlconf():
+    """Reimporta las URLs: urls.py elige las vistas async según SERVER_INTERFACE."""
+    import importlib
+    from django.urls import clear_url_caches
+    import inventory.urls
+    import inventory_app.urls
+
+    importlib.reload(inventory_app.urls)
+    importlib.reload(inventory.urls)
+    clear_url_caches()
+
+
+class TestReadViewRouting(TestCase):
+    """Las variantes async de las vistas de lectura solo se enrutan en el perfil ASGI."""
+
+    PATHS = ('/api/dashboard/summary/', '/api/alerts/', '/api/products/', '/api/config/')
+
+    def test_wsgi_enruta_vistas_sincronas(self):
+        """Con WSGI no hay async_to_sync por request: las vistas son síncronas."""
+        from asgiref.sync import iscoroutinefunction
+        from django.urls import resolve
+
+        for path in self.PATHS:
+            self.assertFalse(iscoroutinefunction(resolve(path).func), path)
+
+    def test_asgi_enruta_vistas_async(self):
+        from asgiref.sync import iscoroutinefunction
+        from django.urls import resolve
+
+        self.addCleanup(reload_urlconf)
+        with override_settings(SERVER_INTERFACE='asgi'):
+            reload_urlconf()
+        for path in self.PATHS:
+            self.assertTrue(iscoroutinefunction(resolve(path).func), path)
+
+
+@override_settings(JWT_USER_RESOLUTION='db', SERVER_INTERFACE='asgi')
+class TestAsyncViews(APIBaseTestCase):
+    """Variantes async (perfil ASGI): mismas respuestas que las vistas síncronas."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Las cleanups corren en orden inverso: esta, después de restaurar SERVER_INTERFACE
+        cls.addClassCleanup(reload_urlconf)
+        super().setUpClass()
+        reload_urlconf()
+
+    def setUp(self):
+        super().setUp()
+        from django.test import AsyncClient
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        self.async_client = AsyncClient()
+        # AsyncClient no envía como cabeceras las pasadas al constructor
+        self.auth = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+        Product.objects.create(
+            name='Producto Async', category=self.category, supplier=self.supplier,
+            price=Decimal('5.00'), current_stock=1, minimum_stock=5,
+        )
+
+    def test_vistas_declaradas_async(self):
+        """Las variantes async se sirven como corutinas; las síncronas no."""
+        from asgiref.sync import iscoroutinefunction
+        from inventory_app.views.alert_view import AlertListView, AsyncAlertListView
+        from inventory_app.views.config_view import ConfigView, AsyncConfigView
+        from inventory_app.views.dashboard_view import DashboardSummaryView, AsyncDashboardSummaryView
+        from inventory_app.views.product_view import ProductListCreateView, AsyncProductListCreateView
+
+        for view in (AsyncDashboardSummaryView, AsyncAlertListView, AsyncProductListCreateView, AsyncConfigView):
+            self.assertTrue(iscoroutinefunction(view.as_view()), view.__name__)
+        for view in (DashboardSummaryView, AlertListView, ProductListCreateView, ConfigView):
+            self.assertFalse(iscoroutinefunction(view.as_view()), view.__name__)
+
+    async def test_respuestas_iguales_por_asgi(self):
+        """Dashboard, alertas, productos y config responden lo mismo que las vistas síncronas."""
+        from asgiref.sync import sync_to_async
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from inventory_app.views.alert_view import AlertListView
+        from inventory_app.views.config_view import ConfigView
+        from inventory_app.views.dashboard_view import DashboardSummaryView
+        from inventory_app.views.product_view import ProductListCreateView
+
+        for path, view in (
+            ('/api/dashboard/summary/', DashboardSummaryView),
+            ('/api/alerts/', AlertListView),
+            ('/api/products/', ProductListCreateView),
+            ('/api/config/', ConfigView),
+        ):
+            response = await self.async_client.get(path, headers=self.auth)
+            request = APIRequestFactory().get(path)
+            force_authenticate(request, self.user)
+            expected = await sync_to_async(view.as_view())(request)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, path)
+            self.assertEqual(response.json(), json.loads(expected.render().content), path)
+
+    async def test_sin_autenticacion_por_asgi(self):
+        """La autenticación y los permisos se aplican igual en el dispatch async."""
+        from django.test import AsyncClient
+
+        response = await AsyncClient().get('/api/dashboard/summary/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_paginacion_async(self):
+        """La paginación async respeta page/page_size y responde 404 fuera de rango."""
+        response = self.client.get('/api/products/', {'page_size': 1, 'page': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
+
+        response = self.client.get('/api/alerts/', {'page': 5})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(FAST_LIST_SERIALIZERS=False)
+    async def test_listado_con_serializer_del_modelo(self):
+        """Sin FAST_LIST_SERIALIZERS el listado async usa ProductSerializer."""
+        response = await self.async_client.get('/api/products/', headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['results'][0]['name'], 'Producto Async')
+
+    async def test_post_sincrono_en_vista_async(self):
+        """El POST de productos sigue siendo síncrono y funciona dentro del dispatch async."""
+        response = await self.async_client.post('/api/products/', {
+            'name': 'Creado por ASGI', 'category': self.category.id, 'supplier': self.supplier.id,
+            'price': '3.50', 'minimum_stock': 1, 'status': 'Disponible',
+        }, content_type='application/json', headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(await Product.objects.filter(name='Creado por ASGI').aexists())
+
+    async def test_stream_sse_async(self):
+        """Por ASGI el stream SSE usa redis.asyncio y emite el evento final."""
+        pubsub = mock.Mock()
+        pubsub.subscribe = mock.AsyncMock()
+        pubsub.aclose = mock.AsyncMock()
+        redis_client = mock.Mock()
+        redis_client.pubsub.return_value = pubsub
+        # Pin al primario de ReplicaRoutingMiddleware (si hay réplica configurada)
+        redis_client.exists = mock.AsyncMock(return_value=0)
+        redis_client.get = mock.AsyncMock(return_value=json.dumps({
+            'task_id': 'abc', 'state': 'SUCCESS', 'progress': 100, 'result': 'reports/x.pdf',
+        }))
+
+        with mock.patch('inventory_app.utils.redis_client.get_async_redis', return_value=redis_client):
+            response = await self.async_client.get('/api/tasks/abc/events/', headers={**self.auth, 'Accept': 'text/event-stream'})
+            body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+
+        self.assertIn('"state": "SUCCESS"', body)
+        pubsub.subscribe.assert_awaited_once_with('task-events:abc')
+        pubsub.aclose.assert_awaited_once()
@@ -5,12 +5,67 @@ Provides different throttle rates for:
 - Anonymous users (more restrictive)
 - Authenticated users (less restrictive)
 - Sensitive operations (login, password reset - very restrictive)
+
+All classes share the Redis GCRA engine in utils/rate_limiter.py instead of
+DRF's per-process cache history lists: limits hold across gunicorn workers
+and replicas, use fixed memory per key, and every scope that applies to a
+request is checked in a single Redis round trip.
 """
 
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle, ScopedRateThrottle
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+from inventory_app.utils.rate_limiter import limiter
 
 
-class BurstRateThrottle(UserRateThrottle):
+class SharedRateThrottleMixin:
+    """
+    Evaluates all the shared throttles of the view at once.
+
+    The first throttle checked in a request collects the cache keys and rates
+    of every SharedRateThrottleMixin throttle of the view and checks them in
+    one call (all-or-nothing: a denied scope does not consume the others).
+    The remaining throttles read their result from the request.
+    """
+
+    def applies(self, request):
+        """Whether this throttle counts the request (e.g. only write methods)."""
+        return True
+
+    def limit(self, request, view):
+        """(key, num_requests, duration) or None if the throttle does not apply."""
+        if self.rate is None or not self.applies(request):
+            return None
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return None
+        return key, self.num_requests, self.duration
+
+    def allow_request(self, request, view):
+        entry = self.limit(request, view)
+        if entry is None:
+            return True
+
+        results = getattr(request, '_shared_throttle_waits', None)
+        if results is None or entry[0] not in results:
+            entries = [entry]
+            for throttle in view.get_throttles():
+                other = throttle.limit(request, view) if isinstance(throttle, SharedRateThrottleMixin) else None
+                if other is not None and other[0] != entry[0]:
+                    entries.append(other)
+            _, waits = limiter.check(entries)
+            results = dict(getattr(request, '_shared_throttle_waits', None) or {})
+            results.update({key: wait for (key, _, _), wait in zip(entries, waits)})
+            request._shared_throttle_waits = results
+
+        self._wait = results[entry[0]]
+        # If another scope was exceeded nothing was consumed: the request is rejected
+        return not any(results.values())
+
+    def wait(self):
+        return getattr(self, '_wait', None) or None
+
+
+class BurstRateThrottle(SharedRateThrottleMixin, UserRateThrottle):
     """
     Allows short bursts of requests from authenticated users.
     Applied globally to all endpoints for authenticated users.
@@ -18,7 +73,7 @@ class BurstRateThrottle(UserRateThrottle):
     scope = 'burst'
 
 
-class SustainedRateThrottle(UserRateThrottle):
+class SustainedRateThrottle(SharedRateThrottleMixin, UserRateThrottle):
     """
     Limits sustained usage over a longer period for authenticated users.
     Applied globally to all endpoints for authenticated users.
@@ -26,7 +81,7 @@ class SustainedRateThrottle(UserRateThrottle):
     scope = 'sustained'
 
 
-class AnonBurstRateThrottle(AnonRateThrottle):
+class AnonBurstRateThrottle(SharedRateThrottleMixin, AnonRateThrottle):
     """
     Allows short bursts of requests from anonymous users.
     More restrictive than authenticated users.
@@ -34,7 +89,7 @@ class AnonBurstRateThrottle(AnonRateThrottle):
     scope = 'anon_burst'
 
 
-class AnonSustainedRateThrottle(AnonRateThrottle):
+class AnonSustainedRateThrottle(SharedRateThrottleMixin, AnonRateThrottle):
     """
     Limits sustained usage over a longer period for anonymous users.
     More restrictive than authenticated users.
@@ -42,7 +97,7 @@ class AnonSustainedRateThrottle(AnonRateThrottle):
     scope = 'anon_sustained'
 
 
-class LoginRateThrottle(AnonRateThrottle):
+class LoginRateThrottle(SharedRateThrottleMixin, AnonRateThrottle):
     """
     Very restrictive throttle for login attempts.
     Prevents brute force attacks on login endpoint.
@@ -50,7 +105,7 @@ class LoginRateThrottle(AnonRateThrottle):
     scope = 'login'
 
 
-class PasswordResetRateThrottle(AnonRateThrottle):
+class PasswordResetRateThrottle(SharedRateThrottleMixin, AnonRateThrottle):
     """
     Restrictive throttle for password reset requests.
     Prevents abuse of password reset emails.
@@ -58,7 +113,7 @@ class PasswordResetRateThrottle(AnonRateThrottle):
     scope = 'password_reset'
 
 
-class PasswordChangeRateThrottle(UserRateThrottle):
+class PasswordChangeRateThrottle(SharedRateThrottleMixin, UserRateThrottle):
     """
     Moderate throttle for password changes.
     Prevents abuse while allowing legitimate use.
@@ -66,15 +121,13 @@ class PasswordChangeRateThrottle(UserRateThrottle):
     scope = 'password_change'
 
 
-class WriteOperationThrottle(UserRateThrottle):
+class WriteOperationThrottle(SharedRateThrottleMixin, UserRateThrottle):
     """
     Throttle for write operations (POST, PUT, PATCH, DELETE).
     More restrictive than read operations.
     """
     scope = 'write'
 
-    def allow_request(self, request, view):
+    def applies(self, request):
         # Only throttle write operations
-        if request.method in ['POST', 'PUT', 'PATCH', 'DELETE']:
-            return super().allow_request(request, view)
-        return True
+        return request.method in ['POST', 'PUT', 'PATCH', 'DELETE']
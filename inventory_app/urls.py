@@ -1,33 +1,52 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from inventory_app.views.auth_view import (
-    LoginView, ForgotPasswordView, ResetPasswordView, ChangePasswordView
+    LoginView, LogoutView, ForgotPasswordView, ResetPasswordView, ChangePasswordView
 )
 from inventory_app.views.user_view import UserListCreateView, UserDetailView
 from inventory_app.views.customer_view import CustomerListCreateView, CustomerDetailView
 from inventory_app.views.supplier_view import SupplierListCreateView, SupplierDetailView
-from inventory_app.views.product_view import ProductListCreateView, ProductDetailView
+from inventory_app.views.product_view import ProductListCreateView, AsyncProductListCreateView, ProductDetailView
 from inventory_app.views.category_view import CategoryListCreateView, CategoryDetailView
 from inventory_app.views.movement_view import MovementListCreateView
 from inventory_app.views.sale_view import SaleListCreateView, SaleDetailView
 from inventory_app.views.purchase_view import PurchaseListCreateView, PurchaseDetailView
-from inventory_app.views.report_view import ReportListView, ReportGeneratePDFView, ReportDownloadView
-from inventory_app.views.dashboard_view import DashboardSummaryView
+from inventory_app.views.report_view import (
+    ReportListView, ReportGeneratePDFView, ReportGenerateAsyncView, ReportDownloadView,
+)
+from inventory_app.views.dashboard_view import DashboardSummaryView, AsyncDashboardSummaryView
+from inventory_app.views.inventory_view import InventoryAsOfView
 
 from inventory_app.views.quotation_view import (
     QuotationCreateView, QuotationListView, QuotationDetailView,
-    QuotationPDFView, QuotationPDFStatusView
+    QuotationPDFView, QuotationPDFBatchView, QuotationPDFStatusView
 )
 
-from inventory_app.views.alert_view import AlertListView, AlertUpdateView
-from inventory_app.views.config_view import ConfigView
+from inventory_app.views.alert_view import AlertListView, AsyncAlertListView, AlertUpdateView
+from inventory_app.views.config_view import ConfigView, AsyncConfigView
+from inventory_app.views.task_view import TaskEventsView, TaskEventsTokenView
+from inventory_app.views.metrics_view import MetricsView
+from inventory_app.views.import_view import CustomerImportView, SupplierImportView
 
 from inventory_app.views.csrf_view import csrf_ready
+
+
+def read_view(view, async_view):
+    """
+    Variante async de una vista de lectura solo en el perfil ASGI. Con WSGI
+    Django la ejecutaría con async_to_sync (un event loop por request), así que
+    se sirve la síncrona.
+    """
+    return (async_view if settings.SERVER_INTERFACE == 'asgi' else view).as_view()
+
+
 urlpatterns = [
     # Auth
     path('login/', LoginView.as_view()),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('logout/', LogoutView.as_view()),
     path('forgot-password/', ForgotPasswordView.as_view()),
     path('reset-password/', ResetPasswordView.as_view()),
     path('change-password/', ChangePasswordView.as_view()),
@@ -39,13 +58,15 @@ urlpatterns = [
     # Customers
     path('customers/', CustomerListCreateView.as_view()),
     path('customers/<int:pk>/', CustomerDetailView.as_view()),
+    path('customers/import/', CustomerImportView.as_view()),
 
     # Suppliers
     path('suppliers/', SupplierListCreateView.as_view()),
     path('suppliers/<int:pk>/', SupplierDetailView.as_view()),
+    path('suppliers/import/', SupplierImportView.as_view()),
 
     # Products
-    path('products/', ProductListCreateView.as_view()),
+    path('products/', read_view(ProductListCreateView, AsyncProductListCreateView)),
     path('products/<int:pk>/', ProductDetailView.as_view()),
 
     # Categories
@@ -55,6 +76,9 @@ urlpatterns = [
     # Movements
     path('movements/', MovementListCreateView.as_view()),
 
+    # Inventario histórico
+    path('inventory/as-of/', InventoryAsOfView.as_view()),
+
     # Sales
     path('sales/', SaleListCreateView.as_view()),
     path('sales/<int:pk>/', SaleDetailView.as_view()),
@@ -66,6 +90,7 @@ urlpatterns = [
     # Reports
     path('reports/', ReportListView.as_view()),
     path('reports/generate/', ReportGeneratePDFView.as_view()),
+    path('reports/generate/async/', ReportGenerateAsyncView.as_view()),
     path('reports/download/<int:pk>/', ReportDownloadView.as_view(), name='report-download'),
 
     # Quotations
@@ -73,18 +98,26 @@ urlpatterns = [
     path('quotations/<int:pk>/', QuotationDetailView.as_view()),
     path('quotations/create/', QuotationCreateView.as_view()),
     path('quotations/pdf/<int:quotation_id>/', QuotationPDFView.as_view()),
+    path('quotations/pdf/batch/', QuotationPDFBatchView.as_view()),
     path('quotations/pdf/status/<str:task_id>/', QuotationPDFStatusView.as_view()),
 
+    # Eventos de tareas (SSE)
+    path('tasks/<str:task_id>/events/', TaskEventsView.as_view()),
+    path('tasks/<str:task_id>/events/token/', TaskEventsTokenView.as_view()),
+
 
     # Alerts
-    path('alerts/', AlertListView.as_view()),
+    path('alerts/', read_view(AlertListView, AsyncAlertListView)),
     path('alerts/<int:pk>/dismiss/', AlertUpdateView.as_view()),
 
     # Dashboard
-    path('dashboard/summary/', DashboardSummaryView.as_view()),
+    path('dashboard/summary/', read_view(DashboardSummaryView, AsyncDashboardSummaryView)),
 
     # Config (constantes del sistema)
-    path('config/', ConfigView.as_view()),
+    path('config/', read_view(ConfigView, AsyncConfigView)),
+
+    # Métricas (Prometheus)
+    path('metrics', MetricsView.as_view()),
 
     path('csrf/', csrf_ready),
 
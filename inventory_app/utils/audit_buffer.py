@@ -0,0 +1,152 @@
+# utils/audit_buffer.py
+"""
+Escritura en bloque de registros AuditLog.
+
+En lugar de un INSERT por cada AuditLog.log_action, los registros se acumulan
+durante la request (o cualquier bloque `collect()`) y se insertan con un único
+bulk_create al final. Un registro creado dentro de una transacción solo entra
+al buffer cuando esa transacción (o savepoint) hace commit, así que se guarda
+si y solo si se guardan los datos de negocio que audita.
+
+Modos (settings.AUDIT_LOG_WRITE_MODE):
+- 'sync':     un INSERT por registro (comportamiento anterior)
+- 'buffered': bulk_create al final de la request (por defecto)
+- 'celery':   el bulk_create se delega a la tarea write_audit_logs
+"""
+import contextvars
+import logging
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+
+logger = logging.getLogger(__name__)
+audit_logger = logging.getLogger('inventory_app.audit')
+
+MODE_SYNC = 'sync'
+MODE_BUFFERED = 'buffered'
+MODE_CELERY = 'celery'
+
+# Campos copiados al serializar un registro para la tarea de Celery
+SERIALIZED_FIELDS = (
+    'user_id', 'user_email', 'action', 'model_name', 'object_id', 'object_repr',
+    'changes', 'ip_address', 'user_agent',
+)
+
+
+class _Buffer(list):
+    """Registros pendientes de un bloque collect(); `closed` tras escribirse."""
+    closed = False
+
+
+_buffer = contextvars.ContextVar('audit_log_buffer', default=None)
+
+
+def _mode():
+    return getattr(settings, 'AUDIT_LOG_WRITE_MODE', MODE_BUFFERED)
+
+
+@contextmanager
+def collect():
+    """
+    Acumula los AuditLog registrados dentro del bloque y los escribe al salir.
+    Los bloques anidados comparten el buffer del bloque exterior.
+    """
+    if _buffer.get() is not None:
+        yield
+        return
+
+    entries = _Buffer()
+    token = _buffer.set(entries)
+    try:
+        yield
+    finally:
+        _buffer.reset(token)
+        entries.closed = True
+        flush(entries)
+
+
+@asynccontextmanager
+async def acollect():
+    """Versión async de collect(): el bulk_create final corre en un hilo."""
+    if _buffer.get() is not None:
+        yield
+        return
+
+    entries = _Buffer()
+    token = _buffer.set(entries)
+    try:
+        yield
+    finally:
+        _buffer.reset(token)
+        entries.closed = True
+        if entries:
+            await sync_to_async(flush)(entries)
+
+
+def record(log):
+    """
+    Registra un AuditLog (sin guardar) para escribirlo en bloque.
+
+    Dentro de una transacción, el registro se encola recién en el commit;
+    si la transacción se revierte, el registro se descarta junto con ella.
+    """
+    if _mode() == MODE_SYNC:
+        log.save()
+        return
+
+    entries = _buffer.get()
+    if connection.in_atomic_block:
+        transaction.on_commit(partial(_enqueue, entries, log))
+    else:
+        _enqueue(entries, log)
+
+
+def _enqueue(entries, log):
+    """Agrega el registro al buffer; si está lleno, lo escribe de inmediato (backpressure)."""
+    if entries is None or entries.closed:
+        flush([log])
+        return
+    entries.append(log)
+    if len(entries) >= getattr(settings, 'AUDIT_LOG_BUFFER_SIZE', 200):
+        batch = entries[:]
+        del entries[:]
+        flush(batch)
+
+
+def serialize(log):
+    """Convierte un AuditLog sin guardar en un dict apto para JSON (Celery)."""
+    data = {field: getattr(log, field) for field in SERIALIZED_FIELDS}
+    data['timestamp'] = log.timestamp.isoformat()
+    return data
+
+
+def flush(entries):
+    """
+    Escribe los registros con un único bulk_create (o los delega a Celery).
+
+    Si la base de datos falla, los registros se vuelcan al log de auditoría
+    para no perderlos.
+    """
+    if not entries:
+        return
+
+    if _mode() == MODE_CELERY:
+        try:
+            from inventory_app.tasks import write_audit_logs
+
+            write_audit_logs.delay([serialize(log) for log in entries])
+            return
+        except Exception as exc:
+            logger.warning(f"No se pudo encolar la escritura de auditoría, se escribe directo: {exc}")
+
+    from inventory_app.models.audit_log import AuditLog
+
+    try:
+        AuditLog.objects.bulk_create(entries, batch_size=500)
+    except DatabaseError as exc:
+        logger.error(f"No se pudieron guardar {len(entries)} registros de auditoría: {exc}")
+        for log in entries:
+            audit_logger.warning({'audit_log': serialize(log)})
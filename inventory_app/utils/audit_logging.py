@@ -0,0 +1,89 @@
+# utils/audit_logging.py
+"""
+Pipeline de logging de auditoría fuera del hilo de la request.
+
+El middleware entrega cada registro como un dict liviano a un QueueHandler;
+un QueueListener en un hilo de fondo interpreta el body, oculta campos sensibles,
+serializa a una línea JSON y lo envía al colector de logs (ver utils/log_shipping.py).
+Así la request solo paga el costo de encolar un objeto.
+"""
+import json
+import logging
+import queue
+from datetime import datetime, timezone as dt_timezone
+from logging.handlers import QueueHandler
+
+SENSITIVE_FIELDS = ('password', 'token', 'secret', 'api_key', 'authorization')
+REDACTED = '***REDACTED***'
+
+
+def sanitize_data(data):
+    """Enmascara los campos sensibles (primer nivel) de un dict."""
+    sanitized = data.copy()
+    for key in list(sanitized.keys()):
+        if any(sensitive in key.lower() for sensitive in SENSITIVE_FIELDS):
+            sanitized[key] = REDACTED
+    return sanitized
+
+
+def decode_body(raw):
+    """
+    Interpreta el body JSON capturado por el middleware.
+
+    Args:
+        raw: bytes del body, o str con un marcador (p. ej. '<truncated ...>')
+
+    Returns:
+        dict | list | str | None
+    """
+    if raw is None or isinstance(raw, str):
+        return raw
+    if not raw:
+        return None
+    try:
+        body = json.loads(raw)
+    except (ValueError, UnicodeDecodeError):
+        return '<binary or non-JSON data>'
+    if isinstance(body, dict):
+        body = sanitize_data(body)
+    return body
+
+
+class AuditQueueHandler(QueueHandler):
+    """
+    QueueHandler que encola el registro sin formatearlo y sin bloquear.
+
+    El QueueHandler estándar formatea el mensaje en el hilo que llama; aquí
+    todo el trabajo de formato queda para el hilo del listener. Si la cola está
+    llena (disco lento), el registro se descarta y se cuenta en `dropped`.
+    """
+
+    listener = None
+    dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Serializa registros de auditoría (msg dict) como una línea JSON."""
+
+    def format(self, record):
+        if isinstance(record.msg, dict):
+            entry = dict(record.msg)
+            if 'body' in entry:
+                entry['body'] = decode_body(entry['body'])
+        else:
+            entry = {'message': record.getMessage()}
+        entry.setdefault(
+            'ts', datetime.fromtimestamp(record.created, tz=dt_timezone.utc).isoformat()
+        )
+        entry.setdefault('level', record.levelname)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
@@ -0,0 +1,59 @@
+# utils/db_instrumentation.py
+"""
+execute_wrappers de Django activos por contexto (request o tarea) y no por hilo.
+
+connection.execute_wrapper() se instala en la conexión del hilo actual. Con ASGI
+el middleware corre en el hilo del event loop y el ORM (aget, acount, ...) en el
+hilo de sync_to_async, que usa otra conexión: el wrapper no veía esas consultas.
+
+Cada conexión recibe al conectarse (señal connection_created, ver signals.py)
+un único wrapper que delega en los wrappers activos del contexto. Se guardan en
+una ContextVar, que sync_to_async y async_to_sync propagan entre hilos. Sin
+wrappers activos el costo por consulta es una llamada extra.
+
+Uso:
+    counter = QueryCounter()
+    with execute_wrapper_all(counter):
+        ...
+"""
+import contextvars
+from contextlib import contextmanager
+from functools import partial
+
+from django.conf import settings
+from django.db import connections
+
+_active = contextvars.ContextVar('db_execute_wrappers', default=())
+
+
+def _dispatch(execute, sql, params, many, context):
+    wrappers = _active.get()
+    if not wrappers:
+        return execute(sql, params, many, context)
+    # El primero activado queda más afuera, igual que con execute_wrapper() anidados
+    call = execute
+    for wrapper in reversed(wrappers):
+        call = partial(wrapper, call)
+    return call(sql, params, many, context)
+
+
+def install(connection):
+    """Agrega el wrapper por contexto a la conexión (idempotente)."""
+    if _dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_dispatch)
+
+
+@contextmanager
+def execute_wrapper_all(wrapper):
+    """
+    Activa `wrapper` para todas las consultas del contexto actual, en todos los
+    alias de DATABASES y en cualquier hilo al que se propague el contexto.
+    """
+    # Conexiones del hilo actual abiertas antes de registrar la señal
+    for alias in settings.DATABASES:
+        install(connections[alias])
+    token = _active.set(_active.get() + (wrapper,))
+    try:
+        yield
+    finally:
+        _active.reset(token)
@@ -0,0 +1,167 @@
+# utils/file_serving.py
+"""
+Entrega de archivos protegidos (PDFs de reportes) después de autorizar la request.
+
+Modos (settings.PROTECTED_FILE_SERVING):
+- 'django':   Django envía los bytes, con soporte de HTTP Range y requests condicionales.
+- 'nginx':    Responde con X-Accel-Redirect y nginx envía el archivo.
+- 'sendfile': Responde con X-Sendfile (Apache mod_xsendfile, lighttpd, etc.).
+
+Con 'nginx' o 'sendfile' el worker de gunicorn queda libre apenas se autoriza
+la descarga, en lugar de quedar ocupado durante toda la transferencia.
+"""
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+SERVING_DJANGO = 'django'
+SERVING_NGINX = 'nginx'
+SERVING_SENDFILE = 'sendfile'
+
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def serve_protected_file(request, relative_name, content_type, disposition='inline'):
+    """
+    Retorna la response adecuada para entregar un archivo de MEDIA_ROOT.
+
+    Args:
+        request: Request de Django/DRF (ya autorizada)
+        relative_name: Ruta relativa a MEDIA_ROOT (p. ej. 'reports/xxx.pdf')
+        content_type: Content-Type del archivo
+        disposition: 'inline' o 'attachment'
+
+    Returns:
+        HttpResponse | StreamingHttpResponse
+
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+    """
+    file_path = Path(settings.MEDIA_ROOT) / relative_name
+    if not file_path.is_file():
+        raise FileNotFoundError(relative_name)
+
+    mode = getattr(settings, 'PROTECTED_FILE_SERVING', SERVING_DJANGO)
+    disposition_header = f'{disposition}; filename="{file_path.name}"'
+
+    if mode == SERVING_NGINX:
+        prefix = getattr(settings, 'PROTECTED_FILE_ACCEL_PREFIX', '/protected-media/')
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = quote(prefix.rstrip('/') + '/' + relative_name)
+        response['Content-Disposition'] = disposition_header
+        return response
+
+    if mode == SERVING_SENDFILE:
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = str(file_path.resolve())
+        response['Content-Disposition'] = disposition_header
+        return response
+
+    return _serve_with_django(request, file_path, content_type, disposition_header)
+
+
+def _serve_with_django(request, file_path, content_type, disposition_header):
+    """Entrega el archivo desde Django con soporte de Range, ETag y Last-Modified."""
+    stat = file_path.stat()
+    size = stat.st_size
+    etag = f'"{int(stat.st_mtime):x}-{size:x}"'
+    last_modified = http_date(stat.st_mtime)
+
+    # If-None-Match / If-Modified-Since → 304, If-Match / If-Unmodified-Since → 412
+    conditional = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if conditional is not None:
+        conditional['ETag'] = etag
+        conditional['Last-Modified'] = last_modified
+        return conditional
+
+    byte_range = _parse_range(request, size, etag, stat.st_mtime)
+
+    if byte_range == 'unsatisfiable':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    start, end = byte_range if byte_range else (0, size - 1)
+    length = end - start + 1 if size else 0
+
+    response = StreamingHttpResponse(
+        _iter_file(file_path, start, length),
+        status=206 if byte_range else 200,
+        content_type=content_type,
+    )
+    if byte_range:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(length)
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    response['Content-Disposition'] = disposition_header
+    return response
+
+
+def _parse_range(request, size, etag, mtime):
+    """
+    Interpreta el header Range (un solo rango).
+
+    Returns:
+        None si se debe enviar el archivo completo, (start, end) inclusivo,
+        o 'unsatisfiable' si el rango no es válido para el tamaño del archivo.
+    """
+    header = request.META.get('HTTP_RANGE', '').strip()
+    if not header:
+        return None
+
+    # If-Range: solo aplicar el rango si el archivo no cambió
+    if_range = request.META.get('HTTP_IF_RANGE', '').strip()
+    if if_range:
+        if if_range.startswith('"') or if_range.startswith('W/'):
+            if if_range != etag:
+                return None
+        else:
+            since = parse_http_date_safe(if_range)
+            if since is None or int(mtime) > since:
+                return None
+
+    match = RANGE_RE.match(header)
+    if not match:
+        # Rangos múltiples o sintaxis no soportada: enviar el archivo completo
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Sufijo: últimos N bytes
+        suffix = int(last)
+        if suffix == 0:
+            return 'unsatisfiable'
+        start = max(size - suffix, 0)
+        end = size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+
+    if start >= size or start > end:
+        return 'unsatisfiable'
+    return start, end
+
+
+def _iter_file(file_path, start, length):
+    """Lee el archivo por bloques desde `start` hasta completar `length` bytes."""
+    with open(file_path, 'rb') as fh:
+        fh.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = fh.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
@@ -0,0 +1,324 @@
+# utils/log_shipping.py
+"""
+Envío de logs a un único proceso escritor (colector).
+
+Los workers de gunicorn y de Celery no escriben archivos: cada proceso encola
+el LogRecord sin formatearlo (AuditQueueHandler) y un hilo de fondo lo
+serializa como JSON y lo envía por un socket Unix al colector
+(`python manage.py run_log_collector`). El colector es el único que escribe y
+rota general.log, errors.log, inventory.log y audit.log, así que la rotación
+no se pisa entre procesos y las requests no compiten por locks de archivo.
+
+Si el colector no está disponible, los registros se descartan (siguen
+apareciendo en consola), salvo los de auditoría, que se escriben en stderr
+para no perderlos.
+
+SamplingFilter limita por logger los registros INFO/DEBUG de alto volumen
+(muestreo y tope por segundo) antes de encolarlos.
+"""
+import json
+import logging
+import os
+import queue
+import random
+import socket
+import socketserver
+import sys
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+from logging.handlers import QueueListener, RotatingFileHandler
+
+from inventory_app.utils.audit_logging import AuditQueueHandler, JsonLinesFormatter
+
+# Archivos que administra el colector
+STREAM_GENERAL = 'general'
+STREAM_ERRORS = 'errors'
+STREAM_INVENTORY = 'inventory'
+STREAM_AUDIT = 'audit'
+STREAMS = (STREAM_GENERAL, STREAM_ERRORS, STREAM_INVENTORY, STREAM_AUDIT)
+
+# Logger -> archivo (se usa el prefijo más largo que coincida)
+STREAM_ROUTES = {
+    'inventory_app.audit': STREAM_AUDIT,
+    'inventory_app.services': STREAM_INVENTORY,
+}
+
+# Segundos de espera antes de reintentar la conexión con el colector
+RECONNECT_DELAY = 5
+
+
+def route(record):
+    """Archivos de destino de un registro, p. ej. ['general', 'errors']."""
+    stream = STREAM_GENERAL
+    for prefix in sorted(STREAM_ROUTES, key=len, reverse=True):
+        if record.name == prefix or record.name.startswith(prefix + '.'):
+            stream = STREAM_ROUTES[prefix]
+            break
+    streams = [stream]
+    if record.levelno >= logging.ERROR and stream != STREAM_AUDIT:
+        streams.append(STREAM_ERRORS)
+    return streams
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Muestreo y límite de tasa por logger para registros por debajo de WARNING.
+
+    Args:
+        rules: {prefijo_de_logger: {'sample_rate': 0.0-1.0, 'max_per_second': int}}
+
+    La decisión se guarda en el registro, así que el mismo filtro puede
+    asociarse a varios handlers sin contar dos veces. Cuando un registro pasa
+    después de otros descartados, lleva `suppressed` con la cantidad omitida.
+    """
+
+    def __init__(self, rules=None):
+        super().__init__()
+        self.rules = dict(rules or {})
+        self._prefixes = sorted(self.rules, key=len, reverse=True)
+        self._lock = threading.Lock()
+        # prefijo -> [segundo actual, registros en ese segundo, omitidos pendientes]
+        self._state = {prefix: [0, 0, 0] for prefix in self.rules}
+
+    def _rule_for(self, name):
+        for prefix in self._prefixes:
+            if name == prefix or name.startswith(prefix + '.'):
+                return prefix
+        return None
+
+    def filter(self, record):
+        decision = getattr(record, '_sampling_decision', None)
+        if decision is not None:
+            return decision
+        record._sampling_decision = decision = self._decide(record)
+        return decision
+
+    def _decide(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        prefix = self._rule_for(record.name)
+        if prefix is None:
+            return True
+
+        rule = self.rules[prefix]
+        sample_rate = rule.get('sample_rate', 1.0)
+        max_per_second = rule.get('max_per_second')
+        with self._lock:
+            state = self._state[prefix]
+            now = int(time.monotonic())
+            if state[0] != now:
+                state[0], state[1] = now, 0
+
+            keep = (sample_rate >= 1.0 or random.random() < sample_rate) and \
+                (max_per_second is None or state[1] < max_per_second)
+            if not keep:
+                state[2] += 1
+                return False
+            state[1] += 1
+            if state[2]:
+                record.suppressed, state[2] = state[2], 0
+        return True
+
+
+class ShippingFormatter(JsonLinesFormatter):
+    """JsonLinesFormatter con el logger de origen, la excepción y los registros omitidos."""
+
+    def format(self, record):
+        if isinstance(record.msg, dict):
+            return super().format(record)
+
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=dt_timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'process': record.process,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        suppressed = getattr(record, 'suppressed', None)
+        if suppressed:
+            entry['suppressed'] = suppressed
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class CollectorClient(logging.Handler):
+    """
+    Handler (usado solo desde el hilo del QueueListener) que envía cada
+    registro al colector como una línea `<archivos>\\t<json>`.
+    """
+
+    def __init__(self, socket_path, fallback_streams=(STREAM_AUDIT,)):
+        super().__init__()
+        self.socket_path = socket_path
+        self.fallback_streams = set(fallback_streams)
+        self.dropped = 0
+        self._sock = None
+        self._retry_at = 0.0
+        self._warned = False
+
+    def _connect(self):
+        if self._sock is not None:
+            return self._sock
+        if not self.socket_path or time.monotonic() < self._retry_at:
+            return None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            self._retry_at = time.monotonic() + RECONNECT_DELAY
+            return None
+        self._sock = sock
+        return sock
+
+    def emit(self, record):
+        try:
+            streams = route(record)
+            line = f"{','.join(streams)}\t{self.format(record)}\n".encode('utf-8')
+        except Exception:
+            self.handleError(record)
+            return
+
+        sock = self._connect()
+        if sock is not None:
+            try:
+                sock.sendall(line)
+                return
+            except OSError:
+                sock.close()
+                self._sock = None
+                self._retry_at = time.monotonic() + RECONNECT_DELAY
+        self._fallback(streams, line)
+
+    def _fallback(self, streams, line):
+        """Sin colector: auditoría a stderr, el resto se descarta (ya está en consola)."""
+        if self.fallback_streams.intersection(streams):
+            sys.stderr.write(line.decode('utf-8').split('\t', 1)[1])
+            return
+        self.dropped += 1
+        if self.socket_path and not self._warned:
+            self._warned = True
+            sys.stderr.write(f"[log_shipping] Colector no disponible en {self.socket_path}; "
+                             f"los logs de archivo se descartan hasta que vuelva\n")
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        super().close()
+
+
+class ShippingQueueHandler(AuditQueueHandler):
+    """
+    AuditQueueHandler que (re)inicia su hilo de envío en el proceso actual.
+
+    Los workers prefork (Celery, gunicorn con --preload) heredan el handler
+    pero no el hilo del listener; el primer registro en el proceso hijo crea
+    una cola, una conexión y un hilo propios.
+    """
+
+    def __init__(self, client_factory, queue_size):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.client_factory = client_factory
+        self.queue_size = queue_size
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self.queue = queue.Queue(maxsize=self.queue_size)
+            self.listener = QueueListener(self.queue, self.client_factory(), respect_handler_level=False)
+            self.listener.start()
+            self._pid = os.getpid()
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            self.start()
+        super().emit(record)
+
+    def close(self):
+        if self.listener is not None and self._pid == os.getpid():
+            self.listener.stop()
+            self._pid = None
+        super().close()
+
+
+def build_shipping_handler(socket_path, queue_size=10000):
+    """
+    Crea el handler que envía los logs del proceso al colector.
+
+    Se usa desde LOGGING como factory ('()').
+
+    Args:
+        socket_path: Socket Unix del colector ('' para no enviar a archivos)
+        queue_size: Máximo de registros pendientes; si se llena, se descartan
+
+    Returns:
+        ShippingQueueHandler: Handler a asociar a los loggers
+    """
+    def client_factory():
+        client = CollectorClient(socket_path)
+        client.setFormatter(ShippingFormatter())
+        return client
+
+    return ShippingQueueHandler(client_factory, queue_size)
+
+
+class _CollectorRequestHandler(socketserver.StreamRequestHandler):
+    """Lee las líneas de una conexión y las escribe en los archivos indicados."""
+
+    def handle(self):
+        for raw in self.rfile:
+            try:
+                header, line = raw.decode('utf-8').rstrip('\n').split('\t', 1)
+            except ValueError:
+                continue
+            self.server.write(header.split(','), line)
+
+
+class LogCollector(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Proceso escritor único: recibe las líneas JSON de todos los procesos y las
+    escribe (y rota) en los archivos de LOGS_DIR.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, logs_dir, max_bytes=10 * 1024 * 1024, backup_count=5,
+                 audit_backup_count=10):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        os.makedirs(logs_dir, exist_ok=True)
+        self.files = {
+            stream: RotatingFileHandler(
+                os.path.join(logs_dir, f'{stream}.log'),
+                maxBytes=max_bytes,
+                backupCount=audit_backup_count if stream == STREAM_AUDIT else backup_count,
+                encoding='utf-8',
+            )
+            for stream in STREAMS
+        }
+        for handler in self.files.values():
+            handler.setFormatter(logging.Formatter('%(message)s'))
+        self.written = 0
+        super().__init__(socket_path, _CollectorRequestHandler)
+
+    def write(self, streams, line):
+        record = logging.makeLogRecord({'msg': line})
+        for stream in streams:
+            handler = self.files.get(stream)
+            if handler is not None:
+                handler.handle(record)
+        self.written += 1
+
+    def server_close(self):
+        super().server_close()
+        for handler in self.files.values():
+            handler.close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
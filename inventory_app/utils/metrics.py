@@ -0,0 +1,234 @@
+# utils/metrics.py
+"""
+Métricas HTTP por endpoint (latencia, cantidad de consultas SQL y tiempo en BD)
+agregadas entre todos los workers de gunicorn mediante Redis.
+
+Cada proceso acumula en memoria y, como máximo cada METRICS_FLUSH_INTERVAL
+segundos, suma sus contadores a un hash de Redis con un único pipeline
+(HINCRBYFLOAT). /api/metrics lee ese hash y lo expone en formato de texto
+de Prometheus. El costo por request es actualizar algunos contadores locales.
+
+En el mismo volcado se suman los contadores del pool de conexiones de cada
+alias (pedidos, esperas y timeouts), para detectar un pool demasiado chico.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY = 'metrics:http'
+SEPARATOR = '\x1f'
+
+# Límites superiores de los buckets (formato Prometheus: le="...")
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# nombre -> (tipo, ayuda, buckets)
+METRICS = {
+    'http_request_duration_seconds': (
+        'histogram', 'Latencia de las requests HTTP por endpoint.', LATENCY_BUCKETS,
+    ),
+    'http_request_db_queries': (
+        'histogram', 'Consultas SQL ejecutadas por request.', QUERY_COUNT_BUCKETS,
+    ),
+    'http_request_db_duration_seconds_total': (
+        'counter', 'Tiempo total en la base de datos por endpoint.', None,
+    ),
+}
+LABELS = ('view', 'method', 'status')
+
+# nombre -> (clave de psycopg_pool.ConnectionPool.get_stats(), escala, ayuda)
+POOL_METRICS = {
+    'db_pool_requests_total': (
+        'requests_num', 1, 'Conexiones pedidas al pool.',
+    ),
+    'db_pool_requests_queued_total': (
+        'requests_queued', 1, 'Pedidos que esperaron porque no había conexiones libres.',
+    ),
+    'db_pool_wait_seconds_total': (
+        'requests_wait_ms', 0.001, 'Tiempo total esperando una conexión libre del pool.',
+    ),
+    'db_pool_timeouts_total': (
+        'requests_errors', 1, 'Pedidos que fallaron sin obtener conexión (DB_POOL_TIMEOUT).',
+    ),
+    'db_pool_connections_opened_total': (
+        'connections_num', 1, 'Conexiones nuevas abiertas por el pool.',
+    ),
+    'db_pool_connect_seconds_total': (
+        'connections_ms', 0.001, 'Tiempo total abriendo conexiones nuevas (incluye TLS).',
+    ),
+}
+POOL_LABELS = ('alias',)
+
+
+class _Recorder:
+    """Acumulador en memoria de un proceso; se vuelca a Redis periódicamente."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = defaultdict(float)
+        self._last_flush = time.monotonic()
+
+    def observe(self, labels, duration, queries, db_time, autoflush=True):
+        """
+        Registra una request. `labels` = (view, method, status).
+        Con autoflush=False el llamador vuelca con flush() cuando flush_due()
+        (el middleware async lo hace fuera del event loop).
+        """
+        label_key = SEPARATOR.join(labels)
+        latency_le = _bucket(LATENCY_BUCKETS, duration)
+        queries_le = _bucket(QUERY_COUNT_BUCKETS, queries)
+        with self._lock:
+            values = self._values
+            values[f'http_request_duration_seconds{SEPARATOR}{label_key}{SEPARATOR}{latency_le}'] += 1
+            values[f'http_request_duration_seconds{SEPARATOR}{label_key}{SEPARATOR}sum'] += duration
+            values[f'http_request_db_queries{SEPARATOR}{label_key}{SEPARATOR}{queries_le}'] += 1
+            values[f'http_request_db_queries{SEPARATOR}{label_key}{SEPARATOR}sum'] += queries
+            values[f'http_request_db_duration_seconds_total{SEPARATOR}{label_key}{SEPARATOR}'] += db_time
+
+        if autoflush and self.flush_due():
+            self.flush()
+
+    def flush_due(self):
+        """True si pasó METRICS_FLUSH_INTERVAL desde el último volcado."""
+        return time.monotonic() - self._last_flush >= getattr(settings, 'METRICS_FLUSH_INTERVAL', 5)
+
+    def flush(self):
+        """Suma los valores acumulados al hash de Redis. Nunca lanza excepción."""
+        with self._lock:
+            values, self._values = self._values, defaultdict(float)
+            self._last_flush = time.monotonic()
+        values.update(_pool_stats())
+        if not values:
+            return
+
+        from redis import RedisError
+        from inventory_app.utils.redis_client import get_redis
+
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            for field, value in values.items():
+                pipe.hincrbyfloat(REDIS_KEY, field, value)
+            pipe.execute()
+        except RedisError as exc:
+            # Las métricas se pierden para este intervalo; la request no se ve afectada
+            logger.warning(f"No se pudieron publicar las métricas: {exc}")
+
+
+def _pool_stats():
+    """
+    Contadores de los pools de conexiones de este proceso desde el último
+    volcado (pop_stats los reinicia). Vacío si ningún alias usa pool.
+    """
+    from django.db import connections
+
+    values = {}
+    for connection in connections.all():
+        # El pool es uno por alias y proceso, compartido por todos los hilos
+        if not connection.settings_dict.get('OPTIONS', {}).get('pool'):
+            continue
+        stats = connection.pool.pop_stats()
+        for metric, (key, scale, _) in POOL_METRICS.items():
+            if stats.get(key):
+                values[f'{metric}{SEPARATOR}{connection.alias}'] = stats[key] * scale
+    return values
+
+
+def _bucket(buckets, value):
+    """Límite del bucket que contiene el valor ('+Inf' si supera el último)."""
+    index = bisect_left(buckets, value)
+    return repr(float(buckets[index])) if index < len(buckets) else '+Inf'
+
+
+recorder = _Recorder()
+
+
+class QueryCounter:
+    """
+    execute_wrapper de Django que cuenta las consultas SQL y su duración.
+
+    Uso:
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            ...
+    """
+
+    __slots__ = ('count', 'duration')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def render_prometheus():
+    """
+    Genera la exposición en formato de texto de Prometheus a partir de Redis.
+
+    Returns:
+        str: Texto con HELP/TYPE y las muestras de cada métrica
+    """
+    from inventory_app.utils.redis_client import get_redis
+
+    recorder.flush()
+    raw = get_redis().hgetall(REDIS_KEY)
+
+    # metric -> labels -> {'buckets': {le: n}, 'sum': x, 'value': x}
+    series = defaultdict(lambda: defaultdict(lambda: {'buckets': defaultdict(float), 'sum': 0.0, 'value': 0.0}))
+    pool_series = defaultdict(lambda: defaultdict(float))
+    for field, value in raw.items():
+        parts = field.decode().split(SEPARATOR)
+        if len(parts) == 2 and parts[0] in POOL_METRICS:
+            pool_series[parts[0]][parts[1]] += float(value)
+            continue
+        if len(parts) != 5 or parts[0] not in METRICS:
+            continue
+        metric, view, method, status, suffix = parts
+        entry = series[metric][(view, method, status)]
+        value = float(value)
+        if METRICS[metric][0] == 'counter':
+            entry['value'] += value
+        elif suffix == 'sum':
+            entry['sum'] += value
+        else:
+            entry['buckets'][suffix] += value
+
+    lines = []
+    for metric, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} {kind}')
+        for labels, entry in sorted(series.get(metric, {}).items()):
+            label_text = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(LABELS, labels))
+            if kind == 'counter':
+                lines.append(f'{metric}{{{label_text}}} {entry["value"]}')
+                continue
+            cumulative = 0.0
+            for le in [repr(float(b)) for b in buckets] + ['+Inf']:
+                cumulative += entry['buckets'].get(le, 0.0)
+                lines.append(f'{metric}_bucket{{{label_text},le="{le}"}} {int(cumulative)}')
+            lines.append(f'{metric}_sum{{{label_text}}} {entry["sum"]}')
+            lines.append(f'{metric}_count{{{label_text}}} {int(cumulative)}')
+    for metric, (_, _, help_text) in POOL_METRICS.items():
+        if metric not in pool_series:
+            continue
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} counter')
+        for alias, value in sorted(pool_series[metric].items()):
+            lines.append(f'{metric}{{{POOL_LABELS[0]}="{_escape(alias)}"}} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
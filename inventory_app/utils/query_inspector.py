@@ -0,0 +1,137 @@
+# utils/query_inspector.py
+"""
+Detección de consultas lentas y patrones N+1 por request.
+
+QueryInspector es un execute_wrapper de Django: mide cada consulta, agrupa
+las consultas por "forma" (el SQL sin valores) y, al cerrar la request,
+reporta las formas que se repitieron demasiadas veces junto con la vista
+que las originó y un stack recortado al código del proyecto.
+
+Configuración (settings):
+- QUERY_INSPECTOR_ENABLED:          activa el middleware (por defecto en desarrollo y en modo CI)
+- QUERY_INSPECTOR_SLOW_MS:          umbral de consulta lenta en milisegundos
+- QUERY_INSPECTOR_REPEAT_THRESHOLD: repeticiones de una misma forma que se consideran N+1
+- QUERY_INSPECTOR_RAISE:            modo CI; los hallazgos lanzan QueryPatternError
+"""
+import logging
+import os
+import re
+import time
+import traceback
+from collections import Counter
+
+from django.conf import settings
+
+logger = logging.getLogger('inventory_app.queries')
+
+# Listas IN (%s, %s, ...) de largo variable y literales numéricos no cambian la forma
+_IN_LIST_RE = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+_NUMBER_RE = re.compile(r'\b\d+\b')
+
+# Frames que no aportan al diagnóstico
+_IGNORED_PATHS = (
+    'site-packages', 'dist-packages',
+    os.path.join('inventory_app', 'middleware'), os.path.join('utils', 'query_inspector.py'),
+)
+
+
+class QueryPatternError(AssertionError):
+    """Consulta lenta o N+1 detectada con QUERY_INSPECTOR_RAISE activo (modo CI)."""
+
+
+def sql_shape(sql):
+    """Normaliza el SQL para que dos ejecuciones de la misma consulta compartan forma."""
+    return _NUMBER_RE.sub('?', _IN_LIST_RE.sub('(...)', sql))
+
+
+def project_stack(limit=None):
+    """
+    Retorna los frames más recientes del código del proyecto, como texto
+    'archivo:línea en función', omitiendo Django, librerías y este módulo.
+    """
+    if limit is None:
+        limit = getattr(settings, 'QUERY_INSPECTOR_STACK_DEPTH', 5)
+    base_dir = str(settings.BASE_DIR)
+    frames = [
+        f"{frame.filename[len(base_dir) + 1:]}:{frame.lineno} en {frame.name}"
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(base_dir)
+        and not any(part in frame.filename for part in _IGNORED_PATHS)
+    ]
+    return frames[-limit:]
+
+
+class QueryInspector:
+    """
+    execute_wrapper que registra consultas lentas y formas repetidas.
+
+    Uso:
+        inspector = QueryInspector(label='api/alerts/')
+        with connection.execute_wrapper(inspector):
+            ...
+        inspector.report()
+    """
+
+    def __init__(self, label='', slow_ms=None, repeat_threshold=None):
+        self.label = label
+        self.slow_ms = slow_ms if slow_ms is not None else getattr(settings, 'QUERY_INSPECTOR_SLOW_MS', 200)
+        self.repeat_threshold = (
+            repeat_threshold if repeat_threshold is not None
+            else getattr(settings, 'QUERY_INSPECTOR_REPEAT_THRESHOLD', 5)
+        )
+        self.shapes = Counter()
+        self.slow = []
+        # forma -> stack capturado al alcanzar el umbral (solo una vez por forma)
+        self.repeated = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            shape = sql_shape(sql)
+            self.shapes[shape] += 1
+
+            # El stack solo se captura cuando hay algo que reportar
+            if elapsed_ms >= self.slow_ms:
+                self.slow.append({'sql': sql, 'ms': round(elapsed_ms, 2), 'stack': project_stack()})
+            if self.shapes[shape] == self.repeat_threshold:
+                self.repeated[shape] = project_stack()
+
+    @property
+    def findings(self):
+        """Lista de hallazgos (consultas lentas y formas repetidas) de la request."""
+        findings = [
+            {'kind': 'slow_query', 'view': self.label, **entry}
+            for entry in self.slow
+        ]
+        findings.extend(
+            {'kind': 'n_plus_one', 'view': self.label, 'sql': shape,
+             'count': self.shapes[shape], 'stack': stack}
+            for shape, stack in self.repeated.items()
+        )
+        return findings
+
+    def report(self):
+        """
+        Registra los hallazgos en el log 'inventory_app.queries'.
+
+        Raises:
+            QueryPatternError: Si hay hallazgos y QUERY_INSPECTOR_RAISE está activo
+        """
+        findings = self.findings
+        for finding in findings:
+            if finding['kind'] == 'slow_query':
+                message = f"[SLOW_QUERY] {self.label}: {finding['ms']}ms"
+            else:
+                message = f"[N+1] {self.label}: {finding['count']} consultas con la misma forma"
+            logger.warning(
+                f"{message}\n  SQL: {finding['sql'][:300]}\n  " + '\n  '.join(finding['stack']),
+                extra={'query_finding': finding},
+            )
+
+        if findings and getattr(settings, 'QUERY_INSPECTOR_RAISE', False):
+            details = '; '.join(f"{f['kind']}: {f['sql'][:120]}" for f in findings)
+            raise QueryPatternError(f"Patrones de consulta en {self.label}: {details}")
+        return findings
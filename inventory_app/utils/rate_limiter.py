@@ -0,0 +1,142 @@
+# utils/rate_limiter.py
+"""
+Motor de rate limiting compartido entre procesos (GCRA sobre Redis).
+
+GCRA (Generic Cell Rate Algorithm) guarda por clave un único número, el
+"theoretical arrival time" (TAT), así que la memoria por clave es fija sin
+importar el límite (a diferencia de las listas de timestamps de DRF). Un
+límite de N requests por período P equivale a una request cada P/N con una
+ráfaga de hasta N.
+
+Todas las claves de una request (p. ej. burst y sustained) se evalúan en un
+solo script Lua, atómico y en un único viaje a Redis: si alguna clave excede
+su límite, ninguna se consume. Si Redis no responde, se usa el mismo algoritmo
+en memoria del proceso durante REDIS_RETRY_DELAY segundos.
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'rl:'
+
+# Segundos en modo local tras un fallo de Redis antes de volver a intentarlo
+REDIS_RETRY_DELAY = 5
+
+# Claves en memoria a partir de las cuales se purgan las vencidas
+LOCAL_MAX_KEYS = 10000
+
+# KEYS: claves; ARGV: (límite, período_ms) por clave. Retorna {denegado, espera_ms...}
+GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + tonumber(t[2]) / 1000
+local denied = 0
+local tats = {}
+local waits = {}
+for i = 1, #KEYS do
+    local limit = tonumber(ARGV[2 * i - 1])
+    local period = tonumber(ARGV[2 * i])
+    local tat = tonumber(redis.call('GET', KEYS[i]) or now)
+    if tat < now then tat = now end
+    local new_tat = tat + period / limit
+    local allow_at = new_tat - period
+    if now < allow_at then
+        denied = 1
+        waits[i] = allow_at - now
+    else
+        waits[i] = 0
+    end
+    tats[i] = new_tat
+end
+if denied == 0 then
+    for i = 1, #KEYS do
+        redis.call('SET', KEYS[i], string.format('%.3f', tats[i]), 'PX', math.ceil(tats[i] - now))
+    end
+end
+local result = {denied}
+for i = 1, #KEYS do
+    result[i + 1] = string.format('%.3f', waits[i])
+end
+return result
+"""
+
+
+class _LocalStore:
+    """Misma evaluación GCRA que el script Lua, en memoria del proceso."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tats = {}
+
+    def check(self, limits, now_ms):
+        with self._lock:
+            new_tats, waits = [], []
+            for key, limit, period_ms in limits:
+                tat = max(self._tats.get(key, now_ms), now_ms)
+                new_tat = tat + period_ms / limit
+                allow_at = new_tat - period_ms
+                waits.append(max(allow_at - now_ms, 0.0))
+                new_tats.append(new_tat)
+
+            allowed = not any(waits)
+            if allowed:
+                for (key, _, _), new_tat in zip(limits, new_tats):
+                    self._tats[key] = new_tat
+                if len(self._tats) > LOCAL_MAX_KEYS:
+                    self._tats = {k: v for k, v in self._tats.items() if v > now_ms}
+            return allowed, waits
+
+
+class RateLimiter:
+    """
+    Evalúa varios límites a la vez.
+
+    Uso:
+        allowed, waits = limiter.check([('throttle_burst_12', 300, 60), ...])
+        # waits[i]: segundos a esperar por el límite i (0 si no lo excede)
+    """
+
+    def __init__(self):
+        self.local = _LocalStore()
+        self._script = None
+        self._redis_retry_at = 0.0
+
+    def _get_script(self):
+        from inventory_app.utils.redis_client import get_redis
+
+        client = get_redis()
+        if self._script is None or self._script[0] is not client:
+            self._script = (client, client.register_script(GCRA_SCRIPT))
+        return self._script[1]
+
+    def check(self, limits):
+        """
+        Args:
+            limits: lista de (clave, cantidad_de_requests, período_en_segundos)
+
+        Returns:
+            tuple: (permitido, [segundos de espera por límite])
+        """
+        if not limits:
+            return True, []
+        limits = [(KEY_PREFIX + key, limit, duration * 1000) for key, limit, duration in limits]
+
+        if time.monotonic() >= self._redis_retry_at:
+            from redis import RedisError
+
+            try:
+                result = self._get_script()(
+                    keys=[key for key, _, _ in limits],
+                    args=[value for _, limit, period in limits for value in (limit, period)],
+                )
+                return not int(result[0]), [float(wait) / 1000 for wait in result[1:]]
+            except RedisError as exc:
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_DELAY
+                logger.warning(f"Rate limiting en memoria local por {REDIS_RETRY_DELAY}s; Redis no disponible: {exc}")
+
+        allowed, waits = self.local.check(limits, time.time() * 1000)
+        return allowed, [wait / 1000 for wait in waits]
+
+
+limiter = RateLimiter()
@@ -0,0 +1,57 @@
+# utils/redis_client.py
+"""
+Cliente Redis compartido por la aplicación (eventos de tareas, locks, caché).
+Reutiliza la misma instancia de Redis configurada para Celery (settings.REDIS_URL).
+"""
+import asyncio
+import threading
+import weakref
+
+from django.conf import settings
+
+_client = None
+_lock = threading.Lock()
+
+# Los clientes de redis.asyncio quedan ligados al event loop que los usa
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_redis():
+    """
+    Retorna un cliente Redis compartido por proceso (con pool de conexiones interno).
+
+    La conexión es perezosa: crear el cliente no abre ningún socket, por lo que
+    un Redis caído solo produce errores (redis.RedisError) al usarlo.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                import redis
+
+                _client = redis.Redis.from_url(
+                    settings.REDIS_URL,
+                    socket_connect_timeout=getattr(settings, 'REDIS_CONNECT_TIMEOUT', 0.5),
+                    socket_timeout=getattr(settings, 'REDIS_SOCKET_TIMEOUT', 2),
+                    health_check_interval=30,
+                )
+    return _client
+
+
+def get_async_redis():
+    """
+    Retorna un cliente de redis.asyncio para el event loop en curso (perfil
+    ASGI), con la misma configuración que get_redis(). Perezoso igual que él.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        import redis.asyncio
+
+        client = _async_clients[loop] = redis.asyncio.Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=getattr(settings, 'REDIS_CONNECT_TIMEOUT', 0.5),
+            socket_timeout=getattr(settings, 'REDIS_SOCKET_TIMEOUT', 2),
+            health_check_interval=30,
+        )
+    return client
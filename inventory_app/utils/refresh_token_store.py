@@ -0,0 +1,135 @@
+# utils/refresh_token_store.py
+"""
+Registro de familias de refresh tokens en Redis (rotación con detección de reuso).
+
+Cada login inicia una "familia": el refresh token lleva el claim `fam` y Redis
+guarda el jti vigente de esa familia con TTL = REFRESH_TOKEN_LIFETIME. En cada
+/token/refresh/ el jti presentado debe ser el vigente; se reemplaza por el del
+token rotado con un único SET ... XX GET (un viaje a Redis, sin tablas).
+
+Si se presenta un jti que ya fue rotado (token robado y reutilizado, o
+reenviado por error), la familia completa se revoca y el usuario debe volver a
+iniciar sesión. Las claves expiran solas; no hay nada que depurar.
+
+Si Redis no está disponible, el refresh se permite (el mismo comportamiento
+que antes de este registro) y se registra una advertencia. Un token emitido
+sin poder registrar su familia (Redis caído en el login, o el registro
+desactivado) no lleva `fam`: se trata como un token anterior al registro y su
+primer refresh inicia la familia. Una familia registrada que Redis perdió (p.
+ej. reinicio sin persistencia) se trata como revocada.
+"""
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+FAMILY_CLAIM = 'fam'
+FAMILY_KEY = 'auth:rt:family:{}'
+USER_FAMILIES_KEY = 'auth:rt:user:{}'
+
+ROTATED = 'rotated'   # jti vigente: se registró el nuevo
+REUSED = 'reused'     # jti ya rotado: familia revocada
+UNKNOWN = 'unknown'   # familia revocada o vencida
+SKIPPED = 'skipped'   # registro desactivado o Redis no disponible
+
+
+def is_enabled():
+    return getattr(settings, 'REFRESH_TOKEN_FAMILY_STORE', True)
+
+
+def _lifetime_seconds():
+    from rest_framework_simplejwt.settings import api_settings
+
+    return int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+
+
+def start_family(refresh, user_id):
+    """
+    Inicia una familia para un refresh token recién emitido (login).
+    El jti del token es también el id de la familia. El claim `fam` se agrega
+    solo si la familia quedó registrada: sin él, rotate() no se consulta y el
+    token no se rechaza como de una familia desconocida.
+    """
+    if not is_enabled():
+        return refresh
+
+    from redis import RedisError
+    from inventory_app.utils.redis_client import get_redis
+
+    family = refresh['jti']
+    ttl = _lifetime_seconds()
+    user_key = USER_FAMILIES_KEY.format(user_id)
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.set(FAMILY_KEY.format(family), refresh['jti'], ex=ttl)
+        pipe.sadd(user_key, family)
+        pipe.expire(user_key, ttl)
+        pipe.execute()
+    except RedisError as exc:
+        logger.warning(f"No se pudo registrar la familia de refresh tokens: {exc}")
+        return refresh
+    refresh[FAMILY_CLAIM] = family
+    return refresh
+
+
+def rotate(family, presented_jti, new_jti, ttl):
+    """
+    Reemplaza el jti vigente de la familia por el del token rotado.
+
+    Returns:
+        str: ROTATED, REUSED, UNKNOWN o SKIPPED
+    """
+    if not is_enabled():
+        return SKIPPED
+
+    from redis import RedisError
+    from inventory_app.utils.redis_client import get_redis
+
+    key = FAMILY_KEY.format(family)
+    try:
+        redis_client = get_redis()
+        previous = redis_client.set(key, new_jti, xx=True, get=True, ex=max(int(ttl), 1))
+        if previous is None:
+            return UNKNOWN
+        if previous.decode() == presented_jti:
+            return ROTATED
+        redis_client.delete(key)
+    except RedisError as exc:
+        logger.warning(f"Registro de refresh tokens no disponible; se omite la verificación: {exc}")
+        return SKIPPED
+
+    logger.warning(f"Reuso de refresh token detectado: familia {family} revocada")
+    return REUSED
+
+
+def revoke_family(family):
+    """Revoca una familia (logout de una sesión)."""
+    if not is_enabled():
+        return
+
+    from redis import RedisError
+    from inventory_app.utils.redis_client import get_redis
+
+    try:
+        get_redis().delete(FAMILY_KEY.format(family))
+    except RedisError as exc:
+        logger.warning(f"No se pudo revocar la familia de refresh tokens {family}: {exc}")
+
+
+def revoke_user(user_id):
+    """Revoca todas las familias del usuario (cambio o restablecimiento de contraseña)."""
+    if not is_enabled():
+        return
+
+    from redis import RedisError
+    from inventory_app.utils.redis_client import get_redis
+
+    user_key = USER_FAMILIES_KEY.format(user_id)
+    try:
+        redis_client = get_redis()
+        families = redis_client.smembers(user_key)
+        keys = [FAMILY_KEY.format(family.decode()) for family in families]
+        redis_client.delete(user_key, *keys)
+    except RedisError as exc:
+        logger.warning(f"No se pudieron revocar los refresh tokens del usuario {user_id}: {exc}")
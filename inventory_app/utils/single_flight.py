@@ -0,0 +1,124 @@
+# utils/single_flight.py
+"""
+Deduplicación ("single-flight") de tareas de Celery idénticas mediante Redis.
+
+Dos solicitudes con la misma tarea y los mismos parámetros normalizados comparten
+una sola ejecución:
+- Si hay una ejecución en curso, la segunda solicitud recibe el task_id existente.
+- Si terminó hace poco, se reutiliza su resultado durante SINGLE_FLIGHT_RESULT_TTL.
+
+El lock se libera y el resultado se guarda desde el signal task_postrun
+(ver inventory_app/signals.py), usando el header `single_flight_key` del mensaje.
+"""
+import hashlib
+import json
+import logging
+import uuid
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'single-flight:'
+RESULT_SUFFIX = ':result'
+HEADER_NAME = 'single_flight_key'
+
+STATUS_STARTED = 'started'      # Se lanzó una tarea nueva
+STATUS_IN_FLIGHT = 'in_flight'  # Se adjuntó a una tarea en curso
+STATUS_CACHED = 'cached'        # Se reutilizó un resultado reciente
+
+
+def single_flight_key(task_name, params):
+    """
+    Clave de deduplicación para una tarea y sus parámetros.
+
+    Los parámetros vacíos se descartan y el orden de las claves no importa,
+    de modo que {'a': 1, 'b': None} y {'a': 1} producen la misma clave.
+    """
+    normalized = {k: v for k, v in (params or {}).items() if v not in (None, '', [], {})}
+    digest = hashlib.sha1(
+        json.dumps(normalized, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"{KEY_PREFIX}{task_name}:{digest}"
+
+
+def dispatch_single_flight(task, key_params, args=None, kwargs=None, **options):
+    """
+    Lanza la tarea salvo que ya exista una ejecución idéntica en curso o reciente.
+
+    Args:
+        task: Tarea de Celery
+        key_params: Parámetros que identifican el trabajo (p. ej. filtros del reporte)
+        args, kwargs: Argumentos de la tarea
+        **options: Opciones adicionales para apply_async (priority, queue, ...)
+
+    Returns:
+        dict: {'task_id', 'status': started | in_flight | cached, 'result' (solo cached)}
+    """
+    from redis import RedisError
+    from inventory_app.utils.redis_client import get_redis
+
+    key = single_flight_key(task.name, key_params)
+    lock_ttl = getattr(settings, 'SINGLE_FLIGHT_LOCK_TTL', 15 * 60)
+
+    try:
+        client = get_redis()
+        cached = client.get(key + RESULT_SUFFIX)
+        if cached:
+            data = json.loads(cached)
+            return {'task_id': data['task_id'], 'status': STATUS_CACHED, 'result': data['result']}
+
+        task_id = str(uuid.uuid4())
+        # Dos intentos: el lock ajeno pudo expirar entre SET NX y GET
+        for _ in range(2):
+            if client.set(key, task_id, nx=True, ex=lock_ttl):
+                break
+            existing = client.get(key)
+            if existing:
+                return {'task_id': existing.decode(), 'status': STATUS_IN_FLIGHT}
+        else:
+            key = None
+    except RedisError as exc:
+        # Sin Redis no hay deduplicación, pero la solicitud no debe fallar
+        logger.warning(f"Single-flight no disponible para {task.name}: {exc}")
+        key = None
+        task_id = str(uuid.uuid4())
+
+    headers = dict(options.pop('headers', None) or {})
+    if key:
+        headers[HEADER_NAME] = key
+    try:
+        task.apply_async(args=args, kwargs=kwargs, task_id=task_id, headers=headers, **options)
+    except Exception:
+        if key:
+            release(key, task_id)
+        raise
+    return {'task_id': task_id, 'status': STATUS_STARTED}
+
+
+def release(key, task_id, result=None):
+    """
+    Libera el lock de la ejecución y, si terminó bien, guarda su resultado.
+    Nunca lanza excepción: el lock expira solo si Redis no responde.
+
+    Args:
+        key: Clave single-flight de la ejecución
+        task_id: Tarea dueña del lock (no se libera un lock ajeno)
+        result: Resultado a reutilizar (None = la tarea falló)
+    """
+    from redis import RedisError
+    from inventory_app.utils.redis_client import get_redis
+
+    try:
+        client = get_redis()
+        if result is not None:
+            client.set(
+                key + RESULT_SUFFIX,
+                json.dumps({'task_id': task_id, 'result': result}),
+                ex=getattr(settings, 'SINGLE_FLIGHT_RESULT_TTL', 300),
+            )
+        owner = client.get(key)
+        if owner is not None and owner.decode() == task_id:
+            client.delete(key)
+    except RedisError as exc:
+        logger.warning(f"No se pudo liberar el lock single-flight {key}: {exc}")
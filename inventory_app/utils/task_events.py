@@ -0,0 +1,141 @@
+# utils/task_events.py
+"""
+Eventos de progreso y finalización de tareas de Celery vía Redis pub/sub.
+
+Las tareas publican eventos en el canal `task-events:<task_id>` y guardan el
+último evento en una clave con TTL, para que un cliente que se suscribe tarde
+reciba igualmente el estado final. El endpoint SSE (/api/tasks/<id>/events/)
+reenvía estos eventos al navegador; el polling de estado queda como respaldo.
+
+EventSource no puede enviar la cabecera Authorization: el stream acepta además
+un token firmado y de corta duración en `?token=` (make_stream_token), válido
+solo para una tarea y un usuario.
+"""
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = 'task-events:'
+LAST_EVENT_PREFIX = 'task-events:last:'
+PROGRESS_COUNTER_PREFIX = 'task-events:count:'
+EVENT_TTL_SECONDS = 3600  # Igual que CELERY_RESULT_EXPIRES
+
+STATE_STARTED = 'STARTED'
+STATE_PROGRESS = 'PROGRESS'
+STATE_SUCCESS = 'SUCCESS'
+STATE_FAILURE = 'FAILURE'
+TERMINAL_STATES = (STATE_SUCCESS, STATE_FAILURE)
+
+STREAM_TOKEN_SALT = 'task-events:stream'
+
+
+def channel_for(task_id):
+    return f"{CHANNEL_PREFIX}{task_id}"
+
+
+def make_stream_token(task_id, user_id):
+    """Token firmado (SECRET_KEY) para abrir el stream SSE de la tarea sin cabeceras."""
+    from django.core import signing
+
+    return signing.dumps({'task': task_id, 'user': user_id}, salt=STREAM_TOKEN_SALT)
+
+
+def read_stream_token(token, task_id, max_age):
+    """
+    Valida un token de make_stream_token.
+
+    Returns:
+        int | None: ID del usuario, o None si el token es inválido, expiró o
+        corresponde a otra tarea
+    """
+    from django.core import signing
+
+    try:
+        payload = signing.loads(token, salt=STREAM_TOKEN_SALT, max_age=max_age)
+    except signing.BadSignature:  # Incluye SignatureExpired
+        return None
+    if payload.get('task') != task_id:
+        return None
+    return payload.get('user')
+
+
+def publish_task_event(task_id, state, progress=None, result=None, error=None):
+    """
+    Publica un evento de la tarea. Nunca lanza excepción: si Redis no está
+    disponible el cliente seguirá pudiendo consultar el estado por polling.
+
+    Args:
+        task_id: ID de la tarea de Celery (None = no publicar, p. ej. en ejecución directa)
+        state: STARTED | PROGRESS | SUCCESS | FAILURE
+        progress: Porcentaje 0-100 (opcional)
+        result: Resultado de la tarea (solo SUCCESS)
+        error: Mensaje de error (solo FAILURE)
+    """
+    if not task_id:
+        return
+
+    event = {'task_id': task_id, 'state': state, 'timestamp': time.time()}
+    if progress is not None:
+        event['progress'] = int(progress)
+    if result is not None:
+        event['result'] = result
+        event['download_url'] = f"/media/{result}"
+    if error is not None:
+        event['error'] = error
+
+    payload = json.dumps(event)
+    try:
+        from redis import RedisError
+        from inventory_app.utils.redis_client import get_redis
+
+        client = get_redis()
+        pipe = client.pipeline(transaction=False)
+        pipe.set(f"{LAST_EVENT_PREFIX}{task_id}", payload, ex=EVENT_TTL_SECONDS)
+        pipe.publish(channel_for(task_id), payload)
+        pipe.execute()
+    except RedisError as exc:
+        logger.warning(f"No se pudo publicar el evento {state} de la tarea {task_id}: {exc}")
+
+
+def increment_progress(task_id, total):
+    """
+    Registra una unidad completada de una tarea compuesta (p. ej. un chord) y
+    publica el porcentaje acumulado.
+
+    Args:
+        task_id: ID de la tarea agregada (callback del chord)
+        total: Número total de unidades
+    """
+    if not task_id or not total:
+        return
+    try:
+        from redis import RedisError
+        from inventory_app.utils.redis_client import get_redis
+
+        client = get_redis()
+        key = f"{PROGRESS_COUNTER_PREFIX}{task_id}"
+        done = client.incr(key)
+        client.expire(key, EVENT_TTL_SECONDS)
+    except RedisError as exc:
+        logger.warning(f"No se pudo actualizar el progreso de la tarea {task_id}: {exc}")
+        return
+    # El 100% solo se publica con el evento SUCCESS del callback
+    publish_task_event(task_id, STATE_PROGRESS, progress=min(done * 100 // total, 99))
+
+
+def get_last_event(task_id):
+    """Retorna el último evento publicado (dict) o None."""
+    from inventory_app.utils.redis_client import get_redis
+
+    raw = get_redis().get(f"{LAST_EVENT_PREFIX}{task_id}")
+    return json.loads(raw) if raw else None
+
+
+async def aget_last_event(task_id):
+    """Versión async de get_last_event() (stream SSE con ASGI)."""
+    from inventory_app.utils.redis_client import get_async_redis
+
+    raw = await get_async_redis().get(f"{LAST_EVENT_PREFIX}{task_id}")
+    return json.loads(raw) if raw else None
@@ -1,19 +1,60 @@
-# validators/image_validators.py
 """
 Validadores para imágenes de productos.
+
+Solo leen la cabecera del archivo (formato y dimensiones) sin decodificar los
+píxeles; la decodificación completa ocurre en el worker que genera las
+variantes (ver services/product_image_service.py).
 """
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext as _
 
+from inventory_app.constants import ImageConfig
+
+# Lectura de la cabecera: tamaño de cada bloque y máximo de bytes a leer
+HEADER_CHUNK_SIZE = 1024
+HEADER_READ_LIMIT = 256 * 1024
+
+
+def read_image_header(image):
+    """
+    Obtiene formato y dimensiones leyendo solo los primeros bloques del archivo.
+
+    Args:
+        image: Archivo subido o FieldFile
+
+    Returns:
+        tuple: (formato, ancho, alto); (None, 0, 0) si no es una imagen reconocible
+    """
+    from PIL import ImageFile
+
+    position = image.tell()
+    image.seek(0)
+    parser = ImageFile.Parser()
+    read = 0
+    try:
+        while read < HEADER_READ_LIMIT:
+            chunk = image.read(HEADER_CHUNK_SIZE)
+            if not chunk:
+                break
+            read += len(chunk)
+            try:
+                parser.feed(chunk)
+            except Exception:
+                break
+            if parser.image is not None:
+                return parser.image.format, parser.image.size[0], parser.image.size[1]
+    finally:
+        image.seek(position)
+    return None, 0, 0
+
 
 def validate_image_size(image):
     """
     Valida que la imagen no exceda el tamaño máximo permitido (2 MB).
     """
-    max_size_mb = 2
-    max_size_bytes = max_size_mb * 1024 * 1024  # 2 MB en bytes
+    max_size_mb = ImageConfig.MAX_SIZE_MB
 
-    if image.size > max_size_bytes:
+    if image.size > ImageConfig.MAX_SIZE_BYTES:
         raise ValidationError(
             _(f"La imagen no puede exceder {max_size_mb} MB. Tamaño actual: {image.size / (1024 * 1024):.2f} MB."),
             code='image_too_large',
@@ -22,17 +63,20 @@ def validate_image_size(image):
 
 def validate_image_dimensions(image):
     """
-    Valida que la imagen tenga dimensiones razonables.
+    Valida formato (JPEG o PNG) y dimensiones leyendo solo la cabecera.
     Mínimo: 300x300 px
     Máximo: 2000x2000 px
     """
-    from PIL import Image as PILImage
+    image_format, width, height = read_image_header(image)
 
-    img = PILImage.open(image)
-    width, height = img.size
+    if image_format not in ImageConfig.ALLOWED_FORMATS:
+        raise ValidationError(
+            _("El archivo no es una imagen válida. Formatos permitidos: JPEG o PNG."),
+            code='invalid_image',
+        )
 
-    min_dimension = 300
-    max_dimension = 2000
+    min_dimension = ImageConfig.MIN_WIDTH
+    max_dimension = ImageConfig.MAX_WIDTH
 
     if width < min_dimension or height < min_dimension:
         raise ValidationError(
@@ -6,13 +6,18 @@ from rest_framework.response import Response
 from django.utils import timezone
 from inventory_app.models.alert import Alert
 from inventory_app.serializers.alert_serializer import AlertSerializer
+from inventory_app.views.async_base import AsyncGenericAPIView, AsyncListMixin
 
 class AlertListView(generics.ListAPIView):
     serializer_class = AlertSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Alert.objects.filter(deleted_at__isnull=True).order_by("-created_at")
+        # product_name del serializer: un JOIN en lugar de una consulta por alerta
+        return Alert.objects.filter(deleted_at__isnull=True).select_related("product").order_by("-created_at")
+
+class AsyncAlertListView(AsyncListMixin, AlertListView, AsyncGenericAPIView):
+    """AlertListView con GET async (perfil ASGI, ver views/async_base.py)."""
 
 class AlertUpdateView(APIView):
     permission_classes = [IsAuthenticated]
@@ -0,0 +1,115 @@
+# views/async_base.py
+"""
+Vistas DRF con handlers async para el perfil ASGI (uvicorn).
+
+DRF despacha siempre de forma síncrona. AsyncAPIView despacha con async: la
+autenticación, los permisos y el throttling (que consultan Redis o la base)
+corren juntos en un solo salto a un hilo, y los handlers definidos con
+`async def` usan el ORM async (aget, acount, aaggregate, `async for`). Los
+handlers síncronos de la misma vista (p. ej. el POST de un ListCreateAPIView)
+siguen funcionando: se ejecutan en un hilo con sync_to_async.
+
+Cada vista async es una variante de la vista síncrona, que hereda primero de
+ella y después de AsyncAPIView/AsyncGenericAPIView: comparte queryset,
+serializer y permisos y solo redefine el GET. urls.py enruta la variante async
+solo con SERVER_INTERFACE='asgi'; con WSGI Django ejecutaría la vista async con
+async_to_sync (un event loop por request) y se sirve la síncrona.
+"""
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.paginator import InvalidPage
+from rest_framework import generics
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """APIView con dispatch async (ver docstring del módulo)."""
+
+    # Django exige que todos los handlers sean sync o async; el dispatch async
+    # adapta los síncronos, así que la vista se declara async siempre
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        if isinstance(getattr(self.response, 'accepted_renderer', None), JSONRenderer):
+            # Django renderiza la respuesta en un hilo (la API navegable puede consultar
+            # la base); el JSON no lo hace y se renderiza acá, sin ese salto
+            self.response.render()
+        return self.response
+
+
+class AsyncGenericAPIView(AsyncAPIView, generics.GenericAPIView):
+    """GenericAPIView con dispatch async y listado/paginación con el ORM async."""
+
+    async def alist(self, request, *args, **kwargs):
+        """Equivalente async de ListModelMixin.list()."""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        instances = [instance async for instance in queryset]
+        return Response(self.get_serializer(instances, many=True).data)
+
+    async def apaginate_queryset(self, queryset):
+        """
+        Equivalente async de PageNumberPagination.paginate_queryset: cuenta con
+        acount() y lee la página con `async for`. La respuesta paginada se
+        construye igual con get_paginated_response().
+        """
+        pagination = self.paginator
+        if pagination is None:
+            return None
+
+        request = self.request
+        page_size = pagination.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = pagination.django_paginator_class(queryset, page_size)
+        # Paginator.count es cached_property: se precarga para no contar en sync
+        paginator.count = await queryset.acount()
+        page_number = pagination.get_page_number(request, paginator)
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(pagination.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+
+        page.object_list = [row async for row in page.object_list]
+        if paginator.num_pages > 1 and pagination.template is not None:
+            pagination.display_page_controls = True
+        pagination.page = page
+        pagination.request = request
+        return page.object_list
+
+
+class AsyncListMixin:
+    """GET async con alist(); va antes de la vista síncrona en las bases."""
+
+    async def get(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
@@ -3,20 +3,26 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 from rest_framework.permissions import BasePermission
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
-from django.core.mail import send_mail
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
-from django.conf import settings
 from inventory_app.models.user import User
+from inventory_app.authentication import set_user_claims
+from inventory_app.utils import refresh_token_store
+from inventory_app.constants import TaskPriority
 from inventory_app.serializers.user_serializer import UserSerializer
 from inventory_app.throttles import (
     LoginRateThrottle,
     PasswordResetRateThrottle,
     PasswordChangeRateThrottle,
 )
+from inventory_app.tasks import send_password_reset_email
+import logging
+
+logger = logging.getLogger(__name__)
 
 # --- Login (JWT) ---
 class LoginView(APIView):
@@ -32,20 +38,37 @@ class LoginView(APIView):
             if not user.is_active:
                 return Response({'message': 'El usuario está inactivo. Contacta al administrador.'}, status=status.HTTP_403_FORBIDDEN)
 
-            # Generar tokens JWT
-            refresh = RefreshToken.for_user(user)
+            # Generar tokens JWT (el access token lleva role/email/name para el modo stateless)
+            refresh = refresh_token_store.start_family(RefreshToken.for_user(user), user.id)
+            access = set_user_claims(refresh.access_token, user)
             serializer = UserSerializer(user)
 
             return Response({
                 'message': 'Inicio de sesión exitoso',
                 'user': serializer.data,
                 'tokens': {
-                    'access': str(refresh.access_token),
+                    'access': str(access),
                     'refresh': str(refresh),
                 }
             })
         return Response({'message': 'Credenciales incorrectas'}, status=status.HTTP_401_UNAUTHORIZED)
 
+# --- Logout ---
+class LogoutView(APIView):
+    authentication_classes = []  # Basta con el refresh token de la sesión
+    permission_classes = []
+
+    def post(self, request):
+        try:
+            refresh = RefreshToken(request.data.get('refresh'))
+        except TokenError:
+            return Response({'message': 'El token es inválido o ha expirado'}, status=status.HTTP_400_BAD_REQUEST)
+
+        family = refresh.get(refresh_token_store.FAMILY_CLAIM)
+        if family is not None:
+            refresh_token_store.revoke_family(family)
+        return Response({'message': 'Sesión cerrada'})
+
 # --- Forgot Password ---
 class ForgotPasswordView(APIView):
     throttle_classes = [PasswordResetRateThrottle]
@@ -54,31 +77,15 @@ class ForgotPasswordView(APIView):
         email = request.data.get('email')
         generic_message = 'Si el correo está registrado, recibirás un enlace de recuperación.'
 
-        try:
-            user = User.objects.get(email=email)
-            token = default_token_generator.make_token(user)
-            uid = user.pk
-
-            # Obtener URL del frontend desde variables de entorno
-            frontend_base_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:3000')
-            reset_url = f"{frontend_base_url}/reset-password?uid={uid}&token={token}"
-            send_mail(
-                subject="Recupera tu contraseña",
-                message=(
-                    f"Hola,\n\n"
-                    f"Hemos recibido una solicitud para restablecer la contraseña de tu cuenta en QualityCore Services.\n\n"
-                    f"Para crear una nueva contraseña, haz clic en el siguiente enlace o cópialo y pégalo en tu navegador:\n"
-                    f"{reset_url}\n\n"
-                    f"Si tú no solicitaste este cambio, puedes ignorar este correo y tu contraseña actual seguirá siendo válida. Si tienes alguna duda o detectas actividad sospechosa, por favor comunícate con la administradora.\n\n"
-                    f"Gracias por confiar en nosotros.\n"
-                    f"Equipo de QualityCore Services"
-                ),
-                from_email=None,
-                recipient_list=[user.email],
-                fail_silently=False,
-            )
-        except User.DoesNotExist:
-            pass  # No revelar si el email existe o no
+        # La búsqueda del usuario y el envío ocurren en el worker (cola notifications):
+        # la respuesta tarda lo mismo exista o no el correo y no espera al servidor SMTP
+        if isinstance(email, str) and email.strip():
+            try:
+                send_password_reset_email.apply_async(
+                    args=[email.strip()], priority=TaskPriority.INTERACTIVE
+                )
+            except Exception as e:
+                logger.error(f"No se pudo encolar el correo de recuperación: {e}")
 
         return Response({'message': generic_message})
 
@@ -106,6 +113,7 @@ class ResetPasswordView(APIView):
 
                 user.set_password(new_password)
                 user.save()
+                refresh_token_store.revoke_user(user.id)
                 return Response({'message': 'Contraseña actualizada correctamente'})
             else:
                 return Response({'message': 'El token es inválido o ha expirado'}, status=status.HTTP_400_BAD_REQUEST)
@@ -139,5 +147,8 @@ class ChangePasswordView(APIView):
             return Response({'error': list(e.messages)}, status=status.HTTP_400_BAD_REQUEST)
 
         user.set_password(new_password)
-        user.save()
+        # request.user puede venir de la caché o de los claims del token: solo se escribe la contraseña
+        user.save(update_fields=['password'])
+        # Cierra las demás sesiones: sus refresh tokens dejan de rotar
+        refresh_token_store.revoke_user(user.id)
         return Response({'message': 'Contraseña cambiada exitosamente'}, status=status.HTTP_200_OK)
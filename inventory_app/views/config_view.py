@@ -9,6 +9,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 
 from inventory_app.constants import BusinessRules, Timeouts, ImageConfig
+from inventory_app.views.async_base import AsyncAPIView
 
 
 class ConfigView(APIView):
@@ -20,7 +21,10 @@ class ConfigView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
-        config = {
+        return Response(self.get_config())
+
+    def get_config(self):
+        return {
             # Tasas de impuestos
             'tax_rate': {
                 'iva': BusinessRules.TAX_RATE,
@@ -70,4 +74,9 @@ class ConfigView(APIView):
             },
         }
 
-        return Response(config)
+
+class AsyncConfigView(ConfigView, AsyncAPIView):
+    """ConfigView con GET async (perfil ASGI, ver views/async_base.py)."""
+
+    async def get(self, request):
+        return Response(self.get_config())
@@ -4,31 +4,50 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from inventory_app.models import Product, Customer, Movement, Quotation
 from inventory_app.models.alert import Alert
+from inventory_app.views.async_base import AsyncAPIView
 from django.db.models import Count, Sum, Q
 
+MOVEMENT_STATS = dict(
+    total=Count('id'),
+    entries=Count('id', filter=Q(movement_type='input')),
+    exits=Count('id', filter=Q(movement_type='output')),
+    total_sales=Sum('quantity', filter=Q(movement_type='output'))
+)
+
+
+def summary_data(total_products, total_customers, movement_stats, low_stock_alerts):
+    return {
+        "total_products": total_products,
+        "total_customers": total_customers,
+        "total_movements": movement_stats['total'],
+        "total_entries": movement_stats['entries'],
+        "total_exits": movement_stats['exits'],
+        "low_stock_alerts": low_stock_alerts,
+        "total_sales": movement_stats['total_sales'] or 0
+    }
+
+
 class DashboardSummaryView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         total_products = Product.objects.filter(deleted_at__isnull=True).count()
         total_customers = Customer.objects.filter(deleted_at__isnull=True).count()
-        movement_stats = Movement.objects.filter(deleted_at__isnull=True).aggregate(
-            total=Count('id'),
-            entries=Count('id', filter=Q(movement_type='input')),
-            exits=Count('id', filter=Q(movement_type='output')),
-            total_sales=Sum('quantity', filter=Q(movement_type='output'))
-        )
+        movement_stats = Movement.objects.filter(deleted_at__isnull=True).aggregate(**MOVEMENT_STATS)
 
         low_stock_alerts = Alert.objects.filter(deleted_at__isnull=True).count()
 
-        data = {
-            "total_products": total_products,
-            "total_customers": total_customers,
-            "total_movements": movement_stats['total'],
-            "total_entries": movement_stats['entries'],
-            "total_exits": movement_stats['exits'],
-            "low_stock_alerts": low_stock_alerts,
-            "total_sales": movement_stats['total_sales'] or 0
-        }
-
-        return Response(data)
+        return Response(summary_data(total_products, total_customers, movement_stats, low_stock_alerts))
+
+
+class AsyncDashboardSummaryView(DashboardSummaryView, AsyncAPIView):
+    """DashboardSummaryView con el ORM async (perfil ASGI, ver views/async_base.py)."""
+
+    async def get(self, request):
+        total_products = await Product.objects.filter(deleted_at__isnull=True).acount()
+        total_customers = await Customer.objects.filter(deleted_at__isnull=True).acount()
+        movement_stats = await Movement.objects.filter(deleted_at__isnull=True).aaggregate(**MOVEMENT_STATS)
+
+        low_stock_alerts = await Alert.objects.filter(deleted_at__isnull=True).acount()
+
+        return Response(summary_data(total_products, total_customers, movement_stats, low_stock_alerts))
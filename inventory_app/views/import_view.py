@@ -0,0 +1,40 @@
+# views/import_view.py
+from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from inventory_app.permissions import IsAdmin
+from inventory_app.services.contact_import_service import ContactImportService
+
+
+class ContactImportView(APIView):
+    """
+    POST /api/<customers|suppliers>/import/[?dry_run=true]  (multipart, campo `file`)
+    Importa un CSV en lote y retorna el resumen con los errores por fila.
+    """
+    permission_classes = [IsAdmin]
+    parser_classes = (MultiPartParser,)
+    kind = None
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"message": "Debe adjuntar un archivo CSV en el campo 'file'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = request.query_params.get("dry_run", "").lower() in ("1", "true")
+        try:
+            result = ContactImportService.import_csv(self.kind, upload.file, dry_run=dry_run)
+        except ValueError as e:
+            # Incluye la codificación, verificada antes de crear el primer lote
+            return Response({"message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        result["dry_run"] = dry_run
+        return Response(result, status=status.HTTP_200_OK if dry_run or not result["created"] else status.HTTP_201_CREATED)
+
+
+class CustomerImportView(ContactImportView):
+    kind = "customers"
+
+
+class SupplierImportView(ContactImportView):
+    kind = "suppliers"
@@ -0,0 +1,49 @@
+# views/inventory_view.py
+from datetime import date as date_type
+from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django.utils import timezone
+from inventory_app.models.product import Product
+from inventory_app.services.stock_snapshot_service import StockSnapshotService
+
+
+class InventoryAsOfView(APIView):
+    """
+    GET /api/inventory/as-of/?date=YYYY-MM-DD[&product=<id>]
+    Retorna el stock de cada producto al cierre del día indicado.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        raw_date = request.query_params.get("date")
+        try:
+            day = date_type.fromisoformat(raw_date) if raw_date else None
+        except ValueError:
+            day = None
+        if day is None:
+            return Response({"message": "Fecha inválida. Use el formato YYYY-MM-DD."}, status=status.HTTP_400_BAD_REQUEST)
+        if day > timezone.localdate():
+            return Response({"message": "La fecha no puede ser futura."}, status=status.HTTP_400_BAD_REQUEST)
+
+        product_ids = None
+        product_param = request.query_params.get("product")
+        if product_param:
+            try:
+                product_ids = [int(product_param)]
+            except ValueError:
+                return Response({"message": "Producto inválido."}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = StockSnapshotService.get_stock_as_of(day, product_ids)
+        stock = result["stock"]
+        names = dict(Product.objects.filter(id__in=stock.keys()).values_list("id", "name"))
+
+        return Response({
+            "date": day,
+            "snapshot_date": result["snapshot_date"],
+            "results": [
+                {"product": product_id, "product_name": names.get(product_id, ""), "stock": quantity}
+                for product_id, quantity in sorted(stock.items())
+            ],
+        })
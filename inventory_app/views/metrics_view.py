@@ -0,0 +1,38 @@
+# views/metrics_view.py
+from django.http import HttpResponse
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from redis import RedisError
+
+from inventory_app.permissions import HasMetricsAccess
+from inventory_app.utils.metrics import render_prometheus
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsView(APIView):
+    """
+    Expone las métricas HTTP agregadas de todos los workers en formato de texto de Prometheus.
+
+    Configuración del scraper:
+        authorization:
+          type: Metrics
+          credentials: <METRICS_TOKEN>
+    """
+    permission_classes = [HasMetricsAccess]
+    throttle_classes = []
+
+    def get(self, request):
+        try:
+            body = render_prometheus()
+        except RedisError as e:
+            logger.warning(f"Métricas no disponibles: {e}")
+            return Response(
+                {"error": "Métricas no disponibles"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        return HttpResponse(body, content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,40 @@
+# views/mixins.py
+from django.conf import settings
+from rest_framework.response import Response
+
+
+class ValuesListMixin:
+    """
+    Listado (GET) con un ValuesSerializer en lugar del serializer del modelo:
+    sin instancias por fila ni campos DRF (ver serializers/values_serializer.py).
+    Se desactiva con FAST_LIST_SERIALIZERS=False. En vistas async
+    (views/async_base.py) el listado usa alist().
+    """
+    values_serializer_class = None
+
+    def _values_serializer(self):
+        if not getattr(settings, 'FAST_LIST_SERIALIZERS', True):
+            return None
+        return self.values_serializer_class
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self._values_serializer()
+        if serializer_class is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = serializer_class.project(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer_class(page, many=True).data)
+        return Response(serializer_class(rows, many=True).data)
+
+    async def alist(self, request, *args, **kwargs):
+        serializer_class = self._values_serializer()
+        if serializer_class is None:
+            return await super().alist(request, *args, **kwargs)
+
+        rows = serializer_class.project(self.filter_queryset(self.get_queryset()))
+        page = await self.apaginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer_class(page, many=True).data)
+        return Response(serializer_class([row async for row in rows], many=True).data)
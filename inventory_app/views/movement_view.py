@@ -3,17 +3,20 @@ from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from inventory_app.models.movement import Movement
-from inventory_app.serializers.movement_serializer import MovementSerializer
+from inventory_app.serializers.movement_serializer import MovementSerializer, MovementValuesSerializer
 from inventory_app.constants import MovementType
+from inventory_app.views.mixins import ValuesListMixin
 
-class MovementListCreateView(generics.ListCreateAPIView):
+class MovementListCreateView(ValuesListMixin, generics.ListCreateAPIView):
     # Optimización: select_related para evitar N+1 queries al serializar
     queryset = Movement.objects.filter(deleted_at__isnull=True).select_related(
         'product',
+        'product__supplier',
         'user',
         'customer'
     ).order_by("-id")
     serializer_class = MovementSerializer
+    values_serializer_class = MovementValuesSerializer  # Listado: proyección por values_list()
     permission_classes = [IsAuthenticated]
 
     def create(self, request, *args, **kwargs):
@@ -1,20 +1,24 @@
 # views/product_view.py
 from rest_framework import generics
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
 from inventory_app.models.product import Product
-from inventory_app.serializers.product_serializer import ProductSerializer
+from inventory_app.serializers.product_serializer import ProductSerializer, ProductValuesSerializer
+from inventory_app.parsers import OrjsonParser
 from inventory_app.permissions import IsAdminForWrite
+from inventory_app.views.async_base import AsyncGenericAPIView, AsyncListMixin
+from inventory_app.views.mixins import ValuesListMixin
 
 
-class ProductListCreateView(generics.ListCreateAPIView):
+class ProductListCreateView(ValuesListMixin, generics.ListCreateAPIView):
     # Optimización: select_related para evitar N+1 queries
     queryset = Product.objects.filter(deleted_at__isnull=True).select_related(
         'category',
         'supplier'
     ).order_by('-id')  # Ordenar por ID descendente (más recientes primero)
     serializer_class = ProductSerializer
+    values_serializer_class = ProductValuesSerializer  # Listado: proyección por values_list()
     permission_classes = [IsAdminForWrite]
-    parser_classes = (MultiPartParser, FormParser, JSONParser)
+    parser_classes = (MultiPartParser, FormParser, OrjsonParser)
 
     def get_serializer_context(self):
         ctx = super().get_serializer_context()
@@ -22,11 +26,15 @@ class ProductListCreateView(generics.ListCreateAPIView):
         return ctx
 
 
+class AsyncProductListCreateView(AsyncListMixin, ProductListCreateView, AsyncGenericAPIView):
+    """GET async (perfil ASGI); el POST con la imagen sigue siendo síncrono."""
+
+
 class ProductDetailView(generics.RetrieveUpdateAPIView):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
     permission_classes = [IsAdminForWrite]
-    parser_classes = (MultiPartParser, FormParser, JSONParser)
+    parser_classes = (MultiPartParser, FormParser, OrjsonParser)
 
     def get_serializer_context(self):
         ctx = super().get_serializer_context()
@@ -6,8 +6,8 @@ from rest_framework.response import Response
 from inventory_app.models.quotation import Quotation
 from inventory_app.models.report import Report
 from inventory_app.serializers.quotation_serializer import QuotationSerializer
-from inventory_app.tasks import generate_quotation_pdf
-from inventory_app.constants import UserRole
+from inventory_app.tasks import generate_quotation_pdf, start_quotation_pdf_batch
+from inventory_app.constants import UserRole, TaskPriority
 from datetime import datetime
 import os
 from decimal import Decimal
@@ -49,13 +49,15 @@ class QuotationListView(generics.ListAPIView):
 
     def get_queryset(self):
         user = self.request.user
+        # quoted_products anidados: una sola consulta adicional para toda la página
+        queryset = Quotation.objects.filter(deleted_at__isnull=True).prefetch_related('quoted_products')
         if user.role in [UserRole.ADMINISTRATOR, UserRole.SUPER_ADMIN]:
-            return Quotation.objects.filter(deleted_at__isnull=True).order_by('-date')
+            return queryset.order_by('-date')
         else:
-            return Quotation.objects.filter(user=user, deleted_at__isnull=True).order_by('-date')
+            return queryset.filter(user=user).order_by('-date')
 
 class QuotationDetailView(generics.RetrieveAPIView):
-    queryset = Quotation.objects.filter(deleted_at__isnull=True).order_by('-id')
+    queryset = Quotation.objects.filter(deleted_at__isnull=True).prefetch_related('quoted_products').order_by('-id')
     serializer_class = QuotationSerializer
     permission_classes = [IsAuthenticated]
 
@@ -73,7 +75,8 @@ class QuotationPDFView(APIView):
         Returns:
             {
                 "task_id": "uuid-de-la-tarea",
-                "message": "PDF generation started"
+                "message": "PDF generation started",
+                "events_url": "/api/tasks/<task_id>/events/" (SSE; el polling de estado sigue disponible)
             }
         """
         try:
@@ -85,15 +88,80 @@ class QuotationPDFView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Lanzar tarea asíncrona
-        task = generate_quotation_pdf.delay(quotation_id, request.user.id)
+        # Lanzar tarea asíncrona (cola pdf_interactive, máxima prioridad)
+        task = generate_quotation_pdf.apply_async(
+            args=[quotation_id, request.user.id],
+            priority=TaskPriority.INTERACTIVE
+        )
 
         logger.info(f"Task de generación de PDF iniciada: {task.id} para cotización {quotation_id}")
 
         return Response({
             "task_id": task.id,
             "message": "PDF generation started",
-            "quotation_id": quotation_id
+            "quotation_id": quotation_id,
+            "events_url": f"/api/tasks/{task.id}/events/"
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class QuotationPDFBatchView(APIView):
+    """
+    Exporta varias cotizaciones en un único ZIP.
+    Los PDFs se renderizan en paralelo en los workers de Celery y un callback
+    genera el archivo final; el cliente consulta un único task_id.
+    """
+    permission_classes = [IsAuthenticated]
+
+    MAX_BATCH_SIZE = 100
+
+    def post(self, request):
+        """
+        Body: {"quotation_ids": [1, 2, 3]}
+
+        Returns:
+            {
+                "task_id": "uuid-del-callback",
+                "message": "Batch PDF generation started",
+                "quotation_ids": [1, 2, 3]
+            }
+        """
+        raw_ids = request.data.get("quotation_ids")
+        if not isinstance(raw_ids, list) or not raw_ids:
+            return Response(
+                {"error": "Debe enviar una lista de cotizaciones en 'quotation_ids'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            quotation_ids = list(dict.fromkeys(int(qid) for qid in raw_ids))
+        except (TypeError, ValueError):
+            return Response({"error": "IDs de cotización inválidos"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(quotation_ids) > self.MAX_BATCH_SIZE:
+            return Response(
+                {"error": f"Máximo {self.MAX_BATCH_SIZE} cotizaciones por exportación"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Mismas reglas de visibilidad que QuotationListView
+        quotations = Quotation.objects.filter(id__in=quotation_ids, deleted_at__isnull=True)
+        if request.user.role not in [UserRole.ADMINISTRATOR, UserRole.SUPER_ADMIN]:
+            quotations = quotations.filter(user=request.user)
+        found = set(quotations.values_list("id", flat=True))
+        missing = [qid for qid in quotation_ids if qid not in found]
+        if missing:
+            return Response(
+                {"error": "Cotizaciones no encontradas", "quotation_ids": missing},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        task = start_quotation_pdf_batch(quotation_ids, request.user.id)
+
+        logger.info(f"Exportación por lotes iniciada: {task.id} ({len(quotation_ids)} cotizaciones)")
+
+        return Response({
+            "task_id": task.id,
+            "message": "Batch PDF generation started",
+            "quotation_ids": quotation_ids,
+            "events_url": f"/api/tasks/{task.id}/events/"
         }, status=status.HTTP_202_ACCEPTED)
 
 
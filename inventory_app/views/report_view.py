@@ -6,18 +6,17 @@ from rest_framework.response import Response
 from inventory_app.models.report import Report
 from inventory_app.models.movement import Movement
 from inventory_app.serializers.report_serializer import ReportSerializer
-from inventory_app.constants import UserRole
+from inventory_app.constants import UserRole, MovementType, TaskPriority
+from inventory_app.tasks import generate_movements_report_pdf
+from inventory_app.utils.file_serving import serve_protected_file
+from inventory_app.utils import single_flight
 from datetime import datetime, timedelta
 from django.conf import settings
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, HRFlowable
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
 from django.db.models import Sum
 from django.urls import reverse
-from django.http import FileResponse, Http404
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from pathlib import Path
+import mimetypes
 import os
 
 class ReportDownloadView(APIView):
@@ -29,14 +28,13 @@ class ReportDownloadView(APIView):
         # if report.user != request.user and getattr(request.user, "role", "") != UserRole.ADMINISTRATOR:
         #     return Response(status=status.HTTP_403_FORBIDDEN)
 
-        file_path = Path(settings.MEDIA_ROOT) / report.file.name  # e.g. reports/xxxx.pdf
-        if not file_path.exists():
+        # El envío de bytes puede delegarse al proxy (X-Accel-Redirect / X-Sendfile)
+        try:
+            content_type = mimetypes.guess_type(report.file.name)[0] or "application/octet-stream"
+            return serve_protected_file(request, report.file.name, content_type)  # e.g. reports/xxxx.pdf
+        except FileNotFoundError:
             raise Http404("Archivo no encontrado")
 
-        resp = FileResponse(open(file_path, "rb"), content_type="application/pdf")
-        resp["Content-Disposition"] = f'inline; filename="{file_path.name}"'
-        return resp
-
 class ReportListView(generics.ListAPIView):
     serializer_class = ReportSerializer
     permission_classes = [IsAuthenticated]
@@ -63,6 +61,12 @@ class ReportGeneratePDFView(APIView):
         except Exception:
             return Response({"message": "Fechas inválidas"}, status=status.HTTP_400_BAD_REQUEST)
 
+        # reportlab se carga solo al generar un PDF, no al iniciar el worker web
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, HRFlowable
+
         now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         filename = f"report_{report_type}_{now}.pdf"
         filepath = os.path.join(settings.MEDIA_ROOT, 'reports', filename)
@@ -179,4 +183,68 @@ class ReportGeneratePDFView(APIView):
         return Response({
             "message": "Reporte generado correctamente",
             "url": reverse("report-download", args=[report.id]) 
-        })
\ No newline at end of file
+        })
+
+
+class ReportGenerateAsyncView(APIView):
+    """
+    Genera el reporte de movimientos en segundo plano (cola reports_bulk).
+
+    Las solicitudes idénticas (mismos filtros normalizados) comparten una sola
+    ejecución: un doble clic o varios usuarios pidiendo el mismo mes reciben el
+    task_id en curso, o el resultado reciente si ya terminó.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        Body: {"start_date": "YYYY-MM-DD", "end_date": "YYYY-MM-DD", "movement_type": "input|output"}
+
+        Returns:
+            202 {"task_id", "status": "started|in_flight", "events_url"}
+            200 {"task_id", "status": "cached", "result", "download_url"}
+        """
+        start_date = request.data.get("start_date")
+        end_date = request.data.get("end_date")
+        movement_type = request.data.get("movement_type")
+
+        try:
+            start_dt = datetime.strptime(start_date, "%Y-%m-%d") if start_date else None
+            end_dt = (
+                datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1) - timedelta(seconds=1)
+                if end_date else None
+            )
+        except (TypeError, ValueError):
+            return Response({"message": "Fechas inválidas"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if movement_type and movement_type not in (MovementType.INPUT, MovementType.OUTPUT):
+            return Response({"message": "Tipo de movimiento inválido"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Filtros normalizados: también son la clave de deduplicación
+        filters = {
+            "start_date": start_dt.isoformat() if start_dt else None,
+            "end_date": end_dt.isoformat() if end_dt else None,
+            "movement_type": movement_type or None,
+        }
+        filters = {key: value for key, value in filters.items() if value}
+
+        flight = single_flight.dispatch_single_flight(
+            generate_movements_report_pdf,
+            key_params=filters,
+            args=[request.user.id, filters],
+            priority=TaskPriority.NORMAL,
+        )
+
+        if flight["status"] == single_flight.STATUS_CACHED:
+            return Response({
+                "task_id": flight["task_id"],
+                "status": flight["status"],
+                "result": flight["result"],
+                "download_url": f"/media/{flight['result']}",
+            }, status=status.HTTP_200_OK)
+
+        return Response({
+            "task_id": flight["task_id"],
+            "status": flight["status"],
+            "events_url": f"/api/tasks/{flight['task_id']}/events/",
+        }, status=status.HTTP_202_ACCEPTED)
@@ -0,0 +1,255 @@
+# views/task_view.py
+import json
+import time
+import logging
+import threading
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from inventory_app.authentication import StreamTokenAuthentication
+from inventory_app.renderers import EventStreamRenderer, OrjsonRenderer
+from inventory_app.utils import task_events
+
+logger = logging.getLogger(__name__)
+
+
+class StreamSlots:
+    """
+    Cupos de streams SSE síncronos del proceso. Con WSGI cada stream ocupa un
+    thread de gunicorn hasta TASK_EVENTS_STREAM_TIMEOUT segundos: sin un límite,
+    unos pocos clientes dejan al worker sin threads para el resto de la API.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active = 0
+
+    def acquire(self):
+        limit = getattr(settings, "TASK_EVENTS_MAX_STREAMS", 2)
+        with self._lock:
+            if limit and self._active >= limit:
+                return False
+            self._active += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self._active -= 1
+
+
+stream_slots = StreamSlots()
+
+
+class _SlotStream:
+    """
+    Iterador del stream que libera el cupo al cerrarse la respuesta. Django
+    llama a close() aunque el cliente se desconecte antes del primer evento,
+    cuando el `finally` de un generador sin iniciar no llegaría a ejecutarse.
+    """
+
+    def __init__(self, stream, slots):
+        self._stream = stream
+        self._slots = slots
+        self._released = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._stream)
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            if not self._released:
+                self._released = True
+                self._slots.release()
+
+
+class TaskEventsTokenView(APIView):
+    """
+    POST /api/tasks/<task_id>/events/token/
+    Token firmado para abrir el stream SSE con EventSource, que no puede enviar
+    la cabecera Authorization: `new EventSource(events_url)`. Vale solo para
+    esta tarea y este usuario durante TASK_EVENTS_TOKEN_MAX_AGE segundos
+    (también para las reconexiones automáticas de EventSource).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, task_id):
+        token = task_events.make_stream_token(task_id, request.user.pk)
+        return Response({
+            "token": token,
+            "expires_in": getattr(settings, "TASK_EVENTS_TOKEN_MAX_AGE", 300),
+            "events_url": f"/api/tasks/{task_id}/events/?token={token}",
+        })
+
+
+class TaskEventsView(APIView):
+    """
+    GET /api/tasks/<task_id>/events/
+    Server-Sent Events con el progreso y la finalización de una tarea de Celery.
+
+    Emite eventos `data: {"state": ..., "progress": ..., "result": ...}` y cierra
+    el stream al llegar a SUCCESS o FAILURE. Tras TASK_EVENTS_STREAM_TIMEOUT
+    segundos emite `event: timeout` para que el cliente reconecte o vuelva al
+    polling de /api/quotations/pdf/status/<task_id>/.
+
+    Con ASGI el stream usa redis.asyncio: un cliente conectado no ocupa un
+    thread mientras espera eventos. Con WSGI cada proceso admite hasta
+    TASK_EVENTS_MAX_STREAMS streams simultáneos; los demás reciben 503 y el
+    cliente vuelve al polling.
+
+    Acepta el access token en la cabecera Authorization o un token de
+    TaskEventsTokenView en `?token=`.
+    """
+    authentication_classes = [*api_settings.DEFAULT_AUTHENTICATION_CLASSES, StreamTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [OrjsonRenderer, EventStreamRenderer]
+
+    HEARTBEAT_SECONDS = 15
+
+    def get(self, request, task_id):
+        if isinstance(request._request, ASGIRequest):
+            # Con ASGI, StreamingHttpResponse consume un iterador síncrono completo
+            # antes de enviarlo; el stream debe ser async para emitir cada evento
+            stream = self._astream(task_id)
+        elif stream_slots.acquire():
+            stream = _SlotStream(self._stream(task_id), stream_slots)
+        else:
+            logger.warning(f"Límite de streams SSE alcanzado; la tarea {task_id} debe consultarse por polling")
+            return Response(
+                {"detail": "Demasiados streams de eventos abiertos; consulte el estado por polling."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(self.HEARTBEAT_SECONDS)},
+            )
+        response = StreamingHttpResponse(stream, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # Evita que nginx acumule el stream
+        return response
+
+    @staticmethod
+    def _format(event, name=None):
+        prefix = f"event: {name}\n" if name else ""
+        return f"{prefix}data: {json.dumps(event)}\n\n"
+
+    @staticmethod
+    def _result_event(task_id):
+        """Estado final según el result backend de Celery (respaldo si se perdió un evento)."""
+        from celery.result import AsyncResult
+
+        task = AsyncResult(task_id)
+        if task.state == task_events.STATE_SUCCESS:
+            return {"task_id": task_id, "state": task.state, "progress": 100,
+                    "result": task.result, "download_url": f"/media/{task.result}"}
+        if task.state == task_events.STATE_FAILURE:
+            return {"task_id": task_id, "state": task.state, "error": str(task.info)}
+        return None
+
+    def _stream(self, task_id):
+        from redis import RedisError
+        from inventory_app.utils.redis_client import get_redis
+
+        timeout = getattr(settings, "TASK_EVENTS_STREAM_TIMEOUT", 60)
+        yield "retry: 2000\n\n"
+
+        pubsub = None
+        try:
+            pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(task_events.channel_for(task_id))
+
+            # Suscribirse antes de leer el último evento evita perder la finalización
+            last = task_events.get_last_event(task_id)
+            if last:
+                yield self._format(last)
+                if last["state"] in task_events.TERMINAL_STATES:
+                    return
+
+            now = time.monotonic()
+            deadline = now + timeout
+            next_heartbeat = now + self.HEARTBEAT_SECONDS
+            while time.monotonic() < deadline:
+                message = pubsub.get_message(timeout=1.0)
+                if message and message["type"] == "message":
+                    event = json.loads(message["data"])
+                    yield self._format(event)
+                    if event["state"] in task_events.TERMINAL_STATES:
+                        return
+
+                if time.monotonic() >= next_heartbeat:
+                    final = self._result_event(task_id)
+                    if final:
+                        yield self._format(final)
+                        return
+                    yield ": keepalive\n\n"
+                    next_heartbeat = time.monotonic() + self.HEARTBEAT_SECONDS
+
+            yield self._format({"task_id": task_id, "state": "TIMEOUT"}, name="timeout")
+
+        except RedisError as exc:
+            logger.warning(f"Stream de eventos no disponible para la tarea {task_id}: {exc}")
+            yield self._format({"task_id": task_id, "state": "UNAVAILABLE"}, name="unavailable")
+        finally:
+            if pubsub is not None:
+                try:
+                    pubsub.close()
+                except RedisError:
+                    pass
+
+    async def _astream(self, task_id):
+        """Versión async de _stream() para el perfil ASGI."""
+        from redis import RedisError
+        from inventory_app.utils.redis_client import get_async_redis
+
+        timeout = getattr(settings, "TASK_EVENTS_STREAM_TIMEOUT", 60)
+        yield "retry: 2000\n\n"
+
+        pubsub = None
+        try:
+            pubsub = get_async_redis().pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(task_events.channel_for(task_id))
+
+            last = await task_events.aget_last_event(task_id)
+            if last:
+                yield self._format(last)
+                if last["state"] in task_events.TERMINAL_STATES:
+                    return
+
+            now = time.monotonic()
+            deadline = now + timeout
+            next_heartbeat = now + self.HEARTBEAT_SECONDS
+            while time.monotonic() < deadline:
+                message = await pubsub.get_message(timeout=1.0)
+                if message and message["type"] == "message":
+                    event = json.loads(message["data"])
+                    yield self._format(event)
+                    if event["state"] in task_events.TERMINAL_STATES:
+                        return
+
+                if time.monotonic() >= next_heartbeat:
+                    # El result backend de Celery es síncrono: se consulta en un hilo
+                    final = await sync_to_async(self._result_event, thread_sensitive=False)(task_id)
+                    if final:
+                        yield self._format(final)
+                        return
+                    yield ": keepalive\n\n"
+                    next_heartbeat = time.monotonic() + self.HEARTBEAT_SECONDS
+
+            yield self._format({"task_id": task_id, "state": "TIMEOUT"}, name="timeout")
+
+        except RedisError as exc:
+            logger.warning(f"Stream de eventos no disponible para la tarea {task_id}: {exc}")
+            yield self._format({"task_id": task_id, "state": "UNAVAILABLE"}, name="unavailable")
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except RedisError:
+                    pass